@@ -0,0 +1,312 @@
+"""Synthetic PDF documents for the benchmarks.
+
+The documents are written by a small PDF writer from a fixed random seed,
+so every machine benchmarks the same bytes. Each kind of document
+stresses another part of the pipeline.
+"""
+
+import os
+import random
+import struct
+import zlib
+from hashlib import md5
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pdfminer.arcfour import Arcfour
+from pdfminer.pdfdocument import PDFStandardSecurityHandler
+
+PASSWORD_PADDING = PDFStandardSecurityHandler.PASSWORD_PADDING
+DOCUMENT_ID = md5(b"pdfminer.six benchmarks").digest()
+# The permissions of the encrypted document: everything is allowed.
+PERMISSIONS = -4
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua enim ad minim veniam "
+    "quis nostrud exercitation ullamco laboris nisi aliquip ex ea commodo"
+).split()
+# Hiragana, katakana and the first block of CJK ideographs.
+CJK_CHARS = [chr(c) for c in range(0x3042, 0x3094)] + [
+    chr(c) for c in range(0x4E00, 0x4F00)
+]
+
+
+class PDFWriter:
+    """Collects indirect objects and serializes them to a PDF file."""
+
+    def __init__(self) -> None:
+        # (dictionary or other object, stream data)
+        self.objects: List[Tuple[bytes, Optional[bytes]]] = []
+
+    def reserve(self) -> int:
+        """Returns the object id of an object that is set later."""
+        self.objects.append((b"null", None))
+        return len(self.objects)
+
+    def set(self, objid: int, obj: bytes, stream: Optional[bytes] = None) -> None:
+        self.objects[objid - 1] = (obj, stream)
+
+    def add(self, obj: bytes, stream: Optional[bytes] = None) -> int:
+        objid = self.reserve()
+        self.set(objid, obj, stream)
+        return objid
+
+    def add_stream(self, data: bytes, extra: bytes = b"") -> int:
+        """Adds a compressed stream."""
+        return self.add(
+            b"<< /Filter /FlateDecode " + extra + b">>", zlib.compress(data)
+        )
+
+    def write(self, root: int, password: Optional[bytes] = None) -> bytes:
+        """Serializes the objects, encrypted with RC4 if there's a password."""
+        key = None
+        trailer = b"/Root %d 0 R /ID [<%s> <%s>]" % (
+            root,
+            DOCUMENT_ID.hex().encode(),
+            DOCUMENT_ID.hex().encode(),
+        )
+        if password is not None:
+            (key, encrypt) = _standard_encryption(password)
+            trailer += b" /Encrypt %d 0 R" % self.add(encrypt)
+        out = [b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"]
+        pos = len(out[0])
+        offsets = []
+        for objid, (obj, stream) in enumerate(self.objects, 1):
+            if stream is not None:
+                if key is not None:
+                    stream = _rc4_object(key, objid, stream)
+                obj = b"%s\nstream\n%s\nendstream" % (
+                    obj[:-2] + b"/Length %d >>" % len(stream),
+                    stream,
+                )
+            chunk = b"%d 0 obj\n%s\nendobj\n" % (objid, obj)
+            offsets.append(pos)
+            out.append(chunk)
+            pos += len(chunk)
+        out.append(b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1))
+        out.extend(b"%010d 00000 n \n" % offset for offset in offsets)
+        out.append(
+            b"trailer\n<< /Size %d %s >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(offsets) + 1, trailer, pos),
+        )
+        return b"".join(out)
+
+
+def _standard_encryption(password: bytes) -> Tuple[bytes, bytes]:
+    """Revision 2 of the standard security handler, 40 bit RC4."""
+    padded = (password + PASSWORD_PADDING)[:32]
+    owner = Arcfour(md5(padded).digest()[:5]).encrypt(padded)
+    hash = md5(padded)
+    hash.update(owner)
+    hash.update(struct.pack("<l", PERMISSIONS))
+    hash.update(DOCUMENT_ID)
+    key = hash.digest()[:5]
+    user = Arcfour(key).encrypt(PASSWORD_PADDING)
+    encrypt = b"<< /Filter /Standard /V 1 /R 2 /O <%s> /U <%s> /P %d >>" % (
+        owner.hex().encode(),
+        user.hex().encode(),
+        PERMISSIONS,
+    )
+    return (key, encrypt)
+
+
+def _rc4_object(key: bytes, objid: int, data: bytes) -> bytes:
+    key += struct.pack("<L", objid)[:3] + struct.pack("<L", 0)[:2]
+    return Arcfour(md5(key).digest()[: min(len(key), 16)]).encrypt(data)
+
+
+def _pages(
+    writer: PDFWriter,
+    contents: List[bytes],
+    resources: bytes,
+) -> int:
+    """Adds a catalog with a page for every content stream."""
+    root = writer.reserve()
+    pages = writer.reserve()
+    kids = []
+    for content in contents:
+        stream = writer.add_stream(content)
+        kids.append(
+            writer.add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+                b"/Resources %s /Contents %d 0 R >>" % (pages, resources, stream),
+            ),
+        )
+    writer.set(
+        pages,
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)),
+    )
+    writer.set(root, b"<< /Type /Catalog /Pages %d 0 R >>" % pages)
+    return root
+
+
+def _helvetica(writer: PDFWriter) -> bytes:
+    font = writer.add(
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding /WinAnsiEncoding >>",
+    )
+    return b"<< /Font << /F1 %d 0 R >> >>" % font
+
+
+def _text_contents(rng: random.Random, npages: int, nlines: int) -> List[bytes]:
+    contents = []
+    for _ in range(npages):
+        lines = [b"BT /F1 10 Tf 12 TL 50 760 Td"]
+        for i in range(nlines):
+            if i and i % 15 == 0:
+                # a paragraph break.
+                lines.append(b"T*")
+            words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 14)))
+            lines.append(b"(%s) '" % words.encode())
+        lines.append(b"ET")
+        contents.append(b"\n".join(lines))
+    return contents
+
+
+def text_heavy(scale: float = 1.0) -> bytes:
+    """Pages full of running text."""
+    rng = random.Random(1)
+    writer = PDFWriter()
+    resources = _helvetica(writer)
+    contents = _text_contents(rng, max(1, int(40 * scale)), 60)
+    return writer.write(_pages(writer, contents, resources))
+
+
+def vector_heavy(scale: float = 1.0) -> bytes:
+    """Pages of lines, rectangles and curves with a few labels."""
+    rng = random.Random(2)
+    writer = PDFWriter()
+    resources = _helvetica(writer)
+    contents = []
+    for _ in range(max(1, int(10 * scale))):
+        ops = []
+        for _ in range(1500):
+            kind = rng.random()
+            (x, y) = (rng.uniform(0, 612), rng.uniform(0, 792))
+            ops.append(b"%.2f %.2f %.2f RG" % (rng.random(), rng.random(), 0.5))
+            if kind < 0.4:
+                ops.append(
+                    b"%.2f %.2f m %.2f %.2f l S"
+                    % (x, y, x + rng.uniform(-50, 50), y + rng.uniform(-50, 50)),
+                )
+            elif kind < 0.7:
+                ops.append(
+                    b"%.2f %.2f %.2f %.2f re f"
+                    % (x, y, rng.uniform(1, 40), rng.uniform(1, 40)),
+                )
+            else:
+                ops.append(
+                    b"%.2f %.2f m %.2f %.2f %.2f %.2f %.2f %.2f c S"
+                    % (x, y, x + 10, y + 30, x + 30, y - 30, x + 40, y),
+                )
+        for _ in range(20):
+            ops.append(
+                b"BT /F1 8 Tf %.2f %.2f Td (%s) Tj ET"
+                % (
+                    rng.uniform(0, 560),
+                    rng.uniform(0, 780),
+                    rng.choice(WORDS).encode(),
+                ),
+            )
+        contents.append(b"\n".join(ops))
+    return writer.write(_pages(writer, contents, resources))
+
+
+def cjk(scale: float = 1.0) -> bytes:
+    """Japanese text in a CID-keyed font with a predefined CMap."""
+    rng = random.Random(3)
+    writer = PDFWriter()
+    descriptor = writer.add(
+        b"<< /Type /FontDescriptor /FontName /HeiseiMin-W3 /Flags 6 "
+        b"/FontBBox [-123 -257 1001 910] /ItalicAngle 0 /Ascent 723 "
+        b"/Descent -241 /CapHeight 709 /StemV 69 >>",
+    )
+    cidfont = writer.add(
+        b"<< /Type /Font /Subtype /CIDFontType0 /BaseFont /HeiseiMin-W3 "
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (Japan1) /Supplement 2 >> "
+        b"/FontDescriptor %d 0 R /DW 1000 >>" % descriptor,
+    )
+    font = writer.add(
+        b"<< /Type /Font /Subtype /Type0 /BaseFont /HeiseiMin-W3 "
+        b"/Encoding /UniJIS-UCS2-H /DescendantFonts [%d 0 R] >>" % cidfont,
+    )
+    resources = b"<< /Font << /F1 %d 0 R >> >>" % font
+    contents = []
+    for _ in range(max(1, int(10 * scale))):
+        lines = [b"BT /F1 12 Tf 14 TL 40 760 Td"]
+        for _ in range(50):
+            text = "".join(rng.choice(CJK_CHARS) for _ in range(rng.randint(20, 40)))
+            lines.append(b"<%s> '" % text.encode("utf-16-be").hex().encode())
+        lines.append(b"ET")
+        contents.append(b"\n".join(lines))
+    return writer.write(_pages(writer, contents, resources))
+
+
+def many_small_objects(scale: float = 1.0) -> bytes:
+    """Scattered single glyphs and hundreds of tiny form XObjects."""
+    rng = random.Random(4)
+    writer = PDFWriter()
+    font = writer.add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>")
+    forms = []
+    for i in range(300):
+        forms.append(
+            writer.add_stream(
+                b"BT /F1 6 Tf 0 0 Td (%d) Tj ET 0 0 m 8 8 l S" % i,
+                b"/Type /XObject /Subtype /Form /BBox [0 0 10 10] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> " % font,
+            ),
+        )
+    resources = b"<< /Font << /F1 %d 0 R >> /XObject << %s >> >>" % (
+        font,
+        b" ".join(b"/X%d %d 0 R" % (i, form) for i, form in enumerate(forms)),
+    )
+    contents = []
+    for _ in range(max(1, int(10 * scale))):
+        ops = []
+        for _ in range(1500):
+            ops.append(
+                b"BT /F1 7 Tf 1 0 0 1 %.1f %.1f Tm (%s) Tj ET"
+                % (
+                    rng.uniform(10, 600),
+                    rng.uniform(10, 780),
+                    rng.choice("abcdefghijklmnopqrstuvwxyz").encode(),
+                ),
+            )
+        for _ in range(300):
+            ops.append(
+                b"q 1 0 0 1 %.1f %.1f cm /X%d Do Q"
+                % (rng.uniform(0, 600), rng.uniform(0, 780), rng.randrange(len(forms))),
+            )
+        contents.append(b"\n".join(ops))
+    return writer.write(_pages(writer, contents, resources))
+
+
+def encrypted(scale: float = 1.0) -> bytes:
+    """Running text, encrypted with an empty user password."""
+    rng = random.Random(5)
+    writer = PDFWriter()
+    resources = _helvetica(writer)
+    contents = _text_contents(rng, max(1, int(20 * scale)), 60)
+    return writer.write(_pages(writer, contents, resources), password=b"")
+
+
+CORPUS: Dict[str, Callable[[float], bytes]] = {
+    "text-heavy": text_heavy,
+    "vector-heavy": vector_heavy,
+    "cjk": cjk,
+    "many-small-objects": many_small_objects,
+    "encrypted": encrypted,
+}
+
+
+def generate_corpus(directory: str, scale: float = 1.0) -> Dict[str, str]:
+    """Writes the synthetic documents and returns their paths by name."""
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for name, generate in CORPUS.items():
+        path = os.path.join(directory, name + ".pdf")
+        with open(path, "wb") as fp:
+            fp.write(generate(scale))
+        paths[name] = path
+    return paths
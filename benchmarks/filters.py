@@ -0,0 +1,204 @@
+"""Times the stream filter decoders.
+
+Each decoder runs on the same generated data: the rows of a scanned 1-bit
+page, mostly white with short black runs, from a fixed random seed. The
+one-shot function and the incremental decoder, fed with chunks of
+STREAM_CHUNK_SIZE bytes as PDFStream.iter_data() does, are timed
+separately. Use
+
+    python -m benchmarks.filters --size 4000000
+
+to print the best time of each and the decoded megabytes per second.
+"""
+
+import argparse
+import random
+import sys
+import time
+from binascii import hexlify
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pdfminer.ascii85 import ASCIIHexDecoder, asciihexdecode
+from pdfminer.lzw import LZWDecoder, lzwdecode
+from pdfminer.pdftypes import STREAM_CHUNK_SIZE, StreamDecoder
+from pdfminer.runlength import RunLengthDecoder, rldecode
+from pdfminer.utils import PNGPredictor, apply_png_predictor
+
+# The bytes of a row of the page, 2400 pixels wide.
+ROW_BYTES = 300
+
+
+def page_data(size: int) -> bytes:
+    """Returns size bytes of rows of a scanned page."""
+    rng = random.Random(0)
+    rows = []
+    for _ in range(size // ROW_BYTES + 1):
+        row = bytearray(b"\xff" * ROW_BYTES)
+        for _ in range(rng.randrange(4)):
+            start = rng.randrange(ROW_BYTES)
+            row[start : start + rng.randrange(1, 40)] = bytes(
+                rng.choice([0, 0, 0x0F, 0xF0]) for _ in range(40)
+            )[: ROW_BYTES - start]
+        rows.append(bytes(row))
+    return b"".join(rows)[:size]
+
+
+def rlencode(data: bytes) -> bytes:
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        j = i + 1
+        while j < len(data) and j - i < 128 and data[j] == data[i]:
+            j += 1
+        if 1 < j - i:
+            out += bytes((257 - (j - i), data[i]))
+        else:
+            while j < len(data) and j - i < 128 and data[j] != data[j - 1]:
+                j += 1
+            out += bytes((j - i - 1,)) + data[i:j]
+        i = j
+    return bytes(out + b"\x80")
+
+
+def asciihexencode(data: bytes) -> bytes:
+    lines = [hexlify(data[i : i + 32]) for i in range(0, len(data), 32)]
+    return b"\n".join(lines) + b">"
+
+
+def lzwencode(data: bytes, early_change: int = 1, table_size: int = 4096) -> bytes:
+    """LZW encoder, clearing the table when it is full."""
+    codes: List[Tuple[int, int]] = [(256, 9)]
+    table = {bytes((c,)): c for c in range(256)}
+    nbits = 9
+    w = b""
+    for c in data:
+        wc = w + bytes((c,))
+        if wc in table:
+            w = wc
+            continue
+        codes.append((table[w], nbits))
+        if len(table) + 2 < table_size:
+            table[wc] = len(table) + 2
+            # the decoder adds this entry one code later.
+            if nbits < 12 and (1 << nbits) < len(table) + 2 + early_change:
+                nbits += 1
+        else:
+            codes.append((256, nbits))
+            table = {bytes((c,)): c for c in range(256)}
+            nbits = 9
+        w = bytes((c,))
+    if w:
+        codes.append((table[w], nbits))
+        if nbits < 12 and (1 << nbits) < len(table) + 3 + early_change:
+            nbits += 1
+    codes.append((257, nbits))
+    (acc, nacc) = (0, 0)
+    out = bytearray()
+    for code, width in codes:
+        acc = (acc << width) | code
+        nacc += width
+        while 8 <= nacc:
+            nacc -= 8
+            out.append((acc >> nacc) & 255)
+        acc &= (1 << nacc) - 1
+    if nacc:
+        out.append((acc << (8 - nacc)) & 255)
+    return bytes(out)
+
+
+def predictorencode(data: bytes) -> bytes:
+    """PNG Up prediction of the rows."""
+    out = bytearray()
+    above = bytes(ROW_BYTES)
+    for i in range(0, len(data) - len(data) % ROW_BYTES, ROW_BYTES):
+        row = data[i : i + ROW_BYTES]
+        out.append(2)
+        out += bytes((x - y) & 255 for x, y in zip(row, above))
+        above = row
+    return bytes(out)
+
+
+Filter = Tuple[
+    Callable[[bytes], bytes],
+    Callable[[bytes], bytes],
+    Callable[[], StreamDecoder],
+]
+
+FILTERS: Dict[str, Filter] = {
+    "RunLengthDecode": (rlencode, rldecode, RunLengthDecoder),
+    "ASCIIHexDecode": (asciihexencode, asciihexdecode, ASCIIHexDecoder),
+    "LZWDecode": (lzwencode, lzwdecode, LZWDecoder),
+    "Predictor": (
+        predictorencode,
+        lambda data: apply_png_predictor(12, 1, ROW_BYTES * 8, 1, data),
+        lambda: PNGPredictor(1, ROW_BYTES * 8, 1),
+    ),
+}
+
+
+def decode_chunks(decoder: StreamDecoder, data: bytes) -> bytes:
+    chunks = [
+        decoder.decode(data[i : i + STREAM_CHUNK_SIZE])
+        for i in range(0, len(data), STREAM_CHUNK_SIZE)
+    ]
+    return b"".join(chunks) + decoder.decode(b"", final=True)
+
+
+def best_time(func: Callable[[], bytes], expected: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func()
+        best = min(best, time.perf_counter() - start)
+        assert output == expected, "the decoded data differs"
+    return best
+
+
+def measure(size: int, repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    """Returns the best seconds of the function and the incremental decoder
+    of each filter.
+    """
+    data = page_data(size)
+    results = {}
+    for name, (encode, function, factory) in FILTERS.items():
+        encoded = encode(data)
+        expected = function(encoded)
+        results[name] = {
+            "function": best_time(lambda: function(encoded), expected, repeat),
+            "incremental": best_time(
+                lambda: decode_chunks(factory(), encoded),
+                expected,
+                repeat,
+            ),
+            "nbytes": len(expected),
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--size", type=int, default=1000000, help="Bytes of decoded data."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Rounds to take the best time from."
+    )
+    args = parser.parse_args(argv)
+    for name, result in measure(args.size, args.repeat).items():
+        print(
+            "%-16s function=%.4fs (%.1f MB/s) incremental=%.4fs (%.1f MB/s)"
+            % (
+                name,
+                result["function"],
+                result["nbytes"] / result["function"] / 1e6,
+                result["incremental"],
+                result["nbytes"] / result["incremental"] / 1e6,
+            ),
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""Times the stages of the extraction pipeline.
+
+Each document goes through the stages one after the other:
+
+    open          PDFParser and PDFDocument
+    create_pages  PDFPage.create_pages
+    interpret     PDFPageInterpreter.process_page, without layout analysis
+    analyze       LTLayoutContainer.analyze
+    text, html, xml, hocr
+                  the converters, rendering the analyzed pages
+
+The best time of several rounds is reported, the peak memory of a stage
+is measured in a separate round with tracemalloc. Use
+
+    python -m benchmarks.run --save baseline.json
+
+to store a baseline and
+
+    python -m benchmarks.run --baseline baseline.json
+
+to compare against it. The exit status is 1 if a stage got slower than
+the threshold allows.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from io import BytesIO, StringIO
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pdfminer
+from benchmarks.corpus import generate_corpus
+from pdfminer.converter import (
+    HOCRConverter,
+    HTMLConverter,
+    PDFLayoutAnalyzer,
+    PDFPageAggregator,
+    TextConverter,
+    XMLConverter,
+)
+from pdfminer.layout import LAParams, LTPage
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+
+SAMPLES = os.path.join(os.path.dirname(os.path.dirname(__file__)), "samples")
+# The user passwords of the encrypted samples.
+PASSWORDS = {
+    "encryption/aes-256-r6.pdf": "usersecret",
+    "encryption/encrypted_doc_no_id.pdf": "",
+}
+SAMPLES_PASSWORD = "foo"
+
+CONVERTERS: Dict[
+    str,
+    Callable[[PDFResourceManager, LAParams], PDFLayoutAnalyzer],
+] = {
+    "text": lambda rsrcmgr, laparams: TextConverter(
+        rsrcmgr,
+        StringIO(),
+        laparams=laparams,
+    ),
+    "html": lambda rsrcmgr, laparams: HTMLConverter(
+        rsrcmgr,
+        BytesIO(),
+        laparams=laparams,
+    ),
+    "xml": lambda rsrcmgr, laparams: XMLConverter(
+        rsrcmgr,
+        BytesIO(),
+        laparams=laparams,
+    ),
+    "hocr": lambda rsrcmgr, laparams: HOCRConverter(
+        rsrcmgr,
+        BytesIO(),
+        laparams=laparams,
+    ),
+}
+STAGES = ["open", "create_pages", "interpret", "analyze", *CONVERTERS]
+
+Stage = Callable[[str], Any]
+
+
+@contextmanager
+def _timer(results: Dict[str, float], name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    results[name] = min(results.get(name, elapsed), elapsed)
+
+
+@contextmanager
+def _tracer(results: Dict[str, float], name: str) -> Iterator[None]:
+    tracemalloc.start()
+    try:
+        yield
+        (_, peak) = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    results[name] = peak / 1024
+
+
+def run_pipeline(path: str, password: str, stage: Stage) -> None:
+    """Runs a document through all stages, each one inside stage(name)."""
+    with open(path, "rb") as fp:
+        with stage("open"):
+            doc = PDFDocument(PDFParser(fp), password=password)
+        with stage("create_pages"):
+            pages = list(PDFPage.create_pages(doc))
+        rsrcmgr = PDFResourceManager()
+        device = PDFPageAggregator(rsrcmgr)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        layouts: List[LTPage] = []
+        with stage("interpret"):
+            for page in pages:
+                interpreter.process_page(page)
+                layouts.append(device.get_result())
+        laparams = LAParams()
+        with stage("analyze"):
+            for layout in layouts:
+                layout.analyze(laparams)
+        for name, factory in CONVERTERS.items():
+            converter = factory(rsrcmgr, laparams)
+            with stage(name):
+                for layout in layouts:
+                    converter.receive_layout(layout)
+                converter.close()
+
+
+def measure(path: str, password: str = "", repeat: int = 3) -> Dict[str, Any]:
+    """Returns the best seconds and the peak KiB of every stage."""
+    seconds: Dict[str, float] = {}
+    for _ in range(repeat):
+        run_pipeline(path, password, lambda name: _timer(seconds, name))
+    memory: Dict[str, float] = {}
+    run_pipeline(path, password, lambda name: _tracer(memory, name))
+    return {"seconds": seconds, "peak_kib": memory}
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+) -> List[str]:
+    """Returns the stages that are slower than the baseline allows."""
+    regressions = []
+    for name, result in results["documents"].items():
+        if name not in baseline["documents"]:
+            continue
+        before = baseline["documents"][name]["seconds"]
+        for stage, seconds in result["seconds"].items():
+            if stage in before and before[stage] * (1 + threshold) < seconds:
+                regressions.append(
+                    "%s %s: %.4fs -> %.4fs (%+.0f%%)"
+                    % (
+                        name,
+                        stage,
+                        before[stage],
+                        seconds,
+                        (seconds / before[stage] - 1) * 100,
+                    ),
+                )
+    return regressions
+
+
+def documents(corpus: str, scale: float, samples: bool) -> Dict[str, str]:
+    """Returns the paths of the documents to benchmark by name."""
+    paths = generate_corpus(corpus, scale)
+    if samples:
+        for path in sorted(
+            glob.glob(os.path.join(SAMPLES, "**", "*.pdf"), recursive=True)
+        ):
+            paths[os.path.relpath(path, SAMPLES)] = path
+    return paths
+
+
+def run(
+    paths: Dict[str, str],
+    repeat: int,
+    baseline: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {
+        "python": platform.python_version(),
+        "pdfminer": pdfminer.__version__,
+        "documents": {},
+    }
+    for name, path in paths.items():
+        if name.startswith("encryption/"):
+            password = PASSWORDS.get(name, SAMPLES_PASSWORD)
+        else:
+            password = ""
+        try:
+            result = measure(path, password, repeat)
+        except Exception as e:
+            print("%-40s skipped: %r" % (name, e))
+            continue
+        results["documents"][name] = result
+        seconds = result["seconds"]
+        before = (baseline or {}).get("documents", {}).get(name, {}).get("seconds", {})
+        print(
+            "%-40s %s"
+            % (
+                name,
+                " ".join(
+                    "%s=%.4f" % (stage, seconds[stage])
+                    + (
+                        "(%+.0f%%)" % ((seconds[stage] / before[stage] - 1) * 100)
+                        if before.get(stage)
+                        else ""
+                    )
+                    for stage in STAGES
+                ),
+            ),
+        )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--corpus",
+        help="Directory of the synthetic documents (default: a temporary one).",
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Size of the synthetic documents."
+    )
+    parser.add_argument(
+        "--no-samples", action="store_true", help="Skip the documents in samples/."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Rounds to take the best time from."
+    )
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument(
+        "--baseline", help="Compare against the results in this JSON file."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Slowdown that counts as a regression.",
+    )
+    args = parser.parse_args(argv)
+    # Broken samples log errors on purpose.
+    logging.disable(logging.CRITICAL)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = documents(args.corpus or tmp, args.scale, not args.no_samples)
+        results = run(paths, args.repeat, baseline)
+    if args.save:
+        with open(args.save, "w") as fp:
+            json.dump(results, fp, indent=2, sort_keys=True)
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print("regression:", regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,15 @@ import os
 import nox
 
 PYTHON_ALL_VERSIONS = ["3.8", "3.9", "3.10", "3.11", "3.12"]
-PYTHON_MODULES = ["fuzzing", "pdfminer", "tools", "tests", "noxfile.py", "setup.py"]
+PYTHON_MODULES = [
+    "benchmarks",
+    "fuzzing",
+    "pdfminer",
+    "tools",
+    "tests",
+    "noxfile.py",
+    "setup.py",
+]
 
 
 @nox.session
@@ -1,6 +1,5 @@
 """Python implementation of ASCII85/ASCIIHex decoder (Adobe version)."""
 
-import re
 from base64 import a85decode
 from binascii import unhexlify
 
@@ -21,7 +20,39 @@ def ascii85decode(data: bytes) -> bytes:
         return a85decode(data)
 
 
-bws_re = re.compile(rb"\s")
+# The white-space characters of \s in a bytes regular expression.
+WHITESPACE = b" \t\n\r\x0b\x0c"
+
+
+class ASCIIHexDecoder:
+    """Incremental ASCIIHexDecode decoder.
+
+    The white space is deleted with bytes.translate() and the digits are
+    converted by unhexlify(). An odd digit at the end of a chunk is kept for
+    the next call of decode().
+    """
+
+    def __init__(self) -> None:
+        self.pending = b""
+        self.done = False
+
+    def decode(self, data: bytes, final: bool = False) -> bytes:
+        if self.done:
+            return b""
+        data = self.pending + data.translate(None, WHITESPACE)
+        idx = data.find(b">")
+        if idx != -1:
+            data = data[:idx]
+            if idx % 2 == 1:
+                data += b"0"
+            self.done = True
+        elif final:
+            self.done = True
+        elif len(data) % 2 == 1:
+            (data, self.pending) = (data[:-1], data[-1:])
+        else:
+            self.pending = b""
+        return unhexlify(data)
 
 
 def asciihexdecode(data: bytes) -> bytes:
@@ -33,10 +64,4 @@ def asciihexdecode(data: bytes) -> bytes:
     the EOD marker after reading an odd number of hexadecimal digits, it
     will behave as if a 0 followed the last digit.
     """
-    data = bws_re.sub(b"", data)
-    idx = data.find(b">")
-    if idx != -1:
-        data = data[:idx]
-        if idx % 2 == 1:
-            data += b"0"
-    return unhexlify(data)
+    return ASCIIHexDecoder().decode(data, final=True)
@@ -0,0 +1,241 @@
+"""Reading PDF files by ranges of bytes, e.g. from a web server.
+
+A ByteSource reads ranges of the bytes of a file. ByteSourceFile turns it
+into the seekable binary file that PDFParser reads. It fetches whole
+blocks, merges adjacent missing blocks into one read and keeps the
+recently used blocks, so that a document is opened without reading all
+of it:
+
+    source = HTTPByteSource("https://example.com/archive.pdf")
+    with ByteSourceFile(source) as fp:
+        text = extract_text(fp, page_numbers=[2])
+"""
+
+import io
+import re
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Tuple
+
+from pdfminer.pdfexceptions import PDFIOError, PDFValueError
+
+CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+class ByteSource:
+    """Reads ranges of the bytes of a file."""
+
+    def get_size(self) -> int:
+        raise NotImplementedError
+
+    def read_range(self, offset: int, length: int) -> bytes:
+        """Returns length bytes starting at offset, fewer at the end."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class FileByteSource(ByteSource):
+    """Reads a seekable binary file."""
+
+    def __init__(self, fp: BinaryIO) -> None:
+        self.fp = fp
+
+    def get_size(self) -> int:
+        return self.fp.seek(0, io.SEEK_END)
+
+    def read_range(self, offset: int, length: int) -> bytes:
+        self.fp.seek(offset)
+        return self.fp.read(length)
+
+
+class HTTPByteSource(ByteSource):
+    """Reads a file from a web server or object store with range requests."""
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = 30.0,
+    ) -> None:
+        self.url = url
+        self.headers: Dict[str, str] = dict(headers or {})
+        self.timeout = timeout
+        self._size: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"<HTTPByteSource: {self.url}>"
+
+    def get_size(self) -> int:
+        if self._size is None:
+            # The response to a range request tells the size of the file.
+            (_, self._size) = self._request(0, 1)
+        return self._size
+
+    def read_range(self, offset: int, length: int) -> bytes:
+        if length <= 0:
+            return b""
+        (data, size) = self._request(offset, length)
+        self._size = size
+        return data
+
+    def _request(self, offset: int, length: int) -> Tuple[bytes, int]:
+        headers = dict(self.headers)
+        headers["Range"] = "bytes=%d-%d" % (offset, offset + length - 1)
+        request = urllib.request.Request(self.url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                if response.status != 206:
+                    raise PDFIOError(
+                        "%s does not support range requests (status %d)"
+                        % (self.url, response.status),
+                    )
+                content_range = response.headers.get("Content-Range", "")
+                data = response.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 416:
+                # The range starts after the end of the file.
+                return (b"", self._size or offset)
+            raise PDFIOError(f"Cannot read {self.url}: {e}") from e
+        except OSError as e:
+            raise PDFIOError(f"Cannot read {self.url}: {e}") from e
+        m = CONTENT_RANGE.match(content_range)
+        if m is None or m.group(3) == "*":
+            raise PDFIOError(f"Invalid Content-Range of {self.url}: {content_range!r}")
+        return (data[:length], int(m.group(3)))
+
+
+class ByteSourceFile(io.BufferedIOBase):
+    """A seekable binary file that reads a ByteSource block by block.
+
+    The blocks that a read needs and that are not cached are fetched
+    together, one request per run of adjacent blocks, extended by up to
+    readahead blocks. At most max_blocks blocks are kept, the least
+    recently used ones are dropped. The last tail_size bytes, where the
+    trailer and usually the xref table are, are fetched when the file is
+    opened.
+
+    requests and nbytes count the reads of the source and the bytes they
+    returned.
+    """
+
+    def __init__(
+        self,
+        source: ByteSource,
+        block_size: int = 64 * 1024,
+        max_blocks: int = 256,
+        readahead: int = 0,
+        tail_size: Optional[int] = None,
+    ) -> None:
+        if block_size < 1 or max_blocks < 1 or readahead < 0:
+            raise PDFValueError(
+                "block_size and max_blocks must be positive, readahead not negative",
+            )
+        super().__init__()
+        self.source = source
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.readahead = readahead
+        self.size = source.get_size()
+        self.pos = 0
+        self.requests = 0
+        self.nbytes = 0
+        self._blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        if tail_size is None:
+            tail_size = block_size
+        if 0 < tail_size and 0 < self.size:
+            self._fetch_blocks(
+                max(0, self.size - tail_size) // block_size,
+                (self.size - 1) // block_size,
+            )
+
+    def __repr__(self) -> str:
+        return f"<ByteSourceFile: {self.source!r}>"
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise PDFValueError(f"negative seek position {offset}")
+        self.pos = offset
+        return self.pos
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if self.closed:
+            raise ValueError("read of closed file")
+        end = self.size if size is None or size < 0 else min(self.size, self.pos + size)
+        if end <= self.pos:
+            return b""
+        first = self.pos // self.block_size
+        last = (end - 1) // self.block_size
+        blocks = self._fetch_blocks(first, last)
+        data = b"".join(blocks)
+        start = self.pos - first * self.block_size
+        data = data[start : start + end - self.pos]
+        self.pos += len(data)
+        return data
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def readinto(self, buffer: Any) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._blocks.clear()
+            self.source.close()
+        super().close()
+
+    def _fetch_blocks(self, first: int, last: int) -> List[bytes]:
+        """Returns the blocks first to last, fetching the missing ones."""
+        blocks: Dict[int, bytes] = {}
+        nblocks = (self.size - 1) // self.block_size + 1
+        index = first
+        while index <= last:
+            block = self._blocks.get(index)
+            if block is not None:
+                self._blocks.move_to_end(index)
+                blocks[index] = block
+                index += 1
+                continue
+            # A run of missing blocks, read at once.
+            end = index + 1
+            while end <= last and end not in self._blocks:
+                end += 1
+            limit = min(nblocks, end + self.readahead)
+            while end < limit and end not in self._blocks:
+                end += 1
+            offset = index * self.block_size
+            data = self.source.read_range(
+                offset,
+                min(self.size, end * self.block_size) - offset,
+            )
+            self.requests += 1
+            self.nbytes += len(data)
+            for i in range(index, end):
+                block = data[
+                    (i - index) * self.block_size : (i - index + 1) * self.block_size
+                ]
+                if i <= last:
+                    blocks[i] = block
+                self._blocks[i] = block
+            index = end
+        while self.max_blocks < len(self._blocks):
+            self._blocks.popitem(last=False)
+        return [blocks[i] for i in range(first, last + 1)]
@@ -12,20 +12,25 @@
 
 
 import array
+import logging
 from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
     Iterator,
     List,
     MutableSequence,
     Optional,
     Sequence,
+    Tuple,
     Union,
     cast,
 )
 
-from pdfminer.pdfexceptions import PDFException, PDFValueError
+from pdfminer.pdfexceptions import PDFException
+
+logger = logging.getLogger(__name__)
 
 
 def get_bytes(data: bytes) -> Iterator[int]:
@@ -565,17 +570,378 @@ class CCITTFaxDecoder(CCITTG4Parser):
         self._buf += arr.tobytes()
 
 
+def _get_codes(tree: BitParserState, bits: str = "") -> Iterator[Tuple[Any, str]]:
+    """Yields the value and the bits of each code of a BitParser tree."""
+    for b, node in enumerate(tree):
+        if isinstance(node, list):
+            yield from _get_codes(node, bits + str(b))
+        elif node is not None:
+            yield (node, bits + str(b))
+
+
+# The number of bits looked up at a time, as long as the longest code.
+CODE_BITS = 13
+CODE_MASK = (1 << CODE_BITS) - 1
+
+# The value of the two-dimensional modes in MODE_TABLE, a vertical mode
+# is VERTICAL + a1 - b1.
+VERTICAL = 3
+PASS = 7
+HORIZONTAL = 8
+UNCOMPRESSED = 9
+# The value in WHITE_TABLE of the code of the one-dimensional uncompressed
+# mode.
+UNCOMPRESSED_1D = -1
+EOL = 0b000000000001
+
+# The pixels of the uncompressed mode codes and the colour that follows an
+# exit code, or -1.
+UNCOMPRESSED_CODES = [
+    (("1", -1), "1"),
+    (("01", -1), "01"),
+    (("001", -1), "001"),
+    (("0001", -1), "0001"),
+    (("00001", -1), "00001"),
+    (("00000", -1), "000001"),
+]
+UNCOMPRESSED_CODES += [
+    (("0" * n, color), "0" * (6 + n) + "1" + str(color))
+    for n in range(5)
+    for color in (0, 1)
+]
+
+CodeTable = List[Tuple[Any, int]]
+
+
+def _make_table(codes: Iterable[Tuple[Any, str]]) -> CodeTable:
+    """Returns the value and length of the code in the next CODE_BITS bits,
+    for each of their values. Unknown codes have a length of 0.
+    """
+    table: CodeTable = [(0, 0)] * (1 << CODE_BITS)
+    for value, bits in codes:
+        shift = CODE_BITS - len(bits)
+        start = int(bits, 2) << shift
+        table[start : start + (1 << shift)] = [(value, len(bits))] * (1 << shift)
+    return table
+
+
+_MODES = {"p": PASS, "h": HORIZONTAL, "u": UNCOMPRESSED}
+MODE_TABLE = _make_table(
+    (VERTICAL + mode if isinstance(mode, int) else _MODES[mode], bits)
+    for mode, bits in _get_codes(CCITTG4Parser.MODE)
+    if isinstance(mode, int) or mode in _MODES
+)
+WHITE_TABLE = _make_table(
+    [*_get_codes(CCITTG4Parser.WHITE), (UNCOMPRESSED_1D, "000000001111")],
+)
+BLACK_TABLE = _make_table(_get_codes(CCITTG4Parser.BLACK))
+UNCOMPRESSED_TABLE = _make_table(UNCOMPRESSED_CODES)
+
+
+class CCITTDecoder:
+    """Incremental decoder of the CCITTFaxDecode filter, for all values of K:
+    Group 4 (K < 0), Group 3 one-dimensional (K = 0) and Group 3 mixed
+    one- and two-dimensional (K > 0) coding.
+
+    The codes are looked up in tables with the next CODE_BITS bits of the
+    data, read at a bit position. A line is kept as the list of its changing
+    elements, the positions where the colour changes starting from white,
+    which is also the reference line of the next line. Each decoded line is
+    packed into bytes at once.
+
+    decode() decodes the complete lines of the data it has got. A line
+    that is cut at the end of a chunk is decoded again with the next one,
+    and dropped with final=True. Decoding stops at the end of block, after
+    Rows lines without EndOfBlock and on invalid data, keeping the lines
+    decoded so far.
+    """
+
+    def __init__(self, params: Dict[str, object]) -> None:
+        self.width = cast(int, params.get("Columns", 1728))
+        self.k = cast(int, params.get("K", 0))
+        self.rows = cast(int, params.get("Rows", 0))
+        self.bytealign = bool(params.get("EncodedByteAlign", False))
+        self.eol = bool(params.get("EndOfLine", False))
+        self.eob = bool(params.get("EndOfBlock", True))
+        self.nbytes = (self.width + 7) // 8
+        self.pad = self.nbytes * 8 - self.width
+        # 1 bits are white unless BlackIs1.
+        if params.get("BlackIs1"):
+            self.white = 0
+        else:
+            self.white = ((1 << self.width) - 1) << self.pad
+        self.blank = self.white.to_bytes(self.nbytes, "big")
+        self.refline: List[int] = []
+        self.y = 0
+        self.pending = b""
+        self.bitpos = 0
+        self.done = False
+
+    def decode(self, data: bytes, final: bool = False) -> bytes:
+        if self.done:
+            return b""
+        buf = self.pending + data
+        end = len(buf) * 8
+        padded = buf + bytes(4)
+        pos = self.bitpos
+        out = bytearray()
+        while not self.done:
+            if not self.eob and 0 < self.rows <= self.y:
+                self.done = True
+                break
+            result = self._decode_line(padded, pos, end)
+            if result is None:
+                break
+            (changes, pos) = result
+            out += self._pack(changes)
+            self.refline = changes
+            self.y += 1
+        if self.done or final:
+            self.done = True
+            self.pending = b""
+        else:
+            self.pending = buf[pos >> 3 :]
+            self.bitpos = pos & 7
+        return bytes(out)
+
+    def _decode_line(
+        self,
+        data: bytes,
+        pos: int,
+        end: int,
+    ) -> Optional[Tuple[List[int], int]]:
+        """Returns the changing elements of the line at pos and the position
+        after it, or None if the data ends or is invalid. self.done is set
+        at the end of block and on invalid data.
+        """
+        if self.bytealign and not self.eol:
+            pos = (pos + 7) & ~7
+        # the fill bits before an end of line may end at a byte boundary.
+        (pos, eol) = self._skip_fill(data, pos, end)
+        if eol:
+            if self.k < 0 and not self.eol:
+                # the end of block of Group 4 coding.
+                self.done = True
+                return None
+            pos += 12
+            # the tag bit of the line follows with K > 0.
+            (_, eol) = self._skip_fill(data, pos + 1 if 0 < self.k else pos, end)
+            if eol:
+                # two ends of line make an end of block.
+                self.done = True
+                return None
+        elif self.bytealign:
+            pos = (pos + 7) & ~7
+        if end <= pos:
+            return None
+        if 0 < self.k:
+            i = pos >> 3
+            two_dimensional = not (data[i] >> (7 - (pos & 7))) & 1
+            pos += 1
+        else:
+            two_dimensional = self.k < 0
+        if two_dimensional:
+            result = self._decode_2d(data, pos, end)
+        else:
+            result = self._decode_1d(data, pos, end)
+        if result is None or end < result[1]:
+            return None
+        return result
+
+    def _skip_fill(self, data: bytes, pos: int, end: int) -> Tuple[int, bool]:
+        """Returns the position after the fill bits at pos, and whether an
+        end of line follows.
+        """
+        while pos < end:
+            i = pos >> 3
+            code = (
+                ((data[i] << 16) | (data[i + 1] << 8) | data[i + 2]) >> (12 - (pos & 7))
+            ) & 4095
+            if code:
+                return (pos, code == EOL)
+            pos += 1
+        return (pos, False)
+
+    def _invalid(self, pos: int, end: int) -> None:
+        # an unknown code may be the end of the data so far.
+        if pos + CODE_BITS <= end:
+            logger.debug("Invalid CCITT code at bit %d", pos)
+            self.done = True
+
+    def _decode_1d(
+        self,
+        data: bytes,
+        pos: int,
+        end: int,
+    ) -> Optional[Tuple[List[int], int]]:
+        width = self.width
+        changes: List[int] = []
+        a0 = 0
+        while a0 < width:
+            table = BLACK_TABLE if len(changes) & 1 else WHITE_TABLE
+            run = 0
+            while True:
+                i = pos >> 3
+                code = (
+                    ((data[i] << 16) | (data[i + 1] << 8) | data[i + 2])
+                    >> (11 - (pos & 7))
+                ) & CODE_MASK
+                (value, n) = table[code]
+                if not n:
+                    self._invalid(pos, end)
+                    return None
+                pos += n
+                if value < 64:
+                    break
+                run += value
+            if value == UNCOMPRESSED_1D:
+                result = self._decode_uncompressed(data, pos, end, changes, a0)
+                if result is None:
+                    return None
+                (pos, a0) = result
+                continue
+            a0 += run + value
+            if width < a0:
+                a0 = width
+            if changes and changes[-1] == a0:
+                changes.pop()
+            else:
+                changes.append(a0)
+        return (self._trim(changes), pos)
+
+    def _decode_2d(
+        self,
+        data: bytes,
+        pos: int,
+        end: int,
+    ) -> Optional[Tuple[List[int], int]]:
+        width = self.width
+        ref = self.refline + [width, width, width]
+        changes: List[int] = []
+        a0 = -1
+        j = 0
+        while a0 < width:
+            i = pos >> 3
+            code = (
+                ((data[i] << 16) | (data[i + 1] << 8) | data[i + 2]) >> (11 - (pos & 7))
+            ) & CODE_MASK
+            (mode, n) = MODE_TABLE[code]
+            if not n:
+                self._invalid(pos, end)
+                return None
+            pos += n
+            if mode <= PASS:
+                # b1 is the first changing element of the reference line
+                # after a0 of the other colour than a0, every other one.
+                if j:
+                    j -= 1
+                if (j & 1) != (len(changes) & 1):
+                    j += 1
+                while ref[j] <= a0:
+                    j += 2
+                if mode == PASS:
+                    a0 = ref[j + 1]
+                    continue
+                a1 = ref[j] + mode - VERTICAL
+                if a1 < a0 or a1 < 0:
+                    a1 = a0 if 0 < a0 else 0
+                elif width < a1:
+                    a1 = width
+                if changes and changes[-1] == a1:
+                    changes.pop()
+                else:
+                    changes.append(a1)
+                a0 = a1
+            elif mode == HORIZONTAL:
+                if a0 < 0:
+                    a0 = 0
+                for _ in range(2):
+                    table = BLACK_TABLE if len(changes) & 1 else WHITE_TABLE
+                    while True:
+                        i = pos >> 3
+                        code = (
+                            ((data[i] << 16) | (data[i + 1] << 8) | data[i + 2])
+                            >> (11 - (pos & 7))
+                        ) & CODE_MASK
+                        (value, n) = table[code]
+                        if not n or value < 0:
+                            self._invalid(pos, end)
+                            return None
+                        pos += n
+                        a0 += value
+                        if value < 64:
+                            break
+                    if width < a0:
+                        a0 = width
+                    if changes and changes[-1] == a0:
+                        changes.pop()
+                    else:
+                        changes.append(a0)
+            else:
+                result = self._decode_uncompressed(
+                    data, pos, end, changes, a0 if 0 < a0 else 0
+                )
+                if result is None:
+                    return None
+                (pos, a0) = result
+        return (self._trim(changes), pos)
+
+    def _decode_uncompressed(
+        self,
+        data: bytes,
+        pos: int,
+        end: int,
+        changes: List[int],
+        x: int,
+    ) -> Optional[Tuple[int, int]]:
+        """Adds the changing elements of the uncompressed pixels at pos from
+        x, and returns the positions after them.
+        """
+        width = self.width
+        while True:
+            i = pos >> 3
+            code = (
+                ((data[i] << 16) | (data[i + 1] << 8) | data[i + 2]) >> (11 - (pos & 7))
+            ) & CODE_MASK
+            (value, n) = UNCOMPRESSED_TABLE[code]
+            if not n:
+                self._invalid(pos, end)
+                return None
+            pos += n
+            (pixels, color) = value
+            for c in pixels:
+                if width <= x:
+                    break
+                if int(c) != len(changes) & 1:
+                    changes.append(x)
+                x += 1
+            if 0 <= color or width <= x:
+                break
+        if 0 <= color and color != len(changes) & 1 and x < width:
+            changes.append(x)
+        return (pos, x)
+
+    def _trim(self, changes: List[int]) -> List[int]:
+        while changes and self.width <= changes[-1]:
+            changes.pop()
+        return changes
+
+    def _pack(self, changes: List[int]) -> bytes:
+        """Returns the bits of the line with the changing elements."""
+        if not changes:
+            return self.blank
+        width = self.width
+        if len(changes) & 1:
+            changes = changes + [width]
+        black = 0
+        for k in range(0, len(changes), 2):
+            (a, b) = (changes[k], changes[k + 1])
+            black |= ((1 << (b - a)) - 1) << (width - b)
+        return (self.white ^ (black << self.pad)).to_bytes(self.nbytes, "big")
+
+
 def ccittfaxdecode(data: bytes, params: Dict[str, object]) -> bytes:
-    K = params.get("K")
-    if K == -1:
-        cols = cast(int, params.get("Columns"))
-        bytealign = cast(bool, params.get("EncodedByteAlign"))
-        reversed = cast(bool, params.get("BlackIs1"))
-        parser = CCITTFaxDecoder(cols, bytealign=bytealign, reversed=reversed)
-    else:
-        raise PDFValueError(K)
-    parser.feedbytes(data)
-    return parser.close()
+    return CCITTDecoder(params).decode(data, final=True)
 
 
 # test
@@ -15,12 +15,13 @@ from typing import (
     cast,
 )
 
-from pdfminer import utils
+from pdfminer import profiling, utils
 from pdfminer.image import ImageWriter
 from pdfminer.layout import (
     LAParams,
     LTAnno,
     LTChar,
+    LTCharStyle,
     LTComponent,
     LTContainer,
     LTCurve,
@@ -37,6 +38,7 @@ from pdfminer.layout import (
     LTTextGroup,
     LTTextLine,
     TextGroupElement,
+    get_char_geometry,
 )
 from pdfminer.pdfcolor import PDFColorSpace
 from pdfminer.pdfdevice import PDFTextDevice
@@ -70,11 +72,23 @@ class PDFLayoutAnalyzer(PDFTextDevice):
         rsrcmgr: PDFResourceManager,
         pageno: int = 1,
         laparams: Optional[LAParams] = None,
+        glyph_buffer: bool = False,
+        keep_image_streams: bool = True,
     ) -> None:
+        """glyph_buffer keeps the characters in columns of a GlyphBuffer,
+        LTChar objects are only created for the characters that are used.
+
+        Without keep_image_streams, the LTImage objects of a page drop their
+        streams after receive_layout(), so that the layout keeps no image
+        data.
+        """
         PDFTextDevice.__init__(self, rsrcmgr)
         self.pageno = pageno
         self.laparams = laparams
+        self.glyph_buffer = glyph_buffer
+        self.keep_image_streams = keep_image_streams
         self._stack: List[LTLayoutContainer] = []
+        self._images: List[LTImage] = []
 
     def begin_page(self, page: PDFPage, ctm: Matrix) -> None:
         (x0, y0, x1, y1) = page.mediabox
@@ -82,14 +96,23 @@ class PDFLayoutAnalyzer(PDFTextDevice):
         (x1, y1) = apply_matrix_pt(ctm, (x1, y1))
         mediabox = (0, 0, abs(x0 - x1), abs(y0 - y1))
         self.cur_item = LTPage(self.pageno, mediabox)
+        self._images = []
 
     def end_page(self, page: PDFPage) -> None:
         assert not self._stack, str(len(self._stack))
         assert isinstance(self.cur_item, LTPage), str(type(self.cur_item))
         if self.laparams is not None:
-            self.cur_item.analyze(self.laparams)
+            with profiling.stage("layout.analyze"):
+                self.cur_item.analyze(self.laparams)
+        else:
+            self.cur_item.materialize_glyphs()
         self.pageno += 1
-        self.receive_layout(self.cur_item)
+        with profiling.stage("convert." + type(self).__name__):
+            self.receive_layout(self.cur_item)
+        if not self.keep_image_streams:
+            for image in self._images:
+                image.drop_stream()
+        self._images = []
 
     def begin_figure(self, name: str, bbox: Rect, matrix: Matrix) -> None:
         self._stack.append(self.cur_item)
@@ -99,6 +122,8 @@ class PDFLayoutAnalyzer(PDFTextDevice):
         fig = self.cur_item
         assert isinstance(self.cur_item, LTFigure), str(type(self.cur_item))
         self.cur_item = self._stack.pop()
+        if self.laparams is None:
+            fig.materialize_glyphs()
         self.cur_item.add(fig)
 
     def render_image(self, name: str, stream: PDFStream) -> None:
@@ -109,6 +134,7 @@ class PDFLayoutAnalyzer(PDFTextDevice):
             (self.cur_item.x0, self.cur_item.y0, self.cur_item.x1, self.cur_item.y1),
         )
         self.cur_item.add(item)
+        self._images.append(item)
 
     def paint_path(
         self,
@@ -246,6 +272,19 @@ class PDFLayoutAnalyzer(PDFTextDevice):
             text = self.handle_undefined_char(font, cid)
         textwidth = font.char_width(cid)
         textdisp = font.char_disp(cid)
+        if self.glyph_buffer:
+            (adv, upright, bbox, size) = get_char_geometry(
+                matrix,
+                font,
+                fontsize,
+                scaling,
+                rise,
+                textwidth,
+                textdisp,
+            )
+            style = LTCharStyle.get(font.fontname, ncs, graphicstate)
+            self.cur_item.add_glyph(matrix, style, text, cid, adv, upright, bbox, size)
+            return adv
         item = LTChar(
             matrix,
             font,
@@ -275,8 +314,17 @@ class PDFPageAggregator(PDFLayoutAnalyzer):
         rsrcmgr: PDFResourceManager,
         pageno: int = 1,
         laparams: Optional[LAParams] = None,
+        glyph_buffer: bool = False,
+        keep_image_streams: bool = True,
     ) -> None:
-        PDFLayoutAnalyzer.__init__(self, rsrcmgr, pageno=pageno, laparams=laparams)
+        PDFLayoutAnalyzer.__init__(
+            self,
+            rsrcmgr,
+            pageno=pageno,
+            laparams=laparams,
+            glyph_buffer=glyph_buffer,
+            keep_image_streams=keep_image_streams,
+        )
         self.result: Optional[LTPage] = None
 
     def receive_layout(self, ltpage: LTPage) -> None:
@@ -299,8 +347,15 @@ class PDFConverter(PDFLayoutAnalyzer, Generic[IOType]):
         codec: str = "utf-8",
         pageno: int = 1,
         laparams: Optional[LAParams] = None,
+        glyph_buffer: bool = False,
     ) -> None:
-        PDFLayoutAnalyzer.__init__(self, rsrcmgr, pageno=pageno, laparams=laparams)
+        PDFLayoutAnalyzer.__init__(
+            self,
+            rsrcmgr,
+            pageno=pageno,
+            laparams=laparams,
+            glyph_buffer=glyph_buffer,
+        )
         self.outfp: IOType = outfp
         self.codec = codec
         self.outfp_binary = self._is_binary_stream(self.outfp)
@@ -331,8 +386,16 @@ class TextConverter(PDFConverter[AnyIO]):
         laparams: Optional[LAParams] = None,
         showpageno: bool = False,
         imagewriter: Optional[ImageWriter] = None,
+        glyph_buffer: bool = False,
     ) -> None:
-        super().__init__(rsrcmgr, outfp, codec=codec, pageno=pageno, laparams=laparams)
+        super().__init__(
+            rsrcmgr,
+            outfp,
+            codec=codec,
+            pageno=pageno,
+            laparams=laparams,
+            glyph_buffer=glyph_buffer,
+        )
         self.showpageno = showpageno
         self.imagewriter = imagewriter
 
@@ -345,7 +408,10 @@ class TextConverter(PDFConverter[AnyIO]):
 
     def receive_layout(self, ltpage: LTPage) -> None:
         def render(item: LTItem) -> None:
-            if isinstance(item, LTContainer):
+            if isinstance(item, LTTextLine):
+                # Without creating the characters of an LTGlyphLine.
+                self.write_text(item.get_text())
+            elif isinstance(item, LTContainer):
                 for child in item:
                     render(child)
             elif isinstance(item, LTText):
@@ -1,25 +1,57 @@
 """Functions that can be used for the most common use-cases for pdfminer.six"""
 
+import asyncio
+import contextvars
 import logging
 import sys
-from io import StringIO
-from typing import Any, BinaryIO, Container, Iterator, Optional, cast
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from io import BufferedReader, BytesIO, StringIO
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Container,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Union,
+    cast,
+)
 
+from pdfminer.bytesource import ByteSource, ByteSourceFile
 from pdfminer.converter import (
     HOCRConverter,
     HTMLConverter,
+    PDFLayoutAnalyzer,
     PDFPageAggregator,
     TextConverter,
     XMLConverter,
 )
 from pdfminer.image import ImageWriter
-from pdfminer.layout import LAParams, LTPage
+from pdfminer.layout import LAParams, LTContainer, LTImage, LTItem, LTPage
 from pdfminer.pdfdevice import PDFDevice, TagExtractor
-from pdfminer.pdfexceptions import PDFValueError
+from pdfminer.pdfdocument import PDFDocument, PDFObjectCache
+from pdfminer.pdfexceptions import PDFException, PDFValueError
 from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
 from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import PDFStream, resolve1
 from pdfminer.utils import AnyIO, FileOrName, open_filename
 
+# The default budget of the object cache of iter_text().
+ITER_TEXT_CACHE_BYTES = 32 * 1024 * 1024
+# The block size of the reads of aextract_pages().
+AEXTRACT_BUFFER_SIZE = 64 * 1024
+
+# Reads the given number of bytes at an offset, e.g. with an HTTP range request.
+AsyncReadRange = Callable[[int, int], Awaitable[bytes]]
+
 
 def extract_text_to_fp(
     inf: BinaryIO,
@@ -37,6 +69,7 @@ def extract_text_to_fp(
     strip_control: bool = False,
     debug: bool = False,
     disable_caching: bool = False,
+    workers: int = 1,
     **kwargs: Any,
 ) -> None:
     """Parses text from inf-file and writes to outfp file-like object.
@@ -64,6 +97,8 @@ def extract_text_to_fp(
     :param strip_control: Does what it says on the tin
     :param debug: Output more logging data
     :param disable_caching: Does what it says on the tin
+    :param workers: Number of processes that lay out the pages. Not
+        supported for the 'tag' output type.
     :param other:
     :return: nothing, acting as it does on two streams. Use StringIO to get
         strings.
@@ -129,6 +164,24 @@ def extract_text_to_fp(
         raise PDFValueError(msg)
 
     assert device is not None
+    if workers != 1:
+        if not isinstance(device, PDFLayoutAnalyzer):
+            msg = f"Output type {output_type} does not support workers"
+            raise PDFValueError(msg)
+        layouts = _extract_layouts(
+            inf,
+            password,
+            page_numbers,
+            maxpages,
+            not disable_caching,
+            laparams,
+            workers,
+            rotation=rotation,
+        )
+        _receive_layouts(device, layouts)
+        device.close()
+        return
+
     interpreter = PDFPageInterpreter(rsrcmgr, device)
     for page in PDFPage.get_pages(
         inf,
@@ -151,6 +204,7 @@ def extract_text(
     caching: bool = True,
     codec: str = "utf-8",
     laparams: Optional[LAParams] = None,
+    workers: int = 1,
 ) -> str:
     """Parse and return the text contained in a PDF file.
 
@@ -163,6 +217,7 @@ def extract_text(
     :param codec: Text decoding codec
     :param laparams: An LAParams object from pdfminer.layout. If None, uses
         some default settings that often work well.
+    :param workers: Number of processes that lay out the pages.
     :return: a string containing all of the text extracted.
     """
     if laparams is None:
@@ -172,6 +227,19 @@ def extract_text(
         fp = cast(BinaryIO, fp)  # we opened in binary mode
         rsrcmgr = PDFResourceManager(caching=caching)
         device = TextConverter(rsrcmgr, output_string, codec=codec, laparams=laparams)
+        if workers != 1:
+            layouts = _extract_layouts(
+                fp,
+                password,
+                page_numbers,
+                maxpages,
+                caching,
+                laparams,
+                workers,
+            )
+            _receive_layouts(device, layouts)
+            return output_string.getvalue()
+
         interpreter = PDFPageInterpreter(rsrcmgr, device)
 
         for page in PDFPage.get_pages(
@@ -186,6 +254,60 @@ def extract_text(
         return output_string.getvalue()
 
 
+def iter_text(
+    pdf_file: FileOrName,
+    password: str = "",
+    page_numbers: Optional[Container[int]] = None,
+    maxpages: int = 0,
+    caching: bool = True,
+    codec: str = "utf-8",
+    laparams: Optional[LAParams] = None,
+    cache: Optional[PDFObjectCache] = None,
+) -> Iterator[str]:
+    """Parse a PDF file and yield the text of each page.
+
+    The pages joined together are the text that extract_text() returns,
+    but only the current page is held in memory.
+
+    :param pdf_file: Either a file path or a file-like object for the PDF file
+        to be worked on.
+    :param password: For encrypted PDFs, the password to decrypt.
+    :param page_numbers: List of zero-indexed page numbers to extract.
+    :param maxpages: The maximum number of pages to parse
+    :param caching: If resources should be cached
+    :param codec: Text decoding codec
+    :param laparams: An LAParams object from pdfminer.layout. If None, uses
+        some default settings that often work well.
+    :param cache: The cache for the objects of the document. If None and
+        caching is enabled, at most ITER_TEXT_CACHE_BYTES are cached.
+    :return: the text of each page, ending with a form feed.
+    """
+    if laparams is None:
+        laparams = LAParams()
+    if cache is None and caching:
+        cache = PDFObjectCache(max_bytes=ITER_TEXT_CACHE_BYTES)
+
+    with open_filename(pdf_file, "rb") as fp, StringIO() as output_string:
+        fp = cast(BinaryIO, fp)  # we opened in binary mode
+        rsrcmgr = PDFResourceManager(caching=caching)
+        device = TextConverter(rsrcmgr, output_string, codec=codec, laparams=laparams)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+
+        for page in PDFPage.get_pages(
+            fp,
+            page_numbers,
+            maxpages=maxpages,
+            password=password,
+            caching=caching,
+            cache=cache,
+        ):
+            interpreter.process_page(page)
+            text = output_string.getvalue()
+            output_string.seek(0)
+            output_string.truncate()
+            yield text
+
+
 def extract_pages(
     pdf_file: FileOrName,
     password: str = "",
@@ -193,6 +315,7 @@ def extract_pages(
     maxpages: int = 0,
     caching: bool = True,
     laparams: Optional[LAParams] = None,
+    workers: int = 1,
 ) -> Iterator[LTPage]:
     """Extract and yield LTPage objects
 
@@ -204,6 +327,8 @@ def extract_pages(
     :param caching: If resources should be cached
     :param laparams: An LAParams object from pdfminer.layout. If None, uses
         some default settings that often work well.
+    :param workers: Number of processes that lay out the pages. The pages
+        are still yielded in order.
     :return: LTPage objects
     """
     if laparams is None:
@@ -211,6 +336,18 @@ def extract_pages(
 
     with open_filename(pdf_file, "rb") as fp:
         fp = cast(BinaryIO, fp)  # we opened in binary mode
+        if workers != 1:
+            yield from _extract_layouts(
+                fp,
+                password,
+                page_numbers,
+                maxpages,
+                caching,
+                laparams,
+                workers,
+            )
+            return
+
         resource_manager = PDFResourceManager(caching=caching)
         device = PDFPageAggregator(resource_manager, laparams=laparams)
         interpreter = PDFPageInterpreter(resource_manager, device)
@@ -224,3 +361,279 @@ def extract_pages(
             interpreter.process_page(page)
             layout = device.get_result()
             yield layout
+
+
+async def aextract_pages(
+    read_range: AsyncReadRange,
+    size: int,
+    password: str = "",
+    page_numbers: Optional[Container[int]] = None,
+    maxpages: int = 0,
+    caching: bool = True,
+    laparams: Optional[LAParams] = None,
+    executor: Optional[Executor] = None,
+    buffer_size: int = AEXTRACT_BUFFER_SIZE,
+) -> AsyncIterator[LTPage]:
+    """Extract and yield LTPage objects without blocking the event loop
+
+    The document is parsed and laid out in an executor, one page per call,
+    while its bytes are read through the read_range coroutine on the event
+    loop. Only the parts of the document that are used are read.
+
+    Cancelling the task that iterates stops the extraction after the page
+    that is being processed.
+
+    :param read_range: Coroutine function that returns length bytes of the
+        PDF file starting at offset, as in read_range(offset, length).
+    :param size: The size of the PDF file in bytes.
+    :param password: For encrypted PDFs, the password to decrypt.
+    :param page_numbers: List of zero-indexed page numbers to extract.
+    :param maxpages: The maximum number of pages to parse
+    :param caching: If resources should be cached
+    :param laparams: An LAParams object from pdfminer.layout. If None, uses
+        some default settings that often work well.
+    :param executor: The executor that runs the extraction, the default
+        executor of the event loop if None.
+    :param buffer_size: The size of the blocks that are read and cached.
+    :return: LTPage objects
+    """
+    loop = asyncio.get_running_loop()
+    # The file is opened in the executor too, since opening it reads.
+    pages = _extract_pages_from_source(
+        _AsyncByteSource(read_range, size, loop),
+        buffer_size,
+        password=password,
+        page_numbers=page_numbers,
+        maxpages=maxpages,
+        caching=caching,
+        laparams=laparams,
+    )
+    # The pages are extracted in one thread at a time.
+    lock = threading.Lock()
+    try:
+        while True:
+            # The profilers of this task record the page.
+            context = contextvars.copy_context()
+            page = await loop.run_in_executor(
+                executor,
+                _next_page,
+                pages,
+                lock,
+                context,
+            )
+            if page is None:
+                break
+            yield page
+    finally:
+        # A page may still be in progress if the task was cancelled.
+        if loop.is_closed():
+            _close_pages(pages, lock)
+        else:
+            loop.run_in_executor(executor, _close_pages, pages, lock)
+
+
+def _extract_layouts(
+    fp: BinaryIO,
+    password: str,
+    page_numbers: Optional[Container[int]],
+    maxpages: int,
+    caching: bool,
+    laparams: Optional[LAParams],
+    workers: int,
+    rotation: int = 0,
+) -> Iterator[LTPage]:
+    """Lay out the pages in a pool of processes and yield them in order.
+
+    The selected pages are split into one contiguous slice per process.
+    Every process opens the document once and lays out its slice.
+    """
+    if workers < 1:
+        raise PDFValueError(f"workers must be at least 1, not {workers}")
+
+    npages = len(PDFDocument(PDFParser(fp), password=password).pages)
+    if maxpages:
+        npages = min(npages, maxpages)
+    pagenos = [
+        pageno for pageno in range(npages) if not page_numbers or pageno in page_numbers
+    ]
+    slices = [
+        pagenos[len(pagenos) * i // workers : len(pagenos) * (i + 1) // workers]
+        for i in range(workers)
+    ]
+    slices = [pages for pages in slices if pages]
+    if not slices:
+        return
+
+    # Paths are opened again by the processes, file objects are copied.
+    name = getattr(fp, "name", None)
+    source: Union[str, bytes]
+    if isinstance(name, str) and isinstance(fp, BufferedReader):
+        source = name
+    else:
+        fp.seek(0)
+        source = fp.read()
+
+    with ProcessPoolExecutor(max_workers=len(slices)) as executor:
+        futures: List["Future[List[LTPage]]"] = []
+        pageid = 1
+        for pages in slices:
+            future = executor.submit(
+                _layout_pages,
+                source,
+                pages,
+                password,
+                caching,
+                laparams,
+                rotation,
+                pageid,
+            )
+            futures.append(future)
+            pageid += len(pages)
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _layout_pages(
+    source: Union[str, bytes],
+    pagenos: List[int],
+    password: str,
+    caching: bool,
+    laparams: Optional[LAParams],
+    rotation: int,
+    pageid: int,
+) -> List[LTPage]:
+    """Lay out some pages of a document, in a worker process."""
+    with open_filename(
+        BytesIO(source) if isinstance(source, bytes) else source,
+        "rb",
+    ) as fp:
+        fp = cast(BinaryIO, fp)
+        doc = PDFDocument(PDFParser(fp), password=password, caching=caching)
+        rsrcmgr = PDFResourceManager(caching=caching)
+        device = PDFPageAggregator(rsrcmgr, pageno=pageid, laparams=laparams)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        layouts: List[LTPage] = []
+        # the pages are counted with doc.pages too, see _extract_layouts().
+        for pageno in pagenos:
+            try:
+                page = doc.pages[pageno]
+            except IndexError:
+                # /Count promised more pages than there are.
+                break
+            page.rotate = (page.rotate + rotation) % 360
+            interpreter.process_page(page)
+            layout = device.get_result()
+            # The image filters are resolved while the document is at hand,
+            # the streams are decoded after they are sent back.
+            _resolve_images(layout)
+            layouts.append(layout)
+    return layouts
+
+
+def _resolve_images(item: LTItem) -> None:
+    if isinstance(item, LTImage):
+        if item.stream is not None:
+            _resolve_stream(item.stream, set())
+    elif isinstance(item, LTContainer):
+        for child in item:
+            _resolve_images(child)
+
+
+def _resolve_stream(stream: PDFStream, seen: Set[int]) -> None:
+    """Resolves the filters of a stream and their parameters, so that it can
+    be decoded without its document.
+    """
+    if id(stream) in seen:
+        return
+    seen.add(id(stream))
+    try:
+        filters = stream.get_filters()
+    except PDFException:
+        return
+    attrs = {
+        k: v
+        for (k, v) in stream.attrs.items()
+        if k not in ("F", "Filter", "DP", "DecodeParms", "FDecodeParms")
+    }
+    if filters:
+        attrs["Filter"] = [f for (f, _) in filters]
+        attrs["DecodeParms"] = [
+            _resolve_params(params, seen) for (_, params) in filters
+        ]
+    stream.attrs = attrs
+
+
+def _resolve_params(params: object, seen: Set[int]) -> object:
+    """Resolves the values of filter parameters, including streams such as
+    JBIG2Globals.
+    """
+    if not isinstance(params, dict):
+        return params
+    resolved = {}
+    for k, v in params.items():
+        value = resolve1(v)
+        if isinstance(value, PDFStream):
+            _resolve_stream(value, seen)
+        resolved[k] = value
+    return resolved
+
+
+def _receive_layouts(device: PDFLayoutAnalyzer, layouts: Iterable[LTPage]) -> None:
+    """Feed pages that were laid out elsewhere to a device."""
+    for layout in layouts:
+        device.pageno += 1
+        device.receive_layout(layout)
+
+
+class _AsyncByteSource(ByteSource):
+    """Reads through a coroutine, from another thread than the event loop."""
+
+    def __init__(
+        self,
+        read_range: AsyncReadRange,
+        size: int,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        self._read_range = read_range
+        self.size = size
+        self.loop = loop
+
+    def get_size(self) -> int:
+        return self.size
+
+    def read_range(self, offset: int, length: int) -> bytes:
+        future = asyncio.run_coroutine_threadsafe(
+            self._read_range(offset, length),
+            self.loop,
+        )
+        return future.result()[:length]
+
+
+def _extract_pages_from_source(
+    source: ByteSource,
+    block_size: int,
+    **kwargs: Any,
+) -> Generator[LTPage, None, None]:
+    with ByteSourceFile(source, block_size=block_size) as fp:
+        yield from extract_pages(fp, **kwargs)
+
+
+def _next_page(
+    pages: Generator[LTPage, None, None],
+    lock: threading.Lock,
+    context: contextvars.Context,
+) -> Optional[LTPage]:
+    with lock:
+        try:
+            return context.run(pages.send, None)
+        except StopIteration:
+            return None
+
+
+def _close_pages(pages: Generator[LTPage, None, None], lock: threading.Lock) -> None:
+    with lock:
+        pages.close()
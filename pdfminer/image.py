@@ -25,6 +25,7 @@ from pdfminer.pdftypes import (
     LITERALS_FLATE_DECODE,
     LITERALS_JBIG2_DECODE,
     LITERALS_JPX_DECODE,
+    resolve1,
 )
 
 PIL_ERROR_MESSAGE = (
@@ -113,7 +114,7 @@ class ImageWriter:
         """Save an LTImage to disk"""
         (width, height) = image.srcsize
 
-        filters = image.stream.get_filters()
+        filters = image.get_filters()
 
         if filters[-1][0] in LITERALS_DCT_DECODE:
             name = self._save_jpeg(image)
@@ -149,8 +150,6 @@ class ImageWriter:
 
     def _save_jpeg(self, image: LTImage) -> str:
         """Save a JPEG encoded image"""
-        data = image.stream.get_data()
-
         name, path = self._create_unique_image_name(image, ".jpg")
         with open(path, "wb") as fp:
             if LITERAL_DEVICE_CMYK in image.colorspace:
@@ -159,19 +158,20 @@ class ImageWriter:
                 except ImportError:
                     raise ImportError(PIL_ERROR_MESSAGE)
 
-                ifp = BytesIO(data)
+                ifp = BytesIO(image.get_data())
                 i = Image.open(ifp)
                 i = ImageChops.invert(i)
                 i = i.convert("RGB")
                 i.save(fp, "JPEG")
             else:
-                fp.write(data)
+                for chunk in image.iter_data():
+                    fp.write(chunk)
 
         return name
 
     def _save_jpeg2000(self, image: LTImage) -> str:
         """Save a JPEG 2000 encoded image"""
-        data = image.stream.get_data()
+        data = image.get_data()
 
         name, path = self._create_unique_image_name(image, ".jp2")
         with open(path, "wb") as fp:
@@ -196,10 +196,10 @@ class ImageWriter:
             input_stream = BytesIO()
 
             global_streams = []
-            filters = image.stream.get_filters()
+            filters = image.get_filters()
             for filter_name, params in filters:
                 if filter_name in LITERALS_JBIG2_DECODE:
-                    global_streams.append(params["JBIG2Globals"].resolve())
+                    global_streams.append(resolve1(params["JBIG2Globals"]))
 
             if len(global_streams) > 1:
                 msg = (
@@ -209,7 +209,7 @@ class ImageWriter:
                 raise PDFValueError(msg)
             if len(global_streams) == 1:
                 input_stream.write(global_streams[0].get_data().rstrip(b"\n"))
-            input_stream.write(image.stream.get_data())
+            input_stream.write(image.get_data())
             input_stream.seek(0)
             reader = JBIG2StreamReader(input_stream)
             segments = reader.get_segments()
@@ -230,18 +230,29 @@ class ImageWriter:
         name, path = self._create_unique_image_name(image, ".bmp")
         with open(path, "wb") as fp:
             bmp = BMPWriter(fp, bits, width, height)
-            data = image.stream.get_data()
-            i = 0
-            for y in range(height):
-                bmp.write_line(y, data[i : i + bytes_per_line])
-                i += bytes_per_line
+            # the lines are written as they are decoded.
+            y = 0
+            data = b""
+            for chunk in image.iter_data():
+                data += chunk
+                i = 0
+                while y < height and i + bytes_per_line <= len(data):
+                    bmp.write_line(y, data[i : i + bytes_per_line])
+                    i += bytes_per_line
+                    y += 1
+                data = data[i:]
+                if y == height:
+                    break
+            if y < height and data:
+                bmp.write_line(y, data[:bytes_per_line])
         return name
 
     def _save_bytes(self, image: LTImage) -> str:
         """Save an image without encoding, just bytes"""
         name, path = self._create_unique_image_name(image, ".jpg")
         width, height = image.srcsize
-        channels = len(image.stream.get_data()) / width / height / (image.bits / 8)
+        data = image.get_data()
+        channels = len(data) / width / height / (image.bits / 8)
         with open(path, "wb") as fp:
             try:
                 from PIL import (
@@ -261,7 +272,7 @@ class ImageWriter:
             elif image.bits == 8 and channels == 4:
                 mode = "CMYK"
 
-            img = Image.frombytes(mode, image.srcsize, image.stream.get_data(), "raw")
+            img = Image.frombytes(mode, image.srcsize, data, "raw")
             if mode == "L":
                 img = ImageOps.invert(img)
 
@@ -275,12 +286,13 @@ class ImageWriter:
         name, path = self._create_unique_image_name(image, ext)
 
         with open(path, "wb") as fp:
-            fp.write(image.stream.get_data())
+            for chunk in image.iter_data():
+                fp.write(chunk)
         return name
 
     @staticmethod
     def _is_jbig2_iamge(image: LTImage) -> bool:
-        filters = image.stream.get_filters()
+        filters = image.get_filters()
         for filter_name, params in filters:
             if filter_name in LITERALS_JBIG2_DECODE:
                 return True
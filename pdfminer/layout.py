@@ -1,8 +1,13 @@
 import heapq
 import logging
+import weakref
+from array import array
+from itertools import chain
 from typing import (
+    Any,
     Dict,
     Generic,
+    Hashable,
     Iterable,
     Iterator,
     List,
@@ -15,19 +20,23 @@ from typing import (
     cast,
 )
 
+from pdfminer import profiling
 from pdfminer.pdfcolor import PDFColorSpace
 from pdfminer.pdfexceptions import PDFTypeError, PDFValueError
 from pdfminer.pdffont import PDFFont
 from pdfminer.pdfinterp import Color, PDFGraphicState
-from pdfminer.pdftypes import PDFStream
+from pdfminer.pdftypes import STREAM_CHUNK_SIZE, PDFStream, resolve1
+from pdfminer.psparser import literal_name
 from pdfminer.utils import (
     INF,
+    SPATIAL_INDEXES,
     LTComponentT,
     Matrix,
     PathSegment,
     Plane,
     Point,
     Rect,
+    RTreeIndex,
     apply_matrix_pt,
     bbox2str,
     fsplit,
@@ -36,8 +45,16 @@ from pdfminer.utils import (
     uniq,
 )
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+# get_alignments() uses NumPy, if installed, from this many characters on.
+NUMPY_MIN_CHARS = 64
+
 
 class IndexAssigner:
     def __init__(self, index: int = 0) -> None:
@@ -78,6 +95,9 @@ class LAParams:
         layout analysis
     :param all_texts: If layout analysis should be performed on text in
         figures.
+    :param spatial_index: The spatial index used to find neighboring lines
+        and boxes, either "grid" or "rtree". The R-tree index keeps its
+        speed on dense pages with many thousands of lines.
     """
 
     def __init__(
@@ -89,6 +109,7 @@ class LAParams:
         boxes_flow: Optional[float] = 0.5,
         detect_vertical: bool = False,
         all_texts: bool = False,
+        spatial_index: str = "grid",
     ) -> None:
         self.line_overlap = line_overlap
         self.char_margin = char_margin
@@ -97,6 +118,7 @@ class LAParams:
         self.boxes_flow = boxes_flow
         self.detect_vertical = detect_vertical
         self.all_texts = all_texts
+        self.spatial_index = spatial_index
 
         self._validate()
 
@@ -111,6 +133,11 @@ class LAParams:
                 raise PDFTypeError(boxes_flow_err_msg)
             if not -1 <= self.boxes_flow <= 1:
                 raise PDFValueError(boxes_flow_err_msg)
+        if self.spatial_index not in SPATIAL_INDEXES:
+            raise PDFValueError(
+                "LAParam spatial_index should be one of %s"
+                % ", ".join(map(repr, SPATIAL_INDEXES)),
+            )
 
     def __repr__(self) -> str:
         return (
@@ -123,6 +150,10 @@ class LAParams:
 class LTItem:
     """Interface for things that can be analyzed"""
 
+    # The attributes of the layout objects are slots. Other attributes can
+    # still be set, the __dict__ is only created for them.
+    __slots__ = ("__dict__", "__weakref__")
+
     def analyze(self, laparams: LAParams) -> None:
         """Perform the layout analysis."""
 
@@ -130,6 +161,8 @@ class LTItem:
 class LTText:
     """Interface for things that have text"""
 
+    __slots__ = ()
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} {self.get_text()!r}>"
 
@@ -141,6 +174,8 @@ class LTText:
 class LTComponent(LTItem):
     """Object with a bounding box"""
 
+    __slots__ = ("x0", "y0", "x1", "y1", "width", "height", "bbox")
+
     def __init__(self, bbox: Rect) -> None:
         LTItem.__init__(self)
         self.set_bbox(bbox)
@@ -220,6 +255,18 @@ class LTCurve(LTComponent):
     `dashing_style` contains the Dashing information if any.
     """
 
+    __slots__ = (
+        "pts",
+        "linewidth",
+        "stroke",
+        "fill",
+        "evenodd",
+        "stroking_color",
+        "non_stroking_color",
+        "original_path",
+        "dashing_style",
+    )
+
     def __init__(
         self,
         linewidth: float,
@@ -253,6 +300,8 @@ class LTLine(LTCurve):
     Could be used for separating text or figures.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         linewidth: float,
@@ -286,6 +335,8 @@ class LTRect(LTCurve):
     Could be used for framing another pictures or figures.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         linewidth: float,
@@ -317,22 +368,55 @@ class LTImage(LTComponent):
     """An image object.
 
     Embedded images can be in JPEG, Bitmap or JBIG2.
+
+    The image is described by the object id, size, colour space and filters
+    of its stream. The stream is only decoded by get_data() and iter_data(),
+    which do not keep the decoded data, e.g. when an ImageWriter asks for
+    it. After drop_stream(), only the description is left.
     """
 
     def __init__(self, name: str, stream: PDFStream, bbox: Rect) -> None:
         LTComponent.__init__(self, bbox)
         self.name = name
-        self.stream = stream
+        self.stream: Optional[PDFStream] = stream
+        self.objid = stream.objid
         self.srcsize = (stream.get_any(("W", "Width")), stream.get_any(("H", "Height")))
         self.imagemask = stream.get_any(("IM", "ImageMask"))
         self.bits = stream.get_any(("BPC", "BitsPerComponent"), 1)
         self.colorspace = stream.get_any(("CS", "ColorSpace"))
         if not isinstance(self.colorspace, list):
             self.colorspace = [self.colorspace]
+        filters = resolve1(stream.get_any(("F", "Filter")))
+        if not isinstance(filters, list):
+            filters = [filters] if filters else []
+        self.filters = [literal_name(resolve1(f)) for f in filters]
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}({self.name}) {bbox2str(self.bbox)} {self.srcsize!r}>"
 
+    def get_stream(self) -> PDFStream:
+        if self.stream is None:
+            raise PDFValueError("The stream of image %r was dropped" % self.name)
+        return self.stream
+
+    def get_filters(self) -> List[Tuple[Any, Any]]:
+        return self.get_stream().get_filters()
+
+    def get_data(self) -> bytes:
+        """Returns the decoded data, decoding the stream each time unless it
+        is decoded already.
+        """
+        stream = self.get_stream()
+        if stream.data is not None:
+            return stream.data
+        return b"".join(stream.iter_data())
+
+    def iter_data(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        return self.get_stream().iter_data(chunk_size)
+
+    def drop_stream(self) -> None:
+        self.stream = None
+
 
 class LTAnno(LTItem, LTText):
     """Actual letter in the text as a Unicode string.
@@ -342,6 +426,8 @@ class LTAnno(LTItem, LTText):
     according to the relationship between two characters (e.g. a space).
     """
 
+    __slots__ = ("_text",)
+
     def __init__(self, text: str) -> None:
         self._text = text
 
@@ -349,8 +435,133 @@ class LTAnno(LTItem, LTText):
         return self._text
 
 
+class LTCharStyle:
+    """The font name, colour space and graphic state of characters.
+
+    Characters with equal styles share one LTCharStyle, see get().
+    """
+
+    __slots__ = ("fontname", "ncs", "graphicstate", "__weakref__")
+
+    _styles: "weakref.WeakValueDictionary[Hashable, LTCharStyle]" = (
+        weakref.WeakValueDictionary()
+    )
+    # The arguments and the result of the last call of get().
+    _last: Tuple[object, object, object, Optional["LTCharStyle"]] = (
+        None,
+        None,
+        None,
+        None,
+    )
+
+    def __init__(
+        self,
+        fontname: str,
+        ncs: PDFColorSpace,
+        graphicstate: PDFGraphicState,
+    ) -> None:
+        self.fontname = fontname
+        self.ncs = ncs
+        self.graphicstate = graphicstate
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.fontname!r} {self.ncs!r}>"
+
+    @classmethod
+    def get(
+        cls,
+        fontname: str,
+        ncs: PDFColorSpace,
+        graphicstate: PDFGraphicState,
+    ) -> "LTCharStyle":
+        """Returns the shared style for the font, colour space and state.
+
+        The graphic states are compared by value, so the state of a shared
+        style must not be changed.
+        """
+        (last_fontname, last_ncs, last_graphicstate, style) = cls._last
+        if style is not None and ncs is last_ncs and fontname == last_fontname:
+            # The characters of a string share their arguments, the strings
+            # of a text object usually have equal graphic states.
+            if graphicstate is last_graphicstate:
+                return style
+            if vars(graphicstate) == vars(style.graphicstate):
+                cls._last = (fontname, ncs, graphicstate, style)
+                return style
+        key: Hashable = (fontname, id(ncs), tuple(vars(graphicstate).values()))
+        try:
+            style = cls._styles.get(key)
+        except TypeError:
+            # Lists in the state, e.g. a dash pattern.
+            key = (fontname, id(ncs), _freeze(vars(graphicstate)))
+            style = cls._styles.get(key)
+        if style is None:
+            style = cls(fontname, ncs, graphicstate)
+            cls._styles[key] = style
+        cls._last = (fontname, ncs, graphicstate, style)
+        return style
+
+
+def _freeze(value: object) -> Hashable:
+    """Returns a hashable version of lists and dicts of values."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for (k, v) in value.items())
+    return cast(Hashable, value)
+
+
+def get_char_geometry(
+    matrix: Matrix,
+    font: PDFFont,
+    fontsize: float,
+    scaling: float,
+    rise: float,
+    textwidth: float,
+    textdisp: Union[float, Tuple[Optional[float], float]],
+) -> Tuple[float, bool, Rect, float]:
+    """Returns the advance, uprightness, bounding box and size of a character."""
+    adv = textwidth * fontsize * scaling
+    # compute the boundary rectangle.
+    if font.is_vertical():
+        # vertical
+        assert isinstance(textdisp, tuple)
+        (vx, vy) = textdisp
+        if vx is None:
+            vx = fontsize * 0.5
+        else:
+            vx = vx * fontsize * 0.001
+        vy = (1000 - vy) * fontsize * 0.001
+        bbox_lower_left = (-vx, vy + rise + adv)
+        bbox_upper_right = (-vx + fontsize, vy + rise)
+    else:
+        # horizontal
+        descent = font.get_descent() * fontsize
+        bbox_lower_left = (0, descent + rise)
+        bbox_upper_right = (adv, descent + rise + fontsize)
+    (a, b, c, d, e, f) = matrix
+    upright = a * d * scaling > 0 and b * c <= 0
+    (x0, y0) = apply_matrix_pt(matrix, bbox_lower_left)
+    (x1, y1) = apply_matrix_pt(matrix, bbox_upper_right)
+    if x1 < x0:
+        (x0, x1) = (x1, x0)
+    if y1 < y0:
+        (y0, y1) = (y1, y0)
+    if font.is_vertical():
+        size = x1 - x0
+    else:
+        size = y1 - y0
+    return (adv, upright, (x0, y0, x1, y1), size)
+
+
 class LTChar(LTComponent, LTText):
-    """Actual letter in the text as a Unicode string."""
+    """Actual letter in the text as a Unicode string.
+
+    The font name, colour space and graphic state are kept in an
+    LTCharStyle that is shared by the characters with the same style.
+    """
+
+    __slots__ = ("_text", "matrix", "style", "adv", "upright", "size")
 
     def __init__(
         self,
@@ -368,48 +579,343 @@ class LTChar(LTComponent, LTText):
         LTText.__init__(self)
         self._text = text
         self.matrix = matrix
-        self.fontname = font.fontname
-        self.ncs = ncs
-        self.graphicstate = graphicstate
-        self.adv = textwidth * fontsize * scaling
-        # compute the boundary rectangle.
-        if font.is_vertical():
-            # vertical
-            assert isinstance(textdisp, tuple)
-            (vx, vy) = textdisp
-            if vx is None:
-                vx = fontsize * 0.5
-            else:
-                vx = vx * fontsize * 0.001
-            vy = (1000 - vy) * fontsize * 0.001
-            bbox_lower_left = (-vx, vy + rise + self.adv)
-            bbox_upper_right = (-vx + fontsize, vy + rise)
-        else:
-            # horizontal
-            descent = font.get_descent() * fontsize
-            bbox_lower_left = (0, descent + rise)
-            bbox_upper_right = (self.adv, descent + rise + fontsize)
-        (a, b, c, d, e, f) = self.matrix
-        self.upright = a * d * scaling > 0 and b * c <= 0
-        (x0, y0) = apply_matrix_pt(self.matrix, bbox_lower_left)
-        (x1, y1) = apply_matrix_pt(self.matrix, bbox_upper_right)
-        if x1 < x0:
-            (x0, x1) = (x1, x0)
-        if y1 < y0:
-            (y0, y1) = (y1, y0)
-        LTComponent.__init__(self, (x0, y0, x1, y1))
-        if font.is_vertical():
-            self.size = self.width
-        else:
-            self.size = self.height
+        self.style = LTCharStyle.get(font.fontname, ncs, graphicstate)
+        (self.adv, self.upright, bbox, self.size) = get_char_geometry(
+            matrix,
+            font,
+            fontsize,
+            scaling,
+            rise,
+            textwidth,
+            textdisp,
+        )
+        LTComponent.__init__(self, bbox)
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} {bbox2str(self.bbox)} matrix={matrix2str(self.matrix)} font={self.fontname!r} adv={self.adv} text={self.get_text()!r}>"
 
+    @property
+    def fontname(self) -> str:
+        return self.style.fontname
+
+    @fontname.setter
+    def fontname(self, fontname: str) -> None:
+        self.style = LTCharStyle.get(fontname, self.ncs, self.graphicstate)
+
+    @property
+    def ncs(self) -> PDFColorSpace:
+        return self.style.ncs
+
+    @ncs.setter
+    def ncs(self, ncs: PDFColorSpace) -> None:
+        self.style = LTCharStyle.get(self.fontname, ncs, self.graphicstate)
+
+    @property
+    def graphicstate(self) -> PDFGraphicState:
+        return self.style.graphicstate
+
+    @graphicstate.setter
+    def graphicstate(self, graphicstate: PDFGraphicState) -> None:
+        self.style = LTCharStyle.get(self.fontname, self.ncs, graphicstate)
+
     def get_text(self) -> str:
         return self._text
 
 
+def get_alignments(
+    laparams: LAParams,
+    x0: Sequence[float],
+    y0: Sequence[float],
+    x1: Sequence[float],
+    y1: Sequence[float],
+) -> Tuple[List[bool], List[bool]]:
+    """Returns whether each character and the next one are aligned.
+
+    The characters are given by the columns of their bounding boxes. The
+    first list tells whether they are horizontally aligned (halign), the
+    second whether they are vertically aligned (valign), as defined in
+    group_objects(). NumPy is used for longer sequences if it is installed.
+    """
+    if numpy is not None and NUMPY_MIN_CHARS <= len(x0):
+        return _get_alignments_numpy(laparams, x0, y0, x1, y1)
+    line_overlap = laparams.line_overlap
+    char_margin = laparams.char_margin
+    detect_vertical = laparams.detect_vertical
+    halign: List[bool] = []
+    valign: List[bool] = []
+    # The predicates of LTComponent, inlined. min(a, b) is written as
+    # b if b < a else a, which is what min() returns.
+    for ax0, ay0, ax1, ay1, bx0, by0, bx1, by1 in zip(
+        x0,
+        y0,
+        x1,
+        y1,
+        x0[1:],
+        y0[1:],
+        x1[1:],
+        y1[1:],
+    ):
+        hoverlapping = bx0 <= ax1 and ax0 <= bx1
+        voverlapping = by0 <= ay1 and ay0 <= by1
+        # halign: obj0 and obj1 is horizontally aligned.
+        #
+        #   +------+ - - -
+        #   | obj0 | - - +------+   -
+        #   |      |     | obj1 |   | (line_overlap)
+        #   +------+ - - |      |   -
+        #          - - - +------+
+        #
+        #          |<--->|
+        #        (char_margin)
+        h = False
+        if voverlapping:
+            (aheight, bheight) = (ay1 - ay0, by1 - by0)
+            (d0, d1) = (abs(ay0 - by1), abs(ay1 - by0))
+            if (bheight if bheight < aheight else aheight) * line_overlap < (
+                d1 if d1 < d0 else d0
+            ):
+                if hoverlapping:
+                    distance = 0.0
+                else:
+                    (d0, d1) = (abs(ax0 - bx1), abs(ax1 - bx0))
+                    distance = d1 if d1 < d0 else d0
+                (awidth, bwidth) = (ax1 - ax0, bx1 - bx0)
+                h = distance < (bwidth if bwidth > awidth else awidth) * char_margin
+        # valign: obj0 and obj1 is vertically aligned.
+        #
+        #   +------+
+        #   | obj0 |
+        #   |      |
+        #   +------+ - - -
+        #     |    |     | (char_margin)
+        #     +------+ - -
+        #     | obj1 |
+        #     |      |
+        #     +------+
+        #
+        #     |<-->|
+        #   (line_overlap)
+        v = False
+        if detect_vertical and hoverlapping:
+            (awidth, bwidth) = (ax1 - ax0, bx1 - bx0)
+            (d0, d1) = (abs(ax0 - bx1), abs(ax1 - bx0))
+            if (bwidth if bwidth < awidth else awidth) * line_overlap < (
+                d1 if d1 < d0 else d0
+            ):
+                if voverlapping:
+                    distance = 0.0
+                else:
+                    (d0, d1) = (abs(ay0 - by1), abs(ay1 - by0))
+                    distance = d1 if d1 < d0 else d0
+                (aheight, bheight) = (ay1 - ay0, by1 - by0)
+                v = distance < (bheight if bheight > aheight else aheight) * char_margin
+        halign.append(h)
+        valign.append(v)
+    return (halign, valign)
+
+
+def _get_alignments_numpy(
+    laparams: LAParams,
+    x0: Sequence[float],
+    y0: Sequence[float],
+    x1: Sequence[float],
+    y1: Sequence[float],
+) -> Tuple[List[bool], List[bool]]:
+    assert numpy is not None
+
+    def minimum(a: Any, b: Any) -> Any:
+        # As min(a, b), also for NaN.
+        return numpy.where(b < a, b, a)
+
+    def maximum(a: Any, b: Any) -> Any:
+        return numpy.where(b > a, b, a)
+
+    (x0s, y0s, x1s, y1s) = (numpy.asarray(c, dtype=float) for c in (x0, y0, x1, y1))
+    (ax0, ay0, ax1, ay1) = (x0s[:-1], y0s[:-1], x1s[:-1], y1s[:-1])
+    (bx0, by0, bx1, by1) = (x0s[1:], y0s[1:], x1s[1:], y1s[1:])
+    (awidth, aheight) = (ax1 - ax0, ay1 - ay0)
+    (bwidth, bheight) = (bx1 - bx0, by1 - by0)
+    hoverlapping = (bx0 <= ax1) & (ax0 <= bx1)
+    voverlapping = (by0 <= ay1) & (ay0 <= by1)
+    # The overlap where the boxes overlap, the distance where they do not.
+    hgap = minimum(numpy.abs(ax0 - bx1), numpy.abs(ax1 - bx0))
+    vgap = minimum(numpy.abs(ay0 - by1), numpy.abs(ay1 - by0))
+    halign = (
+        voverlapping
+        & (minimum(aheight, bheight) * laparams.line_overlap < vgap)
+        & (
+            numpy.where(hoverlapping, 0.0, hgap)
+            < maximum(awidth, bwidth) * laparams.char_margin
+        )
+    )
+    if not laparams.detect_vertical:
+        return (halign.tolist(), [False] * len(halign))
+    valign = (
+        hoverlapping
+        & (minimum(awidth, bwidth) * laparams.line_overlap < hgap)
+        & (
+            numpy.where(voverlapping, 0.0, vgap)
+            < maximum(aheight, bheight) * laparams.char_margin
+        )
+    )
+    return (halign.tolist(), valign.tolist())
+
+
+def cut_lines(
+    halign: Sequence[bool],
+    valign: Sequence[bool],
+) -> Iterator[Tuple[bool, int, int]]:
+    """Cuts a sequence of characters into text lines.
+
+    halign and valign are the alignments of get_alignments(). Yields
+    whether a line is vertical and the range of its characters, start to
+    stop, as group_objects() groups them.
+    """
+    # The line that is being built, from start, and whether it is
+    # vertical; None while there is none.
+    vertical: Optional[bool] = None
+    start = 0
+    for i, (h, v) in enumerate(zip(halign, valign), 1):
+        if (h and vertical is False) or (v and vertical is True):
+            continue
+        elif vertical is not None:
+            yield (vertical, start, i)
+            vertical = None
+        elif v and not h:
+            (vertical, start) = (True, i - 1)
+        elif h and not v:
+            (vertical, start) = (False, i - 1)
+        else:
+            yield (False, i - 1, i)
+    n = len(halign) + 1
+    if vertical is None:
+        yield (False, n - 1, n)
+    else:
+        yield (vertical, start, n)
+
+
+class GlyphBuffer:
+    """The characters of a container, in columns instead of LTChar objects.
+
+    Every character is a row of numbers, see NUMBER_COLUMNS, and a row of
+    codes, see CODE_COLUMNS, where font is an index into styles. texts and
+    matrices hold the text and the matrix of every character. column()
+    returns a column as an array, numpy.frombuffer() turns the rows into a
+    matrix without copying them. LTChar objects are only created by
+    get_char().
+    """
+
+    NUMBER_COLUMNS = ("x0", "y0", "x1", "y1", "adv", "size")
+    CODE_COLUMNS = ("font", "cid", "upright")
+
+    def __init__(self) -> None:
+        self.numbers = array("d")
+        self.codes = array("q")
+        self.texts: List[str] = []
+        self.matrices: List[Matrix] = []
+        self.styles: List[LTCharStyle] = []
+        self._style_ids: Dict[LTCharStyle, int] = {}
+        self._last_style: Tuple[Optional[LTCharStyle], int] = (None, 0)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {len(self)} chars>"
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def add(
+        self,
+        matrix: Matrix,
+        style: LTCharStyle,
+        text: str,
+        cid: int,
+        adv: float,
+        upright: bool,
+        bbox: Rect,
+        size: float,
+    ) -> None:
+        (last_style, font) = self._last_style
+        if style is not last_style:
+            font = self._style_ids.setdefault(style, len(self.styles))
+            if font == len(self.styles):
+                self.styles.append(style)
+            self._last_style = (style, font)
+        self.numbers.extend((*bbox, adv, size))
+        self.codes.extend((font, cid, upright))
+        self.texts.append(text)
+        self.matrices.append(matrix)
+
+    def column(
+        self,
+        name: str,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> "array[Any]":
+        """Returns a column, e.g. "x0" or "cid", of the characters start to stop."""
+        if stop is None:
+            stop = len(self)
+        rows: "array[Any]"
+        columns: Tuple[str, ...]
+        if name in self.CODE_COLUMNS:
+            (columns, rows) = (self.CODE_COLUMNS, self.codes)
+        else:
+            (columns, rows) = (self.NUMBER_COLUMNS, self.numbers)
+        n = len(columns)
+        return rows[start * n + columns.index(name) : stop * n : n]
+
+    def get_char(self, index: int) -> LTChar:
+        """Creates the LTChar of a character."""
+        (x0, y0, x1, y1, adv, size) = self.numbers[index * 6 : index * 6 + 6]
+        (font, _, upright) = self.codes[index * 3 : index * 3 + 3]
+        char = LTChar.__new__(LTChar)
+        char._text = self.texts[index]
+        char.matrix = self.matrices[index]
+        char.style = self.styles[font]
+        char.adv = adv
+        char.upright = bool(upright)
+        char.set_bbox((x0, y0, x1, y1))
+        char.size = size
+        return char
+
+    def group_lines(self, laparams: LAParams) -> Iterator["LTGlyphLine"]:
+        """Groups the characters to text lines like group_objects()."""
+        (halign, valign) = get_alignments(
+            laparams,
+            self.column("x0"),
+            self.column("y0"),
+            self.column("x1"),
+            self.column("y1"),
+        )
+        for vertical, start, stop in cut_lines(halign, valign):
+            yield self._get_line(laparams, vertical, start, stop)
+
+    def _get_line(
+        self,
+        laparams: LAParams,
+        vertical: bool,
+        start: int,
+        stop: int,
+    ) -> "LTGlyphLine":
+        if vertical:
+            return LTGlyphLineVertical(laparams.word_margin, self, start, stop)
+        return LTGlyphLineHorizontal(laparams.word_margin, self, start, stop)
+
+
+class LTGlyphRun(LTItem):
+    """Stands for the characters of a GlyphBuffer from start on, up to
+    the next run, among the other objects of a container.
+    """
+
+    __slots__ = ("glyphs", "start")
+
+    def __init__(self, glyphs: GlyphBuffer, start: int) -> None:
+        self.glyphs = glyphs
+        self.start = start
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.start}>"
+
+
 LTItemT = TypeVar("LTItemT", bound=LTItem)
 
 
@@ -626,6 +1132,125 @@ class LTTextLineVertical(LTTextLine):
         return abs(other.width - self.width) <= tolerance
 
 
+class LTGlyphLine(LTTextLine):
+    """A text line of the characters start to stop of a GlyphBuffer.
+
+    The LTChar and LTAnno objects of the line are created when it is first
+    iterated or changed, get_text() does not need them.
+    """
+
+    def __init__(
+        self,
+        word_margin: float,
+        glyphs: GlyphBuffer,
+        start: int,
+        stop: int,
+    ) -> None:
+        super().__init__(word_margin)
+        self.glyphs: Optional[GlyphBuffer] = glyphs
+        self.start = start
+        self.stop = stop
+        self._newline = False
+        self._text: Optional[str] = None
+        x0 = glyphs.column("x0", start, stop)
+        y0 = glyphs.column("y0", start, stop)
+        x1 = glyphs.column("x1", start, stop)
+        y1 = glyphs.column("y1", start, stop)
+        self.set_bbox((min(x0), min(y0), max(x1), max(y1)))
+        self._spaces = self._get_spaces(x0, y0, x1, y1)
+
+    def __iter__(self) -> Iterator[TextLineElement]:
+        self._materialize()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self._materialize()
+        return super().__len__()
+
+    def add(self, obj: LTComponent) -> None:  # type: ignore[override]
+        self._materialize()
+        super().add(obj)
+
+    def analyze(self, laparams: LAParams) -> None:
+        if self.glyphs is None:
+            super().analyze(laparams)
+        else:
+            self._newline = True
+            self._text = None
+
+    def get_text(self) -> str:
+        if self.glyphs is None:
+            return super().get_text()
+        if self._text is None:
+            texts = self.glyphs.texts
+            parts = []
+            i = self.start
+            for space in self._spaces:
+                parts.extend(texts[i:space])
+                parts.append(" ")
+                i = space
+            parts.extend(texts[i : self.stop])
+            if self._newline:
+                parts.append("\n")
+            self._text = "".join(parts)
+        return self._text
+
+    def _get_spaces(
+        self,
+        x0: Sequence[float],
+        y0: Sequence[float],
+        x1: Sequence[float],
+        y1: Sequence[float],
+    ) -> List[int]:
+        """Returns the characters that add() puts a space before."""
+        raise NotImplementedError
+
+    def _materialize(self) -> None:
+        glyphs = self.glyphs
+        if glyphs is None:
+            return
+        self.glyphs = None
+        self._text = None
+        for i in range(self.start, self.stop):
+            self.add(glyphs.get_char(i))
+        if self._newline:
+            LTContainer.add(self, LTAnno("\n"))
+
+
+class LTGlyphLineHorizontal(LTGlyphLine, LTTextLineHorizontal):
+    def _get_spaces(
+        self,
+        x0: Sequence[float],
+        y0: Sequence[float],
+        x1: Sequence[float],
+        y1: Sequence[float],
+    ) -> List[int]:
+        if not self.word_margin:
+            return []
+        return [
+            self.start + i
+            for i in range(1, len(x0))
+            if x1[i - 1] < x0[i] - self.word_margin * max(x1[i] - x0[i], y1[i] - y0[i])
+        ]
+
+
+class LTGlyphLineVertical(LTGlyphLine, LTTextLineVertical):
+    def _get_spaces(
+        self,
+        x0: Sequence[float],
+        y0: Sequence[float],
+        x1: Sequence[float],
+        y1: Sequence[float],
+    ) -> List[int]:
+        if not self.word_margin:
+            return []
+        return [
+            self.start + i
+            for i in range(1, len(x0))
+            if y1[i] + self.word_margin * max(x1[i] - x0[i], y1[i] - y0[i]) < y0[i - 1]
+        ]
+
+
 class LTTextBox(LTTextContainer[LTTextLine]):
     """Represents a group of text chunks in a rectangular area.
 
@@ -696,10 +1321,84 @@ class LTTextGroupTBRL(LTTextGroup):
         )
 
 
+def _textbox_distance(obj1: LTComponent, obj2: LTComponent) -> float:
+    """A distance function between two TextBoxes.
+
+    Consider the bounding rectangle for obj1 and obj2.
+    Return its area less the areas of obj1 and obj2,
+    shown as 'www' below. This value may be negative.
+            +------+..........+ (x1, y1)
+            | obj1 |wwwwwwwwww:
+            +------+www+------+
+            :wwwwwwwwww| obj2 |
+    (x0, y0) +..........+------+
+    """
+    x0 = min(obj1.x0, obj2.x0)
+    y0 = min(obj1.y0, obj2.y0)
+    x1 = max(obj1.x1, obj2.x1)
+    y1 = max(obj1.y1, obj2.y1)
+    return (x1 - x0) * (y1 - y0) - obj1.width * obj1.height - obj2.width * obj2.height
+
+
+def _merge_textboxes(
+    obj1: Union[LTTextBox, LTTextGroup],
+    obj2: Union[LTTextBox, LTTextGroup],
+) -> LTTextGroup:
+    if isinstance(obj1, (LTTextBoxVertical, LTTextGroupTBRL)) or isinstance(
+        obj2,
+        (LTTextBoxVertical, LTTextGroupTBRL),
+    ):
+        return LTTextGroupTBRL([obj1, obj2])
+    return LTTextGroupLRTB([obj1, obj2])
+
+
 class LTLayoutContainer(LTContainer[LTComponent]):
+    # group_textboxes() stops enumerating all pairs of boxes above this.
+    GROUP_TEXTBOXES_THRESHOLD = 100
+
     def __init__(self, bbox: Rect) -> None:
         LTContainer.__init__(self, bbox)
         self.groups: Optional[List[LTTextGroup]] = None
+        self.glyphs: Optional[GlyphBuffer] = None
+
+    def add_glyph(
+        self,
+        matrix: Matrix,
+        style: LTCharStyle,
+        text: str,
+        cid: int,
+        adv: float,
+        upright: bool,
+        bbox: Rect,
+        size: float,
+    ) -> None:
+        """Adds a character to the glyph buffer instead of an LTChar.
+
+        analyze() groups the characters of the buffer to text lines, without
+        analysis materialize_glyphs() turns them into LTChar objects.
+        """
+        glyphs = self.glyphs
+        if glyphs is None:
+            glyphs = self.glyphs = GlyphBuffer()
+        if not self._objs or not isinstance(self._objs[-1], LTGlyphRun):
+            self._objs.append(cast(LTComponent, LTGlyphRun(glyphs, len(glyphs))))
+        glyphs.add(matrix, style, text, cid, adv, upright, bbox, size)
+
+    def materialize_glyphs(self) -> None:
+        """Replaces the characters of the glyph buffer with LTChar objects."""
+        glyphs = self.glyphs
+        if glyphs is None:
+            return
+        self.glyphs = None
+        runs = [obj for obj in self._objs if isinstance(obj, LTGlyphRun)]
+        stops = iter([run.start for run in runs[1:]] + [len(glyphs)])
+        objs: List[LTComponent] = []
+        for obj in self._objs:
+            if isinstance(obj, LTGlyphRun):
+                objs.extend(map(glyphs.get_char, range(obj.start, next(stops))))
+            else:
+                objs.append(obj)
+        self._objs = objs
 
     # group_objects: group text object to textlines.
     def group_objects(
@@ -707,77 +1406,24 @@ class LTLayoutContainer(LTContainer[LTComponent]):
         laparams: LAParams,
         objs: Iterable[LTComponent],
     ) -> Iterator[LTTextLine]:
-        obj0 = None
-        line = None
-        for obj1 in objs:
-            if obj0 is not None:
-                # halign: obj0 and obj1 is horizontally aligned.
-                #
-                #   +------+ - - -
-                #   | obj0 | - - +------+   -
-                #   |      |     | obj1 |   | (line_overlap)
-                #   +------+ - - |      |   -
-                #          - - - +------+
-                #
-                #          |<--->|
-                #        (char_margin)
-                halign = (
-                    obj0.is_voverlap(obj1)
-                    and min(obj0.height, obj1.height) * laparams.line_overlap
-                    < obj0.voverlap(obj1)
-                    and obj0.hdistance(obj1)
-                    < max(obj0.width, obj1.width) * laparams.char_margin
-                )
-
-                # valign: obj0 and obj1 is vertically aligned.
-                #
-                #   +------+
-                #   | obj0 |
-                #   |      |
-                #   +------+ - - -
-                #     |    |     | (char_margin)
-                #     +------+ - -
-                #     | obj1 |
-                #     |      |
-                #     +------+
-                #
-                #     |<-->|
-                #   (line_overlap)
-                valign = (
-                    laparams.detect_vertical
-                    and obj0.is_hoverlap(obj1)
-                    and min(obj0.width, obj1.width) * laparams.line_overlap
-                    < obj0.hoverlap(obj1)
-                    and obj0.vdistance(obj1)
-                    < max(obj0.height, obj1.height) * laparams.char_margin
-                )
-
-                if (halign and isinstance(line, LTTextLineHorizontal)) or (
-                    valign and isinstance(line, LTTextLineVertical)
-                ):
-                    line.add(obj1)
-                elif line is not None:
-                    yield line
-                    line = None
-                elif valign and not halign:
-                    line = LTTextLineVertical(laparams.word_margin)
-                    line.add(obj0)
-                    line.add(obj1)
-                elif halign and not valign:
-                    line = LTTextLineHorizontal(laparams.word_margin)
-                    line.add(obj0)
-                    line.add(obj1)
-                else:
-                    line = LTTextLineHorizontal(laparams.word_margin)
-                    line.add(obj0)
-                    yield line
-                    line = None
-            obj0 = obj1
-        if line is None:
-            line = LTTextLineHorizontal(laparams.word_margin)
-            assert obj0 is not None
-            line.add(obj0)
-        yield line
+        objs = list(objs)
+        assert objs
+        (halign, valign) = get_alignments(
+            laparams,
+            [obj.x0 for obj in objs],
+            [obj.y0 for obj in objs],
+            [obj.x1 for obj in objs],
+            [obj.y1 for obj in objs],
+        )
+        line: LTTextLine
+        for vertical, start, stop in cut_lines(halign, valign):
+            if vertical:
+                line = LTTextLineVertical(laparams.word_margin)
+            else:
+                line = LTTextLineHorizontal(laparams.word_margin)
+            for obj in objs[start:stop]:
+                line.add(obj)
+            yield line
 
     def group_textlines(
         self,
@@ -785,7 +1431,7 @@ class LTLayoutContainer(LTContainer[LTComponent]):
         lines: Iterable[LTTextLine],
     ) -> Iterator[LTTextBox]:
         """Group neighboring lines to textboxes"""
-        plane: Plane[LTTextLine] = Plane(self.bbox)
+        plane: Plane[LTTextLine] = Plane(self.bbox, index=laparams.spatial_index)
         plane.extend(lines)
         boxes: Dict[LTTextLine, LTTextBox] = {}
         for line in lines:
@@ -820,45 +1466,32 @@ class LTLayoutContainer(LTContainer[LTComponent]):
     ) -> List[LTTextGroup]:
         """Group textboxes hierarchically.
 
-        Get pair-wise distances, via dist func defined below, and then merge
+        Get pair-wise distances, via _textbox_distance(), and then merge
         from the closest textbox pair. Once obj1 and obj2 are merged /
         grouped, the resulting group is considered as a new object, and its
         distances to other objects & groups are added to the process queue.
 
         For performance reason, pair-wise distances and object pair info are
-        maintained in a heap of (idx, dist, id(obj1), id(obj2), obj1, obj2)
-        tuples. It ensures quick access to the smallest element. Note that
+        maintained in a heap of (skip_isany, dist, seq1, seq2, obj1, obj2)
+        tuples. It ensures quick access to the smallest element. The
+        sequence numbers count the boxes and then the groups in the order
+        they are created; they break ties between equal distances, and
         since comparison operators, e.g., __lt__, are disabled for
-        LTComponent, id(obj) has to appear before obj in element tuples.
+        LTComponent, they have to appear before obj in element tuples.
+
+        Above GROUP_TEXTBOXES_THRESHOLD boxes, the quadratic heap of all
+        pairs is replaced by _group_textboxes_nearest(), which merges the
+        pairs in the very same order.
 
         :param laparams: LAParams object.
         :param boxes: All textbox objects to be grouped.
         :return: a list that has only one element, the final top level group.
         """
+        if len(boxes) > self.GROUP_TEXTBOXES_THRESHOLD:
+            return self._group_textboxes_nearest(boxes)
+
         ElementT = Union[LTTextBox, LTTextGroup]
-        plane: Plane[ElementT] = Plane(self.bbox)
-
-        def dist(obj1: LTComponent, obj2: LTComponent) -> float:
-            """A distance function between two TextBoxes.
-
-            Consider the bounding rectangle for obj1 and obj2.
-            Return its area less the areas of obj1 and obj2,
-            shown as 'www' below. This value may be negative.
-                    +------+..........+ (x1, y1)
-                    | obj1 |wwwwwwwwww:
-                    +------+www+------+
-                    :wwwwwwwwww| obj2 |
-            (x0, y0) +..........+------+
-            """
-            x0 = min(obj1.x0, obj2.x0)
-            y0 = min(obj1.y0, obj2.y0)
-            x1 = max(obj1.x1, obj2.x1)
-            y1 = max(obj1.y1, obj2.y1)
-            return (
-                (x1 - x0) * (y1 - y0)
-                - obj1.width * obj1.height
-                - obj2.width * obj2.height
-            )
+        plane: Plane[ElementT] = Plane(self.bbox, index=laparams.spatial_index)
 
         def isany(obj1: ElementT, obj2: ElementT) -> Set[ElementT]:
             """Check if there's any other object between obj1 and obj2."""
@@ -874,51 +1507,234 @@ class LTLayoutContainer(LTContainer[LTComponent]):
             box1 = boxes[i]
             for j in range(i + 1, len(boxes)):
                 box2 = boxes[j]
-                dists.append((False, dist(box1, box2), id(box1), id(box2), box1, box2))
+                dists.append((False, _textbox_distance(box1, box2), i, j, box1, box2))
         heapq.heapify(dists)
 
         plane.extend(boxes)
+        seqs: Dict[ElementT, int] = {box: i for (i, box) in enumerate(boxes)}
         done = set()
         while len(dists) > 0:
-            (skip_isany, d, id1, id2, obj1, obj2) = heapq.heappop(dists)
+            (skip_isany, d, seq1, seq2, obj1, obj2) = heapq.heappop(dists)
             # Skip objects that are already merged
-            if (id1 not in done) and (id2 not in done):
+            if (seq1 not in done) and (seq2 not in done):
                 if not skip_isany and isany(obj1, obj2):
-                    heapq.heappush(dists, (True, d, id1, id2, obj1, obj2))
+                    heapq.heappush(dists, (True, d, seq1, seq2, obj1, obj2))
                     continue
-                if isinstance(obj1, (LTTextBoxVertical, LTTextGroupTBRL)) or isinstance(
-                    obj2,
-                    (LTTextBoxVertical, LTTextGroupTBRL),
-                ):
-                    group: LTTextGroup = LTTextGroupTBRL([obj1, obj2])
-                else:
-                    group = LTTextGroupLRTB([obj1, obj2])
+                group = _merge_textboxes(obj1, obj2)
                 plane.remove(obj1)
                 plane.remove(obj2)
-                done.update([id1, id2])
+                done.update([seq1, seq2])
+                seq = len(seqs)
+                seqs[group] = seq
 
                 for other in plane:
                     heapq.heappush(
                         dists,
-                        (False, dist(group, other), id(group), id(other), group, other),
+                        (
+                            False,
+                            _textbox_distance(group, other),
+                            seq,
+                            seqs[other],
+                            group,
+                            other,
+                        ),
                     )
                 plane.add(group)
         # By now only groups are in the plane
         return list(cast(LTTextGroup, g) for g in plane)
 
+    def _group_textboxes_nearest(
+        self,
+        boxes: Sequence[LTTextBox],
+    ) -> List[LTTextGroup]:
+        """Group textboxes hierarchically without enumerating all pairs.
+
+        Produces the same groups as group_textboxes(). Instead of a heap of
+        all pairs, every object only puts its closest partner in the heap.
+        The partners are searched in a window around the object: a box that
+        is at least r away on either axis is at least r * min(width, height)
+        away according to _textbox_distance(). Until a candidate beats that
+        bound, the heap holds the bound itself, and the window is doubled
+        when it comes out of the heap. Entries whose partner was merged or
+        turned out to be blocked are replaced lazily by the next candidate.
+        """
+        ElementT = Union[LTTextBox, LTTextGroup]
+        index: RTreeIndex[ElementT] = RTreeIndex(self.bbox)
+        index.extend(boxes)
+        nboxes = len(boxes)
+        seqs: Dict[ElementT, int] = {box: i for (i, box) in enumerate(boxes)}
+        objs: Dict[int, ElementT] = dict(enumerate(boxes))
+        # objects outside of the page are not indexed, they are always
+        # candidates.
+        outside: Set[ElementT] = {box for box in boxes if self._is_outside(box)}
+        # pairs that were found to have other objects between them.
+        blocked: Dict[ElementT, Set[ElementT]] = {}
+        # per object: candidate partners (dist, seq1, seq2, partner), the
+        # bound that all other partners exceed, and the window size. The
+        # bound is None once the window has covered every object.
+        candidates: Dict[
+            int,
+            Tuple[List[Tuple[float, int, int, int]], Optional[float], float],
+        ] = {}
+        # the heap entry that is currently valid for each object.
+        current: Dict[int, int] = {}
+
+        def key(obj1: ElementT, obj2: ElementT) -> Tuple[float, int, int]:
+            """The heap key group_textboxes() would use for this pair."""
+            seq1 = seqs[obj1]
+            seq2 = seqs[obj2]
+            # a new group comes first, boxes come in their original order.
+            # The order matters, even for the rounding of the distance.
+            if (seq1 < seq2) == (nboxes <= seq1 or nboxes <= seq2):
+                (obj1, obj2, seq1, seq2) = (obj2, obj1, seq2, seq1)
+            return (_textbox_distance(obj1, obj2), seq1, seq2)
+
+        def search(obj: ElementT, r: float) -> None:
+            """Collect the candidate partners of obj within r."""
+            window = (obj.x0 - r, obj.y0 - r, obj.x1 + r, obj.y1 + r)
+            bound: Optional[float] = None
+            if obj in outside:
+                others: Iterable[ElementT] = objs.values()
+            elif (
+                self.x0 < window[0]
+                or self.y0 < window[1]
+                or window[2] < self.x1
+                or window[3] < self.y1
+            ):
+                others = chain(index.search(window), outside)
+                bound = r * min(obj.width, obj.height)
+                # stay clear of the rounding errors of the distances.
+                bound -= 1e-9 * (1.0 + abs(bound))
+            else:
+                others = chain(index.search(window), outside)
+            found = []
+            for other in others:
+                if other is not obj:
+                    (d, seq1, seq2) = key(obj, other)
+                    found.append((d, seq1, seq2, seqs[other]))
+            heapq.heapify(found)
+            candidates[seqs[obj]] = (found, bound, r)
+
+        heap: List[Tuple[float, int, int, int, int]] = []
+
+        def push(obj: ElementT) -> None:
+            """Put the closest valid partner of obj, or a bound, in the heap."""
+            seq = seqs[obj]
+            (found, bound, r) = candidates[seq]
+            skip = blocked.get(obj, ())
+            while found and (found[0][3] not in objs or objs[found[0][3]] in skip):
+                heapq.heappop(found)
+            if found and (bound is None or found[0][0] < bound):
+                (d, seq1, seq2, partner) = found[0]
+                current[seq] = partner
+                heapq.heappush(heap, (d, seq1, seq2, seq, partner))
+            elif bound is not None:
+                current[seq] = -1
+                heapq.heappush(heap, (bound, -1, -1, seq, -1))
+            else:
+                current.pop(seq, None)
+
+        def isany(obj1: ElementT, obj2: ElementT) -> bool:
+            """Check if there's any other object between obj1 and obj2."""
+            x0 = min(obj1.x0, obj2.x0)
+            y0 = min(obj1.y0, obj2.y0)
+            x1 = max(obj1.x1, obj2.x1)
+            y1 = max(obj1.y1, obj2.y1)
+            for other in index.search((x0, y0, x1, y1)):
+                if other is not obj1 and other is not obj2:
+                    return True
+            return False
+
+        def merge(obj1: ElementT, obj2: ElementT) -> None:
+            group = _merge_textboxes(obj1, obj2)
+            for obj in (obj1, obj2):
+                seq = seqs[obj]
+                del objs[seq]
+                del candidates[seq]
+                current.pop(seq, None)
+                outside.discard(obj)
+                index.remove(obj)
+            seq = len(seqs)
+            seqs[group] = seq
+            objs[seq] = group
+            if self._is_outside(group):
+                outside.add(group)
+            index.add(group)
+            search(group, max(group.width, group.height, 1.0))
+            push(group)
+
+        for box in boxes:
+            search(box, max(box.width, box.height, 1.0))
+            push(box)
+        deferred: List[Tuple[float, int, int]] = []
+        while True:
+            if heap:
+                (d, seq1, seq2, seq, partner) = heapq.heappop(heap)
+                if current.get(seq) != partner:
+                    # superseded by another entry of the same object.
+                    continue
+                if partner == -1:
+                    # the bound was reached, look further.
+                    search(objs[seq], 2 * candidates[seq][2])
+                    push(objs[seq])
+                    continue
+                obj1 = objs.get(seq1)
+                obj2 = objs.get(seq2)
+                if obj1 is None or obj2 is None or obj2 in blocked.get(obj1, ()):
+                    push(objs[seq])
+                    continue
+                if isany(obj1, obj2):
+                    blocked.setdefault(obj1, set()).add(obj2)
+                    blocked.setdefault(obj2, set()).add(obj1)
+                    heapq.heappush(deferred, (d, seq1, seq2))
+                    push(objs[seq])
+                    continue
+                merge(obj1, obj2)
+            elif deferred:
+                # No unblocked pair is left, merge the closest blocked one.
+                (d, seq1, seq2) = heapq.heappop(deferred)
+                if seq1 in objs and seq2 in objs:
+                    merge(objs[seq1], objs[seq2])
+            else:
+                break
+        return list(cast(LTTextGroup, g) for g in objs.values())
+
+    def _is_outside(self, obj: LTComponent) -> bool:
+        return (
+            obj.x1 <= self.x0
+            or self.x1 <= obj.x0
+            or obj.y1 <= self.y0
+            or self.y1 <= obj.y0
+        )
+
     def analyze(self, laparams: LAParams) -> None:
         # textobjs is a list of LTChar objects, i.e.
         # it has all the individual characters in the page.
         (textobjs, otherobjs) = fsplit(lambda obj: isinstance(obj, LTChar), self)
+        glyphs = self.glyphs
+        if glyphs is not None and textobjs:
+            # LTChar objects were added too, keep their order.
+            self.materialize_glyphs()
+            LTLayoutContainer.analyze(self, laparams)
+            return
+        if glyphs is not None:
+            otherobjs = [obj for obj in otherobjs if not isinstance(obj, LTGlyphRun)]
+            self.glyphs = None
         for obj in otherobjs:
             obj.analyze(laparams)
-        if not textobjs:
+        if glyphs is not None:
+            with profiling.stage("layout.group_objects"):
+                textlines: List[LTTextLine] = list(glyphs.group_lines(laparams))
+        elif not textobjs:
             return
-        textlines = list(self.group_objects(laparams, textobjs))
+        else:
+            with profiling.stage("layout.group_objects"):
+                textlines = list(self.group_objects(laparams, textobjs))
         (empties, textlines) = fsplit(lambda obj: obj.is_empty(), textlines)
         for obj in empties:
             obj.analyze(laparams)
-        textboxes = list(self.group_textlines(laparams, textlines))
+        with profiling.stage("layout.group_textlines"):
+            textboxes = list(self.group_textlines(laparams, textlines))
         if laparams.boxes_flow is None:
             for textbox in textboxes:
                 textbox.analyze(laparams)
@@ -931,7 +1747,8 @@ class LTLayoutContainer(LTContainer[LTComponent]):
 
             textboxes.sort(key=getkey)
         else:
-            self.groups = self.group_textboxes(laparams, textboxes)
+            with profiling.stage("layout.group_textboxes"):
+                self.groups = self.group_textboxes(laparams, textboxes)
             assigner = IndexAssigner()
             for group in self.groups:
                 group.analyze(laparams)
@@ -965,6 +1782,7 @@ class LTFigure(LTLayoutContainer):
 
     def analyze(self, laparams: LAParams) -> None:
         if not laparams.all_texts:
+            self.materialize_glyphs()
             return
         LTLayoutContainer.analyze(self, laparams)
 
@@ -1,105 +1,125 @@
 import logging
-from io import BytesIO
-from typing import BinaryIO, Iterator, List, Optional, cast
+from typing import BinaryIO, Iterator, List, Optional
 
-from pdfminer.pdfexceptions import PDFEOFError, PDFException
+from pdfminer.pdfexceptions import PDFException
 
 logger = logging.getLogger(__name__)
 
+# The number of bytes LZWDecoder.run() reads at a time.
+LZW_CHUNK_SIZE = 64 * 1024
+
+CLEAR_TABLE = 256
+END_OF_DATA = 257
+MAX_CODE_BITS = 12
+TABLE_SIZE = 1 << MAX_CODE_BITS
+
 
 class CorruptDataError(PDFException):
     pass
 
 
 class LZWDecoder:
-    def __init__(self, fp: BinaryIO) -> None:
+    """Incremental LZW decoder, as of the LZWDecode filter.
+
+    The codes are taken from the data with a bit position instead of bit by
+    bit, the strings go to a table of TABLE_SIZE entries made at the start
+    and the output is collected in a bytearray. decode() can be called with
+    successive chunks of the data: the bits of an incomplete code are kept
+    for the next call. Decoding stops at the end of data code, and on a
+    code that is not in the table, keeping the output so far.
+
+    With early_change=1, the default of the filter, the codes get one bit
+    longer one code early.
+    """
+
+    def __init__(self, fp: Optional[BinaryIO] = None, early_change: int = 1) -> None:
         self.fp = fp
-        self.buff = 0
-        self.bpos = 8
+        self.early_change = early_change
+        self.table: List[bytes] = [bytes((c,)) for c in range(256)]
+        self.table += [b""] * (TABLE_SIZE - 256)
+        self.next_code = END_OF_DATA + 1
         self.nbits = 9
-        # NB: self.table stores None only in indices 256 and 257
-        self.table: List[Optional[bytes]] = []
         self.prevbuf: Optional[bytes] = None
+        # the bytes of the codes not yet decoded, from the bit at bitpos.
+        self.pending = b""
+        self.bitpos = 0
+        self.done = False
 
-    def readbits(self, bits: int) -> int:
-        v = 0
-        while 1:
-            # the number of remaining bits we can get from the current buffer.
-            r = 8 - self.bpos
-            if bits <= r:
-                # |-----8-bits-----|
-                # |-bpos-|-bits-|  |
-                # |      |----r----|
-                v = (v << bits) | ((self.buff >> (r - bits)) & ((1 << bits) - 1))
-                self.bpos += bits
+    def decode(self, data: bytes, final: bool = False) -> bytes:
+        if self.done:
+            return b""
+        buf = self.pending + data
+        # two bytes of padding to read the last code as three bytes.
+        padded = buf + b"\0\0"
+        end = len(buf) * 8
+        table = self.table
+        early_change = self.early_change
+        next_code = self.next_code
+        nbits = self.nbits
+        mask = (1 << nbits) - 1
+        prevbuf = self.prevbuf
+        pos = self.bitpos
+        out = bytearray()
+        while pos + nbits <= end:
+            i = pos >> 3
+            code = (
+                ((padded[i] << 16) | (padded[i + 1] << 8) | padded[i + 2])
+                >> (24 - (pos & 7) - nbits)
+            ) & mask
+            pos += nbits
+            if code == CLEAR_TABLE:
+                next_code = END_OF_DATA + 1
+                nbits = 9
+                mask = (1 << nbits) - 1
+                prevbuf = None
+                continue
+            elif code == END_OF_DATA:
+                self.done = True
                 break
+            elif prevbuf is None:
+                if next_code <= code:
+                    logger.debug("LZW code %d is not in the table", code)
+                    self.done = True
+                    break
+                x = table[code]
+            elif code < next_code:
+                x = table[code]
+                if next_code < TABLE_SIZE:
+                    table[next_code] = prevbuf + x[:1]
+                    next_code += 1
+            elif code == next_code and next_code < TABLE_SIZE:
+                x = prevbuf + prevbuf[:1]
+                table[next_code] = x
+                next_code += 1
             else:
-                # |-----8-bits-----|
-                # |-bpos-|---bits----...
-                # |      |----r----|
-                v = (v << r) | (self.buff & ((1 << r) - 1))
-                bits -= r
-                x = self.fp.read(1)
-                if not x:
-                    raise PDFEOFError
-                self.buff = ord(x)
-                self.bpos = 0
-        return v
-
-    def feed(self, code: int) -> bytes:
-        x = b""
-        if code == 256:
-            self.table = [bytes((c,)) for c in range(256)]  # 0-255
-            self.table.append(None)  # 256
-            self.table.append(None)  # 257
-            self.prevbuf = b""
-            self.nbits = 9
-        elif code == 257:
-            pass
-        elif not self.prevbuf:
-            x = self.prevbuf = cast(bytes, self.table[code])  # assume not None
+                logger.debug("LZW code %d is not in the table", code)
+                self.done = True
+                break
+            if nbits < MAX_CODE_BITS and (1 << nbits) <= next_code + early_change:
+                nbits += 1
+                mask = (1 << nbits) - 1
+            out += x
+            prevbuf = x
+        self.next_code = next_code
+        self.nbits = nbits
+        self.prevbuf = prevbuf
+        if self.done or final:
+            self.done = True
+            self.pending = b""
         else:
-            if code < len(self.table):
-                x = cast(bytes, self.table[code])  # assume not None
-                self.table.append(self.prevbuf + x[:1])
-            elif code == len(self.table):
-                self.table.append(self.prevbuf + self.prevbuf[:1])
-                x = cast(bytes, self.table[code])
-            else:
-                raise CorruptDataError
-            table_length = len(self.table)
-            if table_length == 511:
-                self.nbits = 10
-            elif table_length == 1023:
-                self.nbits = 11
-            elif table_length == 2047:
-                self.nbits = 12
-            self.prevbuf = x
-        return x
+            self.pending = buf[pos >> 3 :]
+            self.bitpos = pos & 7
+        return bytes(out)
 
     def run(self) -> Iterator[bytes]:
-        while 1:
-            try:
-                code = self.readbits(self.nbits)
-            except EOFError:
-                break
-            try:
-                x = self.feed(code)
-            except CorruptDataError:
-                # just ignore corrupt data and stop yielding there
-                break
-            yield x
-
-            logger.debug(
-                "nbits=%d, code=%d, output=%r, table=%r",
-                self.nbits,
-                code,
-                x,
-                self.table[258:],
-            )
+        """Yields the output decoded from the chunks read from fp."""
+        assert self.fp is not None
+        while not self.done:
+            data = self.fp.read(LZW_CHUNK_SIZE)
+            output = self.decode(data, final=not data)
+            if output:
+                yield output
 
 
-def lzwdecode(data: bytes) -> bytes:
-    fp = BytesIO(data)
-    s = LZWDecoder(fp).run()
-    return b"".join(s)
+def lzwdecode(data: bytes, early_change: int = 1) -> bytes:
+    return LZWDecoder(early_change=early_change).decode(data, final=True)
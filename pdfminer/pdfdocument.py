@@ -1,12 +1,19 @@
 import itertools
 import logging
+import os
+import pickle
 import re
 import struct
+import sys
+import tempfile
 from hashlib import md5, sha256, sha384, sha512
 from typing import (
+    TYPE_CHECKING,
     Any,
+    BinaryIO,
     Callable,
     Dict,
+    Hashable,
     Iterable,
     Iterator,
     KeysView,
@@ -17,6 +24,7 @@ from typing import (
     Type,
     Union,
     cast,
+    overload,
 )
 
 from cryptography.hazmat.backends import default_backend
@@ -34,6 +42,7 @@ from pdfminer.pdfexceptions import (
 from pdfminer.pdfparser import PDFParser, PDFStreamParser, PDFSyntaxError
 from pdfminer.pdftypes import (
     DecipherCallable,
+    PDFObjRef,
     PDFStream,
     decipher_all,
     dict_value,
@@ -53,6 +62,9 @@ from pdfminer.utils import (
     nunpack,
 )
 
+if TYPE_CHECKING:
+    from pdfminer.pdfpage import PDFPage, PDFPageTree
+
 log = logging.getLogger(__name__)
 
 
@@ -326,6 +338,106 @@ class PDFXRefStream(PDFBaseXRef):
             raise PDFKeyError(objid)
 
 
+class PDFXRefCache:
+    """Keeps the cross-reference tables of documents in a directory.
+
+    Opening a document again skips finding and reading its xref tables,
+    including the scan of the whole file that damaged documents need.
+    The tables are stored per file content hash, size and modification
+    time, as resolved offsets and trailers. The entries are pickles, so
+    the directory has to be trusted.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def get_key(self, fp: BinaryIO) -> str:
+        """Returns the key of the file, reading all of it."""
+        pos = fp.tell()
+        fp.seek(0)
+        digest = sha256()
+        size = 0
+        while True:
+            data = fp.read(1024 * 1024)
+            if not data:
+                break
+            digest.update(data)
+            size += len(data)
+        fp.seek(pos)
+        try:
+            mtime = os.fstat(fp.fileno()).st_mtime_ns
+        except (AttributeError, OSError, ValueError):
+            # in-memory files have no modification time.
+            mtime = 0
+        return "%s-%d-%d" % (digest.hexdigest(), size, mtime)
+
+    def load(
+        self,
+        key: str,
+        doc: "PDFDocument",
+    ) -> Optional[Tuple[List[PDFBaseXRef], bool]]:
+        """Returns the xrefs and the fallback flag that were saved for key."""
+        try:
+            with open(self._get_path(key), "rb") as fp:
+                (fallback, tables) = pickle.load(fp)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning("Ignoring unreadable xref cache entry %r: %r", key, e)
+            return None
+        xrefs: List[PDFBaseXRef] = []
+        for is_fallback, offsets, trailer in tables:
+            xref = PDFXRefFallback() if is_fallback else PDFXRef()
+            xref.offsets = offsets
+            xref.trailer = self._attach(trailer, doc)
+            xrefs.append(xref)
+        return (xrefs, fallback)
+
+    def save(self, key: str, xrefs: List[PDFBaseXRef], fallback: bool) -> None:
+        """Saves the xrefs of a document, resolving all offsets."""
+        tables = []
+        for xref in xrefs:
+            offsets = {objid: xref.get_pos(objid) for objid in xref.get_objids()}
+            tables.append(
+                (isinstance(xref, PDFXRefFallback), offsets, xref.get_trailer()),
+            )
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            (fd, tmppath) = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError as e:
+            log.warning("Not saving xref cache entry %r: %r", key, e)
+            return
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                pickle.dump((fallback, tables), fp, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmppath, self._get_path(key))
+        except BaseException as e:
+            try:
+                os.unlink(tmppath)
+            except OSError:
+                pass
+            if not isinstance(e, (OSError, pickle.PicklingError)):
+                raise
+            # the cache only saves time, the document can still be read.
+            log.warning("Not saving xref cache entry %r: %r", key, e)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".xref")
+
+    @classmethod
+    def _attach(cls, obj: Any, doc: "PDFDocument") -> Any:
+        """Gives the unpickled object references their document back."""
+        if isinstance(obj, PDFObjRef):
+            obj.doc = doc
+        elif isinstance(obj, dict):
+            for value in obj.values():
+                cls._attach(value, doc)
+        elif isinstance(obj, list):
+            for value in obj:
+                cls._attach(value, doc)
+        return obj
+
+
 class PDFStandardSecurityHandler:
     PASSWORD_PADDING = (
         b"(\xbfN^Nu\x8aAd\x00NV\xff\xfa\x01\x08"
@@ -661,6 +773,106 @@ class PDFStandardSecurityHandlerV5(PDFStandardSecurityHandlerV4):
         return cipher.decryptor().update(ciphertext)  # type: ignore
 
 
+class PDFObjectCache:
+    """A cache of resolved objects and parsed object streams.
+
+    The least recently used entries are evicted once there are more than
+    max_entries of them, or once their estimated size exceeds max_bytes.
+    Without limits, nothing is ever evicted. The hits, misses and
+    evictions are counted.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # ordered from the least to the most recently used.
+        self._entries: Dict[Hashable, Tuple[Any, int]] = {}
+
+    def __repr__(self) -> str:
+        return "<PDFObjectCache: entries=%d, bytes=%d, hits=%d, misses=%d>" % (
+            len(self._entries),
+            self.nbytes,
+            self.hits,
+            self.misses,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the value for key, or None."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries[key] = entry
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, owned: Any = None) -> None:
+        """Stores value under key.
+
+        Only owned, the whole value by default, counts towards max_bytes,
+        and its size is only estimated once, when there is such a limit.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+        size = 0
+        if self.max_bytes is not None:
+            size = self.estimate_size(value if owned is None else owned)
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        self._evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and self.max_entries < len(self._entries))
+            or (self.max_bytes is not None and self.max_bytes < self.nbytes)
+        ):
+            key = next(iter(self._entries))
+            (_, size) = self._entries.pop(key)
+            self.nbytes -= size
+            self.evictions += 1
+
+    @classmethod
+    def estimate_size(cls, obj: object) -> int:
+        """Estimates the memory used by an object, in bytes.
+
+        Both the raw and the decoded data of streams are counted, the
+        objects behind references are not.
+        """
+        size = sys.getsizeof(obj)
+        if isinstance(obj, PDFStream):
+            size += cls.estimate_size(obj.attrs)
+            if obj.rawdata is not None:
+                size += len(obj.rawdata)
+            if obj.data is not None:
+                size += len(obj.data)
+        elif isinstance(obj, dict):
+            for k, v in obj.items():
+                size += cls.estimate_size(k) + cls.estimate_size(v)
+        elif isinstance(obj, (list, tuple)):
+            for v in obj:
+                size += cls.estimate_size(v)
+        return size
+
+
 class PDFDocument:
     """PDFDocument object represents a PDF document.
 
@@ -687,31 +899,54 @@ class PDFDocument:
         password: str = "",
         caching: bool = True,
         fallback: bool = True,
+        xref_cache: Optional[PDFXRefCache] = None,
+        cache: Optional[PDFObjectCache] = None,
     ) -> None:
-        """Set the document to use a given PDFParser object."""
-        self.caching = caching
+        """Set the document to use a given PDFParser object.
+
+        If an xref_cache is given, the xref tables are taken from it, or
+        stored in it for the next time.
+
+        Resolved objects are kept in cache, an unbounded cache unless
+        caching is False. Pass a PDFObjectCache with limits to bound the
+        memory that is used for them.
+        """
+        if cache is None and caching:
+            cache = PDFObjectCache()
+        self.cache = cache
+        self.caching = cache is not None
         self.xrefs: List[PDFBaseXRef] = []
         self.info = []
         self.catalog: Dict[str, Any] = {}
+        self._page_tree: Optional["PDFPageTree"] = None
         self.encryption: Optional[Tuple[Any, Any]] = None
         self.decipher: Optional[DecipherCallable] = None
         self._parser = None
-        self._cached_objs: Dict[int, Tuple[object, int]] = {}
-        self._parsed_objs: Dict[int, Tuple[List[object], int]] = {}
         self._parser = parser
         self._parser.set_document(self)
         self.is_printable = self.is_modifiable = self.is_extractable = True
-        # Retrieve the information of each header that was appended
-        # (maybe multiple times) at the end of the document.
-        try:
-            pos = self.find_xref(parser)
-            self.read_xref_from(parser, pos, self.xrefs)
-        except PDFNoValidXRef:
-            if fallback:
-                parser.fallback = True
-                newxref = PDFXRefFallback()
-                newxref.load(parser)
-                self.xrefs.append(newxref)
+        cache_key = None
+        cached = None
+        if xref_cache is not None:
+            cache_key = xref_cache.get_key(parser.fp)
+            cached = xref_cache.load(cache_key, self)
+        if cached is not None:
+            (self.xrefs, parser.fallback) = cached
+        else:
+            # Retrieve the information of each header that was appended
+            # (maybe multiple times) at the end of the document.
+            try:
+                pos = self.find_xref(parser)
+                self.read_xref_from(parser, pos, self.xrefs)
+            except PDFNoValidXRef:
+                if fallback:
+                    parser.fallback = True
+                    newxref = PDFXRefFallback()
+                    newxref.load(parser)
+                    self.xrefs.append(newxref)
+            if xref_cache is not None and self.xrefs:
+                assert cache_key is not None
+                xref_cache.save(cache_key, self.xrefs, parser.fallback)
 
         for xref in self.xrefs:
             trailer = xref.get_trailer()
@@ -762,13 +997,16 @@ class PDFDocument:
         self._parser.fallback = False  # need to read streams with exact length
 
     def _getobj_objstm(self, stream: PDFStream, index: int, objid: int) -> object:
-        if stream.objid in self._parsed_objs:
-            (objs, n) = self._parsed_objs[stream.objid]
+        cached = None
+        if self.cache is not None:
+            cached = self.cache.get(("objstm", stream.objid))
+        if cached is not None:
+            (objs, n) = cached
         else:
             (objs, n) = self._get_objects(stream)
-            if self.caching:
+            if self.cache is not None:
                 assert stream.objid is not None
-                self._parsed_objs[stream.objid] = (objs, n)
+                self.cache.put(("objstm", stream.objid), (objs, n))
         i = n * 2 + index
         try:
             obj = objs[i]
@@ -834,8 +1072,11 @@ class PDFDocument:
         if not self.xrefs:
             raise PDFException("PDFDocument is not initialized")
         log.debug("getobj: objid=%r", objid)
-        if objid in self._cached_objs:
-            (obj, genno) = self._cached_objs[objid]
+        cached = None
+        if self.cache is not None:
+            cached = self.cache.get(objid)
+        if cached is not None:
+            (obj, genno) = cached
         else:
             for xref in self.xrefs:
                 try:
@@ -859,8 +1100,8 @@ class PDFDocument:
             else:
                 raise PDFObjectNotFound(objid)
             log.debug("register: objid=%r: %r", objid, obj)
-            if self.caching:
-                self._cached_objs[objid] = (obj, genno)
+            if self.cache is not None:
+                self.cache.put(objid, (obj, genno))
         return obj
 
     OutlineType = Tuple[Any, Any, Any, Any, Any]
@@ -885,6 +1126,28 @@ class PDFDocument:
 
         return search(self.catalog["Outlines"], 0)
 
+    @property
+    def pages(self) -> "PDFPageTree":
+        """The pages of the document, looked up on demand by index."""
+        if self._page_tree is None:
+            from pdfminer.pdfpage import PDFPageTree
+
+            self._page_tree = PDFPageTree(self)
+        return self._page_tree
+
+    @overload
+    def page(self, index: int) -> "PDFPage": ...
+
+    @overload
+    def page(self, index: slice) -> List["PDFPage"]: ...
+
+    def page(self, index: Union[int, slice]) -> Union["PDFPage", List["PDFPage"]]:
+        """Returns the page at an index, starting at 0, or a list of pages.
+
+        Only the part of the page tree that leads to the pages is read.
+        """
+        return self.pages[index]
+
     def get_page_labels(self) -> Iterator[str]:
         """Generate page label strings for the PDF document.
 
@@ -1,13 +1,27 @@
 import logging
 import re
+import time
 from io import BytesIO
-from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union, cast
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
-from pdfminer import settings
+from pdfminer import profiling, settings
 from pdfminer.casting import safe_float
 from pdfminer.cmapdb import CMap, CMapBase, CMapDB
 from pdfminer.pdfcolor import PREDEFINED_COLORSPACE, PDFColorSpace
 from pdfminer.pdfdevice import PDFDevice, PDFTextSeq
+from pdfminer.pdfdocument import PDFObjectCache
 from pdfminer.pdfexceptions import PDFException, PDFValueError
 from pdfminer.pdffont import (
     PDFCIDFont,
@@ -59,12 +73,23 @@ class PDFInterpreterError(PDFException):
     pass
 
 
+class PDFContentSplit(PDFException):
+    """Raised by a PDFContentParser with split=True at the end of a stream
+    that ends between two objects.
+    """
+
+
 LITERAL_PDF = LIT("PDF")
 LITERAL_TEXT = LIT("Text")
 LITERAL_FONT = LIT("Font")
 LITERAL_FORM = LIT("Form")
 LITERAL_IMAGE = LIT("Image")
 
+# The default memory budget of the parsed Form XObjects, in bytes.
+FORM_CACHE_BYTES = 32 * 1024 * 1024
+# The default memory budget of the parsed content streams, in bytes.
+CONTENT_CACHE_BYTES = 32 * 1024 * 1024
+
 
 class PDFTextState:
     matrix: Matrix
@@ -182,11 +207,31 @@ class PDFResourceManager:
     ResourceManager facilitates reuse of shared resources
     such as fonts and images so that large objects are not
     allocated multiple times.
+
+    With caching, the parsed operators of Form XObjects are kept in
+    form_cache, by default a cache of at most FORM_CACHE_BYTES, so that a
+    form used on many pages is parsed only once.
+
+    Content streams that are seen again, such as a header stream shared by
+    every page, are parsed once more and then kept in content_cache, by
+    default a cache of at most CONTENT_CACHE_BYTES, keyed by their object
+    id. Streams seen only once are not kept.
     """
 
-    def __init__(self, caching: bool = True) -> None:
+    def __init__(
+        self,
+        caching: bool = True,
+        form_cache: Optional[PDFObjectCache] = None,
+        content_cache: Optional[PDFObjectCache] = None,
+    ) -> None:
         self.caching = caching
         self._cached_fonts: Dict[object, PDFFont] = {}
+        if form_cache is None and caching:
+            form_cache = PDFObjectCache(max_bytes=FORM_CACHE_BYTES)
+        self.form_cache = form_cache if caching else None
+        if content_cache is None and caching:
+            content_cache = PDFObjectCache(max_bytes=CONTENT_CACHE_BYTES)
+        self.content_cache = content_cache if caching else None
 
     def get_procset(self, procs: Sequence[object]) -> None:
         for proc in procs:
@@ -218,6 +263,9 @@ class PDFResourceManager:
                 if settings.STRICT:
                     raise PDFFontError("Font Subtype is not specified.")
                 subtype = "Type1"
+            profiler = profiling.active()
+            if profiler is not None:
+                start = time.perf_counter()
             if subtype in ("Type1", "MMType1"):
                 # Type1 Font
                 font = PDFType1Font(self, spec)
@@ -243,19 +291,32 @@ class PDFResourceManager:
                 if settings.STRICT:
                     raise PDFFontError("Invalid Font spec: %r" % spec)
                 font = PDFType1Font(self, spec)  # this is so wrong!
+            if profiler is not None:
+                profiler.add("font." + subtype, time.perf_counter() - start)
             if objid and self.caching:
                 self._cached_fonts[objid] = font
         return font
 
 
 class PDFContentParser(PSStackParser[Union[PSKeyword, PDFStream]]):
-    def __init__(self, streams: Sequence[object]) -> None:
+    def __init__(
+        self,
+        streams: Sequence[object],
+        fast_tokenizer: bool = False,
+        split: bool = False,
+    ) -> None:
         self.streams = streams
         self.istream = 0
+        # whether to raise PDFContentSplit where the streams can be split.
+        self.split = split
         # PSStackParser.__init__(fp=None) is safe only because we've overloaded
         # all the methods that would attempt to access self.fp without first
         # calling self.fillfp().
-        PSStackParser.__init__(self, None)  # type: ignore[arg-type]
+        PSStackParser.__init__(
+            self,
+            None,  # type: ignore[arg-type]
+            fast_tokenizer=fast_tokenizer,
+        )
 
     def fillfp(self) -> None:
         if not self.fp:
@@ -270,10 +331,18 @@ class PDFContentParser(PSStackParser[Union[PSKeyword, PDFStream]]):
         self.fillfp()
         PSStackParser.seek(self, pos)
 
+    def resume(self, istream: int) -> None:
+        """Continues with streams[istream] after a PDFContentSplit."""
+        self.istream = istream
+        self.fillfp()
+
     def fillbuf(self) -> None:
         if self.charpos < len(self.buf):
             return
         while 1:
+            if not self.fp and self.split and self.ends_at_boundary():
+                # the next stream, if any, is streams[istream].
+                raise PDFContentSplit(self.istream)
             self.fillfp()
             self.bufpos = self.fp.tell()
             self.buf = self.fp.read(self.BUFSIZ)
@@ -283,6 +352,8 @@ class PDFContentParser(PSStackParser[Union[PSKeyword, PDFStream]]):
         self.charpos = 0
 
     def get_inline_data(self, pos: int, target: bytes = b"EI") -> Tuple[int, bytes]:
+        # the data may run on into the next stream.
+        (split, self.split) = (self.split, False)
         self.seek(pos)
         i = 0
         data = b""
@@ -313,11 +384,18 @@ class PDFContentParser(PSStackParser[Union[PSKeyword, PDFStream]]):
                     self.charpos = len(self.buf)
         data = data[: -(len(target) + 1)]  # strip the last part
         data = re.sub(rb"(\x0d\x0a|[\x0d\x0a])$", b"", data)
+        self.split = split
         return (pos, data)
 
     def flush(self) -> None:
         self.add_results(*self.popall())
 
+    def ends_at_boundary(self) -> bool:
+        """Whether the content read so far ends between two objects, so that
+        the content after it can be parsed on its own.
+        """
+        return not self.context and not self.in_token()
+
     KEYWORD_BI = KWD(b"BI")
     KEYWORD_ID = KWD(b"ID")
     KEYWORD_EI = KWD(b"EI")
@@ -357,19 +435,36 @@ class PDFContentParser(PSStackParser[Union[PSKeyword, PDFStream]]):
 PDFStackT = PSStackType[PDFStream]
 """Types that may appear on the PDF argument stack."""
 
+PDFContentT = PSStackType[Union[PSKeyword, PDFStream]]
+"""Operands and operators of a parsed content stream."""
+
+OperatorHandler = Tuple[Callable[..., None], int]
+"""A do_* function of PDFPageInterpreter and the number of its operands."""
+
 
 class PDFPageInterpreter:
     """Processor for the content of a PDF page
 
     Reference: PDF Reference, Appendix A, Operator Summary
+
+    With fast_tokenizer=True the content streams are tokenized with the
+    table-driven tokenizer of PSBaseParser.
     """
 
-    def __init__(self, rsrcmgr: PDFResourceManager, device: PDFDevice) -> None:
+    def __init__(
+        self,
+        rsrcmgr: PDFResourceManager,
+        device: PDFDevice,
+        fast_tokenizer: bool = False,
+    ) -> None:
         self.rsrcmgr = rsrcmgr
         self.device = device
+        self.fast_tokenizer = fast_tokenizer
 
     def dup(self) -> "PDFPageInterpreter":
-        return self.__class__(self.rsrcmgr, self.device)
+        interpreter = self.__class__(self.rsrcmgr, self.device)
+        interpreter.fast_tokenizer = self.fast_tokenizer
+        return interpreter
 
     def init_resources(self, resources: Dict[object, object]) -> None:
         """Prepare the fonts and XObjects listed in the Resource attribute."""
@@ -942,10 +1037,11 @@ class PDFPageInterpreter:
             else:
                 resources = self.resources.copy()
             self.device.begin_figure(xobjid, bbox, matrix)
-            interpreter.render_contents(
+            interpreter.render_form(
+                xobj,
                 resources,
-                [xobj],
                 ctm=mult_matrix(matrix, self.ctm),
+                inherited=not xobjres,
             )
             self.device.end_figure(xobjid)
         elif subtype is LITERAL_IMAGE and "Width" in xobj and "Height" in xobj:
@@ -967,9 +1063,10 @@ class PDFPageInterpreter:
             ctm = (0, 1, -1, 0, y1, -x0)
         else:
             ctm = (1, 0, 0, 1, -x0, -y0)
-        self.device.begin_page(page, ctm)
-        self.render_contents(page.resources, page.contents, ctm=ctm)
-        self.device.end_page(page)
+        with profiling.page(page.pageid, page.label):
+            self.device.begin_page(page, ctm)
+            self.render_contents(page.resources, page.contents, ctm=ctm)
+            self.device.end_page(page)
 
     def render_contents(
         self,
@@ -991,36 +1088,228 @@ class PDFPageInterpreter:
         self.init_state(ctm)
         self.execute(list_value(streams))
 
-    def execute(self, streams: Sequence[object]) -> None:
+    def render_form(
+        self,
+        xobj: PDFStream,
+        resources: Dict[object, object],
+        ctm: Matrix = MATRIX_IDENTITY,
+        inherited: bool = False,
+    ) -> None:
+        """Render the content stream of a Form XObject.
+
+        The parsed operators of the form, and the resources it prepared
+        unless they are inherited from the page, are kept in the form cache
+        of the resource manager. When the same form is rendered again, they
+        are replayed without parsing the stream again.
+        """
+        cache = self.rsrcmgr.form_cache
+        if cache is None or xobj.objid is None:
+            self.render_contents(resources, [xobj], ctm=ctm)
+            return
+        entry = cache.get(xobj.objid)
+        # objids are only unique within a document.
+        if entry is not None and entry[0] is xobj:
+            (_, objs, maps) = entry
+            if maps is None:
+                self.init_resources(resources)
+            else:
+                (self.resources, self.fontmap, self.xobjmap, self.csmap) = maps
+            self.init_state(ctm)
+            self.execute_objects(objs)
+            return
+        self.init_resources(resources)
+        self.init_state(ctm)
+        record: List[PDFContentT] = []
+        self.execute([xobj], record=record)
+        # only reached when the whole stream could be parsed.
+        if inherited:
+            maps = None
+        else:
+            maps = (self.resources, self.fontmap, self.xobjmap, self.csmap)
+        # the stream and the resources belong to the document.
+        cache.put(xobj.objid, (xobj, record, maps), owned=record)
+
+    # Handlers of the operators, per interpreter class. See get_operators().
+    _operator_tables: Dict[type, Dict[PSKeyword, OperatorHandler]] = {}
+
+    @classmethod
+    def get_operators(cls) -> Dict[PSKeyword, OperatorHandler]:
+        """Returns the dispatch table of this interpreter class.
+
+        The table maps each operator keyword to its do_* function and the
+        number of operands it takes. It is filled lazily with the supported
+        operators and shared by all instances, so that subclasses overriding
+        do_* methods get their own table. do_* functions set on an instance
+        are looked up by execute_objects().
+        """
+        try:
+            return cls._operator_tables[cls]
+        except KeyError:
+            operators: Dict[PSKeyword, OperatorHandler] = {}
+            cls._operator_tables[cls] = operators
+            return operators
+
+    @staticmethod
+    def _get_method_name(keyword: PSKeyword) -> str:
+        name = keyword_name(keyword)
+        return "do_%s" % name.replace("*", "_a").replace('"', "_w").replace(
+            "'",
+            "_q",
+        )
+
+    @classmethod
+    def lookup_operator(cls, keyword: PSKeyword) -> Optional[OperatorHandler]:
+        func = getattr(cls, cls._get_method_name(keyword), None)
+        if func is None:
+            return None
+        return (func, func.__code__.co_argcount - 1)
+
+    def lookup_instance_operator(
+        self,
+        keyword: PSKeyword,
+    ) -> Optional[OperatorHandler]:
+        """Returns the handler of a do_* function set on this instance, or
+        of the method of its class.
+        """
+        name = self._get_method_name(keyword)
+        if name not in self.__dict__:
+            return self.lookup_operator(keyword)
+        func: Callable[..., None] = self.__dict__[name]
+
+        def call(interpreter: "PDFPageInterpreter", *args: object) -> None:
+            func(*args)
+
+        return (call, func.__code__.co_argcount - 1)
+
+    def execute(
+        self,
+        streams: Sequence[object],
+        record: Optional[List[PDFContentT]] = None,
+    ) -> None:
+        """Parse and run the operators of the content streams.
+
+        If record is given, the parsed operands and operators are appended
+        to it as they are run, so that they can be run again with
+        execute_objects().
+        """
+        cache = self.rsrcmgr.content_cache
+        if cache is None or record is not None:
+            self._execute_streams(streams, record)
+            return
+        # the streams are parsed as one content, split where they end
+        # between two objects.
+        parser: Optional[PDFContentParser] = None
+        start = 0
+        i = 0
+        while i < len(streams):
+            strm = stream_value(streams[i])
+            key = (strm.objid, strm.genno)
+            cached = cache.get(key) if strm.objid is not None else None
+            # objids are only unique within a document.
+            if isinstance(cached, tuple) and cached[0] is strm:
+                self.execute_objects(cached[1])
+                i += 1
+                continue
+            if parser is None:
+                start = i
+                parser = PDFContentParser(
+                    streams[start:],
+                    fast_tokenizer=self.fast_tokenizer,
+                    split=True,
+                )
+            else:
+                parser.resume(i - start)
+            objs: Iterable[PDFContentT] = self._next_objects(parser)
+            kept: Optional[List[PDFContentT]] = None
+            if cached is None:
+                # the first time, only remember that the stream was seen.
+                if strm.objid is not None:
+                    cache.put(key, True)
+            else:
+                kept = []
+                objs = self._record_objects(objs, kept)
+            try:
+                self.execute_objects(objs)
+            except PDFContentSplit:
+                pass
+            else:
+                # the content ended within a token.
+                return
+            # a stream that does not end between two objects is parsed on
+            # with the next ones, and not kept.
+            if kept is not None and parser.istream == i - start + 1:
+                cache.put(key, (strm, kept), owned=kept)
+            i = start + parser.istream
+
+    def _execute_streams(
+        self,
+        streams: Sequence[object],
+        record: Optional[List[PDFContentT]] = None,
+    ) -> None:
         try:
-            parser = PDFContentParser(streams)
+            parser = PDFContentParser(streams, fast_tokenizer=self.fast_tokenizer)
         except PSEOF:
             # empty page
             return
+        objs = self._next_objects(parser)
+        if record is not None:
+            objs = self._record_objects(objs, record)
+        self.execute_objects(objs)
+
+    @staticmethod
+    def _next_objects(parser: PDFContentParser) -> Iterator[PDFContentT]:
         while True:
             try:
                 (_, obj) = parser.nextobject()
             except PSEOF:
-                break
+                return
+            yield obj
+
+    @staticmethod
+    def _record_objects(
+        objs: Iterable[PDFContentT],
+        record: List[PDFContentT],
+    ) -> Iterator[PDFContentT]:
+        for obj in objs:
+            record.append(obj)
+            yield obj
+
+    def execute_objects(self, objs: Iterable[PDFContentT]) -> None:
+        """Run parsed operands and operators, in content stream order."""
+        operators = self.get_operators()
+        lookup = self.lookup_operator
+        if any(name.startswith("do_") for name in self.__dict__):
+            # the functions set on the instance come first.
+            operators = {}
+            lookup = self.lookup_instance_operator
+        profiler = profiling.active()
+        for obj in objs:
             if isinstance(obj, PSKeyword):
-                name = keyword_name(obj)
-                method = "do_%s" % name.replace("*", "_a").replace('"', "_w").replace(
-                    "'",
-                    "_q",
-                )
-                if hasattr(self, method):
-                    func = getattr(self, method)
-                    nargs = func.__code__.co_argcount - 1
+                handler = operators.get(obj)
+                if handler is None:
+                    handler = lookup(obj)
+                    # unknown keywords are not kept.
+                    if handler is not None:
+                        operators[obj] = handler
+                if handler is not None:
+                    (func, nargs) = handler
+                    if profiler is not None:
+                        start = time.perf_counter()
                     if nargs:
                         args = self.pop(nargs)
-                        log.debug("exec: %s %r", name, args)
+                        log.debug("exec: %r %r", obj, args)
                         if len(args) == nargs:
-                            func(*args)
+                            func(self, *args)
                     else:
-                        log.debug("exec: %s", name)
-                        func()
+                        log.debug("exec: %r", obj)
+                        func(self)
+                    if profiler is not None:
+                        profiler.add(
+                            "interpret." + keyword_name(obj),
+                            time.perf_counter() - start,
+                        )
                 elif settings.STRICT:
-                    error_msg = "Unknown operator: %r" % name
+                    error_msg = "Unknown operator: %r" % keyword_name(obj)
                     raise PDFInterpreterError(error_msg)
             else:
                 self.push(obj)
@@ -1,16 +1,30 @@
 import itertools
 import logging
-from typing import Any, BinaryIO, Container, Dict, Iterator, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    BinaryIO,
+    Container,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    overload,
+)
 
 from pdfminer import settings
 from pdfminer.pdfdocument import (
     PDFDocument,
     PDFNoPageLabels,
+    PDFObjectCache,
     PDFTextExtractionNotAllowed,
 )
 from pdfminer.pdfexceptions import PDFObjectNotFound, PDFValueError
 from pdfminer.pdfparser import PDFParser
-from pdfminer.pdftypes import dict_value, int_value, list_value, resolve1
+from pdfminer.pdftypes import PDFObjRef, dict_value, int_value, list_value, resolve1
 from pdfminer.psparser import LIT
 from pdfminer.utils import parse_rect
 
@@ -21,6 +35,13 @@ LITERAL_PAGE = LIT("Page")
 LITERAL_PAGES = LIT("Pages")
 
 
+def _object_type(attrs: Dict[Any, Any]) -> object:
+    object_type = attrs.get("Type")
+    if object_type is None and not settings.STRICT:  # See #64
+        object_type = attrs.get("type")
+    return object_type
+
+
 class PDFPage:
     """An object that holds the information about a page.
 
@@ -122,9 +143,7 @@ class PDFPage:
                 if k in cls.INHERITABLE_ATTRS and k not in object_properties:
                     object_properties[k] = v
 
-            object_type = object_properties.get("Type")
-            if object_type is None and not settings.STRICT:  # See #64
-                object_type = object_properties.get("type")
+            object_type = _object_type(object_properties)
 
             if object_type is LITERAL_PAGES and "Kids" in object_properties:
                 log.debug("Pages: Kids=%r", object_properties["Kids"])
@@ -166,11 +185,12 @@ class PDFPage:
         password: str = "",
         caching: bool = True,
         check_extractable: bool = False,
+        cache: Optional[PDFObjectCache] = None,
     ) -> Iterator["PDFPage"]:
         # Create a PDF parser object associated with the file object.
         parser = PDFParser(fp)
         # Create a PDF document object that stores the document structure.
-        doc = PDFDocument(parser, password=password, caching=caching)
+        doc = PDFDocument(parser, password=password, caching=caching, cache=cache)
         # Check if the document allows text extraction.
         # If not, warn the user and proceed.
         if not doc.is_extractable:
@@ -186,6 +206,10 @@ class PDFPage:
                     "if you want to raise an error in this case" % fp
                 )
                 log.warning(warning_msg)
+        # The walk stops after the last selected page, when it is known.
+        lastpageno = None
+        if pagenos and isinstance(pagenos, Iterable):
+            lastpageno = max(pagenos)
         # Process each page contained in the document.
         for pageno, page in enumerate(cls.create_pages(doc)):
             if pagenos and (pageno not in pagenos):
@@ -193,3 +217,171 @@ class PDFPage:
             yield page
             if maxpages and maxpages <= pageno + 1:
                 break
+            if lastpageno is not None and lastpageno <= pageno:
+                break
+
+
+class _BrokenPageTree(Exception):
+    pass
+
+
+class PDFPageTree:
+    """Random access to the pages of a document.
+
+    Looking up a page resolves only the /Kids arrays on the path to it,
+    the /Count of the nodes before the path skips their subtrees. The
+    resolved kids of each node are kept, so that later lookups walk them
+    again without parsing. The pages are the same as the ones of
+    PDFPage.create_pages. Documents without a usable page tree, or with a
+    /Count that does not match the kids of a node, fall back to
+    create_pages, once.
+
+    This is meant for single pages; PDFPage.get_pages walks the tree to
+    iterate over a set of page numbers.
+    """
+
+    def __init__(self, document: PDFDocument) -> None:
+        self.doc = document
+        self._pages: Optional[List[PDFPage]] = None
+        self._count: Optional[int] = None
+        self._labels: Optional[List[Optional[str]]] = None
+        self._nodes: Dict[
+            int, Tuple[Dict[Any, Any], List[Tuple[PDFObjRef, int]]]
+        ] = {}
+
+    def __len__(self) -> int:
+        if self._pages is not None:
+            return len(self._pages)
+        if self._count is None:
+            try:
+                self._count = self._get_count()
+            except _BrokenPageTree:
+                return len(self._fallback())
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> PDFPage: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[PDFPage]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[PDFPage, List[PDFPage]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+        if self._pages is None:
+            try:
+                return self._lookup(index)
+            except _BrokenPageTree:
+                log.debug("Falling back to create_pages for page %d", index)
+        pages = self._fallback()
+        if len(pages) <= index:
+            # /Count promised more pages than there are.
+            raise IndexError("page index out of range")
+        return pages[index]
+
+    def __iter__(self) -> Iterator[PDFPage]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _fallback(self) -> List[PDFPage]:
+        if self._pages is None:
+            self._pages = list(PDFPage.create_pages(self.doc))
+        return self._pages
+
+    def _get_count(self) -> int:
+        if "Pages" not in self.doc.catalog:
+            raise _BrokenPageTree
+        node = self.doc.catalog["Pages"]
+        if not isinstance(node, PDFObjRef):
+            raise _BrokenPageTree
+        if (
+            node.objid not in self._nodes
+            and _object_type(dict_value(node)) is LITERAL_PAGE
+        ):
+            return 1
+        (_, kids) = self._get_node(node, self.doc.catalog)
+        return sum(count for (_, count) in kids)
+
+    def _get_node(
+        self,
+        node: PDFObjRef,
+        parent: Dict[Any, Any],
+    ) -> Tuple[Dict[Any, Any], List[Tuple[PDFObjRef, int]]]:
+        """Returns the inherited attributes of a page tree node and its kids
+        with their page counts, which are checked against its /Count.
+        """
+        if node.objid in self._nodes:
+            return self._nodes[node.objid]
+        attrs = dict_value(node).copy()
+        for k, v in parent.items():
+            if k in PDFPage.INHERITABLE_ATTRS and k not in attrs:
+                attrs[k] = v
+        kids: List[Tuple[PDFObjRef, int]] = []
+        if _object_type(attrs) is LITERAL_PAGES and "Kids" in attrs:
+            for kid in list_value(attrs["Kids"]):
+                if not isinstance(kid, PDFObjRef):
+                    raise _BrokenPageTree
+                kid_attrs = dict_value(kid)
+                kid_type = _object_type(kid_attrs)
+                if kid_type is LITERAL_PAGE:
+                    kids.append((kid, 1))
+                elif kid_type is LITERAL_PAGES and "Kids" in kid_attrs:
+                    kids.append((kid, self._get_node_count(kid_attrs)))
+                # create_pages skips other kids too.
+            if sum(count for (_, count) in kids) != self._get_node_count(attrs):
+                raise _BrokenPageTree
+        self._nodes[node.objid] = (attrs, kids)
+        return (attrs, kids)
+
+    @staticmethod
+    def _get_node_count(attrs: Dict[Any, Any]) -> int:
+        count = resolve1(attrs.get("Count"))
+        if not isinstance(count, int) or count < 0:
+            raise _BrokenPageTree
+        return count
+
+    def _lookup(self, index: int) -> PDFPage:
+        if "Pages" not in self.doc.catalog:
+            raise _BrokenPageTree
+        parent: Dict[Any, Any] = self.doc.catalog
+        node = self.doc.catalog["Pages"]
+        visited: Set[object] = set()
+        remaining = index
+        while True:
+            if not isinstance(node, PDFObjRef) or node.objid in visited:
+                raise _BrokenPageTree
+            visited.add(node.objid)
+            if (
+                node.objid not in self._nodes
+                and _object_type(dict_value(node)) is LITERAL_PAGE
+            ):
+                if remaining:
+                    raise _BrokenPageTree
+                attrs = dict_value(node).copy()
+                for k, v in parent.items():
+                    if k in PDFPage.INHERITABLE_ATTRS and k not in attrs:
+                        attrs[k] = v
+                return PDFPage(self.doc, node.objid, attrs, self._get_label(index))
+            (attrs, kids) = self._get_node(node, parent)
+            for kid, count in kids:
+                if remaining < count:
+                    break
+                remaining -= count
+            else:
+                raise _BrokenPageTree
+            (parent, node) = (attrs, kid)
+
+    def _get_label(self, index: int) -> Optional[str]:
+        if self._labels is None:
+            # the labels of all pages, generated once.
+            try:
+                labels = self.doc.get_page_labels()
+            except PDFNoPageLabels:
+                self._labels = [None] * len(self)
+            else:
+                self._labels = list(itertools.islice(labels, len(self)))
+        return self._labels[index]
@@ -1,6 +1,6 @@
 import logging
 from io import BytesIO
-from typing import TYPE_CHECKING, BinaryIO, Optional, Union
+from typing import TYPE_CHECKING, BinaryIO, List, Optional, Union
 
 from pdfminer import settings
 from pdfminer.casting import safe_int
@@ -34,10 +34,24 @@ class PDFParser(PSStackParser[Union[PSKeyword, PDFStream, PDFObjRef, None]]):
       parser.seek(offset)
       parser.nextobject()
 
+    With use_mmap=True the file is memory-mapped and parsed in place,
+    which avoids the buffer refills and copies of chunked reading when
+    jumping between object offsets of large files. See PSBaseParser for
+    fast_tokenizer.
     """
 
-    def __init__(self, fp: BinaryIO) -> None:
-        PSStackParser.__init__(self, fp)
+    def __init__(
+        self,
+        fp: BinaryIO,
+        use_mmap: bool = False,
+        fast_tokenizer: bool = False,
+    ) -> None:
+        PSStackParser.__init__(
+            self,
+            fp,
+            use_mmap=use_mmap,
+            fast_tokenizer=fast_tokenizer,
+        )
         self.doc: Optional[PDFDocument] = None
         self.fallback = False
 
@@ -92,8 +106,8 @@ class PDFParser(PSStackParser[Union[PSKeyword, PDFStream, PDFObjRef, None]]):
                     raise PDFSyntaxError("Unexpected EOF")
                 return
             pos += len(line)
-            self.fp.seek(pos)
-            data = bytearray(self.fp.read(objlen))
+            data = self.read_at(pos, objlen)
+            extra: List[bytes] = []
             self.seek(pos + objlen)
             while 1:
                 try:
@@ -106,11 +120,13 @@ class PDFParser(PSStackParser[Union[PSKeyword, PDFStream, PDFObjRef, None]]):
                     i = line.index(b"endstream")
                     objlen += i
                     if self.fallback:
-                        data += line[:i]
+                        extra.append(line[:i])
                     break
                 objlen += len(line)
                 if self.fallback:
-                    data += line
+                    extra.append(line)
+            if extra:
+                data = b"".join([data, *extra])
             self.seek(pos + objlen)
             # XXX limit objlen not to exceed object boundary
             log.debug(
@@ -121,7 +137,7 @@ class PDFParser(PSStackParser[Union[PSKeyword, PDFStream, PDFObjRef, None]]):
                 data[:10],
             )
             assert self.doc is not None
-            stream = PDFStream(dic, bytes(data), self.doc.decipher)
+            stream = PDFStream(dic, data, self.doc.decipher)
             self.push((pos, stream))
 
         else:
@@ -138,7 +154,8 @@ class PDFStreamParser(PDFParser):
     """
 
     def __init__(self, data: bytes) -> None:
-        PDFParser.__init__(self, BytesIO(data))
+        # The data is already in memory, so parse it in place.
+        PDFParser.__init__(self, BytesIO(data), use_mmap=True)
 
     def flush(self) -> None:
         self.add_results(*self.popall())
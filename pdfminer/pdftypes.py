@@ -1,11 +1,14 @@
 import io
 import logging
+import time
 import zlib
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     Optional,
     Protocol,
@@ -15,13 +18,13 @@ from typing import (
 )
 from warnings import warn
 
-from pdfminer import pdfexceptions, settings
-from pdfminer.ascii85 import ascii85decode, asciihexdecode
-from pdfminer.ccitt import ccittfaxdecode
-from pdfminer.lzw import lzwdecode
-from pdfminer.psparser import LIT, PSObject
-from pdfminer.runlength import rldecode
-from pdfminer.utils import apply_png_predictor
+from pdfminer import pdfexceptions, profiling, settings
+from pdfminer.ascii85 import ASCIIHexDecoder, ascii85decode
+from pdfminer.ccitt import CCITTDecoder
+from pdfminer.lzw import LZWDecoder
+from pdfminer.psparser import LIT, PSObject, literal_name
+from pdfminer.runlength import RunLengthDecoder
+from pdfminer.utils import PNGPredictor
 
 if TYPE_CHECKING:
     from pdfminer.pdfdocument import PDFDocument
@@ -41,6 +44,9 @@ LITERALS_DCT_DECODE = (LIT("DCTDecode"), LIT("DCT"))
 LITERALS_JBIG2_DECODE = (LIT("JBIG2Decode"),)
 LITERALS_JPX_DECODE = (LIT("JPXDecode"),)
 
+# The number of raw bytes decoded at a time by PDFStream.iter_data().
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class DecipherCallable(Protocol):
     """Fully typed a decipher callback, with optional parameter."""
@@ -99,6 +105,11 @@ class PDFObjRef(PDFObject):
     def __repr__(self) -> str:
         return "<PDFObjRef:%d>" % (self.objid)
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # The document stays behind, e.g. when a layout is sent to another
+        # process. The reference can not be resolved after unpickling.
+        return {"doc": None, "objid": self.objid}
+
     def resolve(self, default: object = None) -> Any:
         assert self.doc is not None
         try:
@@ -242,6 +253,90 @@ def decompress_corrupted(data: bytes) -> bytes:
     return result_str
 
 
+class StreamDecoder(Protocol):
+    """An incremental decoder, one stage of the filter chain of a stream.
+
+    decode() returns the output for the data so far. Decoders may keep some
+    of the data for the next call, until final=True ends the input.
+    """
+
+    def decode(self, data: bytes, final: bool = False) -> bytes:
+        raise NotImplementedError
+
+
+class FlateDecoder:
+    """Incremental decoder of the FlateDecode filter.
+
+    On corrupted data, the output decoded before the error is kept, as with
+    decompress_corrupted(), unless settings.STRICT is set.
+    """
+
+    def __init__(self) -> None:
+        self.decompressor = zlib.decompressobj()
+        self.nbytes = 0
+        self.error_pos: Optional[int] = None
+
+    def decode(self, data: bytes, final: bool = False) -> bytes:
+        if self.error_pos is None:
+            if self.nbytes:
+                backup = self.decompressor.copy()
+            else:
+                backup = zlib.decompressobj()
+            try:
+                result = self.decompressor.decompress(data)
+                if final:
+                    result += self.decompressor.flush()
+            except zlib.error as e:
+                if settings.STRICT:
+                    error_msg = f"Invalid zlib bytes: {e!r}, {data!r}"
+                    raise PDFException(error_msg)
+                result = self._decode_corrupted(backup, data)
+        else:
+            result = b""
+        self.nbytes += len(data)
+        if final:
+            if settings.STRICT and not self.decompressor.eof:
+                error_msg = "Invalid zlib bytes: incomplete or truncated stream"
+                raise PDFException(error_msg)
+            # Let the error pass if we're already in the CRC checksum
+            if self.error_pos is not None and self.error_pos < self.nbytes - 3:
+                logger.warning("Data-loss while decompressing corrupted data")
+        return result
+
+    def _decode_corrupted(self, decompressor: Any, data: bytes) -> bytes:
+        result = b""
+        for i in range(len(data)):
+            try:
+                result += decompressor.decompress(data[i : i + 1])
+            except zlib.error:
+                self.error_pos = self.nbytes + i
+                break
+        return result
+
+
+class BufferedDecoder:
+    """Decoder of a filter that can only decode all of its input at once."""
+
+    def __init__(self, func: Callable[[bytes], bytes]) -> None:
+        self.func = func
+        self.chunks: List[bytes] = []
+
+    def decode(self, data: bytes, final: bool = False) -> bytes:
+        self.chunks.append(data)
+        if not final:
+            return b""
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return self.func(data)
+
+
+class PassThroughDecoder:
+    """Decoder of a filter whose data is returned as it is, such as images."""
+
+    def decode(self, data: bytes, final: bool = False) -> bytes:
+        return data
+
+
 class PDFStream(PDFObject):
     def __init__(
         self,
@@ -261,6 +356,22 @@ class PDFStream(PDFObject):
         self.objid = objid
         self.genno = genno
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # The decipher callback belongs to the document, so pickle the
+        # deciphered data instead.
+        state = self.__dict__.copy()
+        if self.decipher is not None and self.rawdata is not None:
+            assert self.objid is not None
+            assert self.genno is not None
+            state["rawdata"] = self.decipher(
+                self.objid,
+                self.genno,
+                self.rawdata,
+                self.attrs,
+            )
+        state["decipher"] = None
+        return state
+
     def __repr__(self) -> str:
         if self.data is None:
             assert self.rawdata is not None
@@ -313,56 +424,102 @@ class PDFStream(PDFObject):
         assert self.data is None and self.rawdata is not None, str(
             (self.data, self.rawdata),
         )
+        self.data = b"".join(self._iter_decode(None))
+        self.rawdata = None
+
+    def iter_data(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yields the decoded data in chunks, without keeping it.
+
+        The raw data goes through the filters chunk_size bytes at a time, so
+        that the decoded data is never in memory as a whole, unless a filter
+        can only decode all of its input at once. If the stream is already
+        decoded, its data is yielded.
+        """
+        if self.data is not None:
+            yield self.data
+            return
+        yield from self._iter_decode(chunk_size)
+
+    def _iter_decode(self, chunk_size: Optional[int]) -> Iterator[bytes]:
+        assert self.rawdata is not None
         data = self.rawdata
         if self.decipher:
             # Handle encryption
             assert self.objid is not None
             assert self.genno is not None
             data = self.decipher(self.objid, self.genno, data, self.attrs)
-        filters = self.get_filters()
-        if not filters:
-            self.data = data
-            self.rawdata = None
+        stages = self._get_decoders()
+        if not stages:
+            yield data
             return
-        for f, params in filters:
+        profiler = profiling.active()
+        seconds = [0.0] * len(stages)
+        nbytes = [0] * len(stages)
+
+        def feed(chunk: bytes, final: bool) -> bytes:
+            for i, (_, decoder, predictor) in enumerate(stages):
+                if not chunk and not final:
+                    break
+                if profiler is not None:
+                    start = time.perf_counter()
+                nbytes[i] += len(chunk)
+                chunk = decoder.decode(chunk, final)
+                if predictor is not None:
+                    chunk = predictor.decode(chunk, final)
+                if profiler is not None:
+                    seconds[i] += time.perf_counter() - start
+            return chunk
+
+        if chunk_size is None:
+            chunk_size = len(data) or 1
+        for pos in range(0, len(data), chunk_size):
+            chunk = feed(data[pos : pos + chunk_size], False)
+            if chunk:
+                yield chunk
+        chunk = feed(b"", True)
+        if chunk:
+            yield chunk
+        if profiler is not None:
+            for (name, _, _), elapsed, size in zip(stages, seconds, nbytes):
+                profiler.add("decode." + name, elapsed, size)
+
+    def _get_decoders(
+        self,
+    ) -> List[Tuple[str, StreamDecoder, Optional[StreamDecoder]]]:
+        """Returns the name, decoder and predictor of each filter."""
+        stages: List[Tuple[str, StreamDecoder, Optional[StreamDecoder]]] = []
+        for f, params in self.get_filters():
+            decoder: StreamDecoder
             if f in LITERALS_FLATE_DECODE:
                 # will get errors if the document is encrypted.
-                try:
-                    data = zlib.decompress(data)
-
-                except zlib.error as e:
-                    if settings.STRICT:
-                        error_msg = f"Invalid zlib bytes: {e!r}, {data!r}"
-                        raise PDFException(error_msg)
-
-                    try:
-                        data = decompress_corrupted(data)
-                    except zlib.error:
-                        data = b""
-
+                decoder = FlateDecoder()
             elif f in LITERALS_LZW_DECODE:
-                data = lzwdecode(data)
+                early_change = 1
+                if params and "EarlyChange" in params:
+                    early_change = int_value(params["EarlyChange"])
+                decoder = LZWDecoder(early_change=early_change)
             elif f in LITERALS_ASCII85_DECODE:
-                data = ascii85decode(data)
+                decoder = BufferedDecoder(ascii85decode)
             elif f in LITERALS_ASCIIHEX_DECODE:
-                data = asciihexdecode(data)
+                decoder = ASCIIHexDecoder()
             elif f in LITERALS_RUNLENGTH_DECODE:
-                data = rldecode(data)
+                decoder = RunLengthDecoder()
             elif f in LITERALS_CCITTFAX_DECODE:
-                data = ccittfaxdecode(data, params)
+                decoder = CCITTDecoder(params or {})
             elif f in LITERALS_DCT_DECODE:
                 # This is probably a JPG stream
                 # it does not need to be decoded twice.
                 # Just return the stream to the user.
-                pass
+                decoder = PassThroughDecoder()
             elif f in LITERALS_JBIG2_DECODE or f in LITERALS_JPX_DECODE:
-                pass
+                decoder = PassThroughDecoder()
             elif f == LITERAL_CRYPT:
                 # not yet..
                 raise PDFNotImplementedError("/Crypt filter is unsupported")
             else:
                 raise PDFNotImplementedError("Unsupported filter: %r" % f)
             # apply predictors
+            predictor: Optional[StreamDecoder] = None
             if params and "Predictor" in params:
                 pred = int_value(params["Predictor"])
                 if pred == 1:
@@ -374,18 +531,12 @@ class PDFStream(PDFObject):
                     columns = int_value(params.get("Columns", 1))
                     raw_bits_per_component = params.get("BitsPerComponent", 8)
                     bitspercomponent = int_value(raw_bits_per_component)
-                    data = apply_png_predictor(
-                        pred,
-                        colors,
-                        columns,
-                        bitspercomponent,
-                        data,
-                    )
+                    predictor = PNGPredictor(colors, columns, bitspercomponent)
                 else:
                     error_msg = "Unsupported predictor: %r" % pred
                     raise PDFNotImplementedError(error_msg)
-        self.data = data
-        self.rawdata = None
+            stages.append((literal_name(f), decoder, predictor))
+        return stages
 
     def get_data(self) -> bytes:
         if self.data is None:
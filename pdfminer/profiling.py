@@ -0,0 +1,204 @@
+"""Timing counters for the stages of the extraction pipeline.
+
+Activate a Profiler to record the wall time, the number of calls and the
+number of bytes processed by every stage, page by page:
+
+    with Profiler() as profiler:
+        extract_text("example.pdf")
+    for report in profiler.reports:
+        print(report.pageno, report.seconds, report.slowest())
+
+The stages are named after the part of the pipeline they belong to:
+
+    decode.<filter>     PDFStream.decode, per filter; bytes are the input size
+    font.<subtype>      PDFResourceManager.get_font, creating a font
+    interpret.<op>      PDFPageInterpreter.execute, per operator; the time of
+                        an operator includes the operators it runs, e.g. Do
+    layout.<step>       LTLayoutContainer.analyze and its grouping steps
+    convert.<device>    rendering an analyzed page with a converter
+
+Work that is done outside of a page, such as opening the document, is
+recorded in Profiler.document. Nothing is recorded, and almost nothing is
+spent, while no profiler is active. Pages that are laid out by worker
+processes are not recorded.
+
+The active profilers belong to the current context, so that extractions in
+other threads or asyncio tasks are not recorded by them.
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+
+class StageStats:
+    """The counters of a stage."""
+
+    __slots__ = ("calls", "seconds", "nbytes")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.nbytes = 0
+
+    def __repr__(self) -> str:
+        return "<StageStats calls=%d seconds=%.6f nbytes=%d>" % (
+            self.calls,
+            self.seconds,
+            self.nbytes,
+        )
+
+
+class PageReport:
+    """The counters of all stages of a page.
+
+    pageid and label identify the page, pageno counts the processed pages
+    starting at 1. The report of the work outside pages has pageno 0.
+    seconds is the wall time of the whole page.
+    """
+
+    def __init__(
+        self,
+        pageno: int,
+        pageid: object = None,
+        label: Optional[str] = None,
+    ) -> None:
+        self.pageno = pageno
+        self.pageid = pageid
+        self.label = label
+        self.seconds = 0.0
+        self.stages: Dict[str, StageStats] = {}
+
+    def __repr__(self) -> str:
+        return "<PageReport pageno=%d seconds=%.6f stages=%d>" % (
+            self.pageno,
+            self.seconds,
+            len(self.stages),
+        )
+
+    def add(self, stage: str, seconds: float, nbytes: int = 0) -> None:
+        try:
+            stats = self.stages[stage]
+        except KeyError:
+            stats = self.stages[stage] = StageStats()
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.nbytes += nbytes
+
+    def slowest(self, n: int = 1) -> List[Tuple[str, StageStats]]:
+        """Returns the n stages that took the most time."""
+        return sorted(
+            self.stages.items(),
+            key=lambda item: item[1].seconds,
+            reverse=True,
+        )[:n]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "pageno": self.pageno,
+            "pageid": self.pageid,
+            "label": self.label,
+            "seconds": self.seconds,
+            "stages": {
+                stage: {
+                    "calls": stats.calls,
+                    "seconds": stats.seconds,
+                    "nbytes": stats.nbytes,
+                }
+                for stage, stats in self.stages.items()
+            },
+        }
+
+
+class Profiler:
+    """Records the counters of the pipeline while it is active.
+
+    callback is called with the report of every page once it is done, so
+    that long-running processes can pass it on instead of keeping all
+    reports.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[PageReport], None]] = None,
+        keep_reports: bool = True,
+    ) -> None:
+        self.callback = callback
+        self.keep_reports = keep_reports
+        self.document = PageReport(0)
+        self.reports: List[PageReport] = []
+        self.current = self.document
+        self._pageno = 0
+
+    def __enter__(self) -> "Profiler":
+        _profilers.set(_profilers.get() + (self,))
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        profilers = _profilers.get()
+        i = len(profilers) - 1 - profilers[::-1].index(self)
+        _profilers.set(profilers[:i] + profilers[i + 1 :])
+
+    def add(self, stage: str, seconds: float, nbytes: int = 0) -> None:
+        """Adds a call of a stage to the current page."""
+        self.current.add(stage, seconds, nbytes)
+
+    @contextmanager
+    def stage(self, name: str, nbytes: int = 0) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current.add(name, time.perf_counter() - start, nbytes)
+
+    @contextmanager
+    def page(self, pageid: object, label: Optional[str] = None) -> Iterator[None]:
+        self._pageno += 1
+        report = PageReport(self._pageno, pageid, label)
+        (outer, self.current) = (self.current, report)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            report.seconds = time.perf_counter() - start
+            self.current = outer
+            if self.keep_reports:
+                self.reports.append(report)
+            if self.callback is not None:
+                self.callback(report)
+
+
+# The active profilers of the context, from the outermost to the innermost.
+_profilers: ContextVar[Tuple[Profiler, ...]] = ContextVar("profilers", default=())
+
+
+def active() -> Optional[Profiler]:
+    """Returns the innermost active profiler, if any."""
+    profilers = _profilers.get()
+    return profilers[-1] if profilers else None
+
+
+def stage(name: str, nbytes: int = 0) -> ContextManager[None]:
+    """Records the enclosed code as a call of a stage."""
+    profilers = _profilers.get()
+    if not profilers:
+        return nullcontext()
+    return profilers[-1].stage(name, nbytes)
+
+
+def page(pageid: object, label: Optional[str] = None) -> ContextManager[None]:
+    """Records the enclosed code as the processing of a page."""
+    profilers = _profilers.get()
+    if not profilers:
+        return nullcontext()
+    return profilers[-1].page(pageid, label)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import io
 import logging
+import mmap
 import re
 from typing import (
     Any,
@@ -14,6 +15,7 @@ from typing import (
     Type,
     TypeVar,
     Union,
+    cast,
 )
 
 from pdfminer import psexceptions, settings
@@ -55,6 +57,10 @@ class PSLiteral(PSObject):
         name = self.name
         return "/%r" % name
 
+    def __reduce__(self) -> Tuple[Any, Tuple[NameType]]:
+        # unpickled literals are interned as well.
+        return (_intern_literal, (self.name,))
+
 
 class PSKeyword(PSObject):
     """A class that represents a PostScript keyword.
@@ -74,6 +80,10 @@ class PSKeyword(PSObject):
         name = self.name
         return "/%r" % name
 
+    def __reduce__(self) -> Tuple[Any, Tuple[bytes]]:
+        # unpickled keywords are interned as well.
+        return (_intern_keyword, (self.name,))
+
 
 _SymbolT = TypeVar("_SymbolT", PSLiteral, PSKeyword)
 
@@ -103,6 +113,16 @@ PSLiteralTable = PSSymbolTable(PSLiteral)
 PSKeywordTable = PSSymbolTable(PSKeyword)
 LIT = PSLiteralTable.intern
 KWD = PSKeywordTable.intern
+
+
+def _intern_literal(name: PSLiteral.NameType) -> PSLiteral:
+    return PSLiteralTable.intern(name)
+
+
+def _intern_keyword(name: bytes) -> PSKeyword:
+    return PSKeywordTable.intern(name)
+
+
 KEYWORD_PROC_BEGIN = KWD(b"{")
 KEYWORD_PROC_END = KWD(b"}")
 KEYWORD_ARRAY_BEGIN = KWD(b"[")
@@ -161,17 +181,319 @@ ESC_STRING = {
 
 PSBaseParserToken = Union[float, bool, PSLiteral, PSKeyword, bytes]
 
+# Byte classes used by the fast tokenizer to dispatch on the first byte of
+# a token, see _tokenize_batch().
+_CLS_OTHER = 0
+_CLS_COMMENT = 1
+_CLS_LITERAL = 2
+_CLS_NUMBER = 3
+_CLS_FLOAT = 4
+_CLS_KEYWORD = 5
+_CLS_STRING = 6
+_CLS_WOPEN = 7
+_CLS_WCLOSE = 8
+
+
+def _build_char_classes() -> bytes:
+    table = bytearray([_CLS_OTHER]) * 256
+    table[ord("%")] = _CLS_COMMENT
+    table[ord("/")] = _CLS_LITERAL
+    for c in b"+-0123456789":
+        table[c] = _CLS_NUMBER
+    table[ord(".")] = _CLS_FLOAT
+    for c in b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz":
+        table[c] = _CLS_KEYWORD
+    table[ord("(")] = _CLS_STRING
+    table[ord("<")] = _CLS_WOPEN
+    table[ord(">")] = _CLS_WCLOSE
+    return bytes(table)
+
+
+_CHAR_CLASSES = _build_char_classes()
+_HEX_DIGITS = frozenset(b"0123456789abcdefABCDEF")
+_OCT_DIGITS = frozenset(b"01234567")
+_ESC_BYTES = {k[0]: bytes((v,)) for (k, v) in ESC_STRING.items()}
+_SKIP = re.compile(rb"[\s\x00]*")
+_WHITESPACE = b" \t\n\r\x0b\x0c"
+
+
+def _tokenize_batch(
+    s: bytes,
+    i: int,
+    base: int,
+    limit: int,
+    final: bool,
+    tokens: List[Tuple[int, PSBaseParserToken]],
+    ends: List[int],
+) -> Tuple[int, bool]:
+    """Tokenizes s from position i in a single pass.
+
+    Tokens are appended to `tokens` with their absolute position (relative
+    to `base`) and the position where the default state machine would
+    leave `charpos` after reading them is appended to `ends`. Tokenizing
+    stops at the first token that starts at or after `limit`.
+
+    If a token runs into the end of s, it is incomplete: the position of
+    its first byte and True are returned so that the caller can retry with
+    more data. If `final` is set, s is the last data available and such a
+    token is completed (or dropped) exactly as the default tokenizer does
+    at EOF.
+
+    :return: (position to continue from, whether a token was incomplete)
+    """
+    classes = _CHAR_CLASSES
+    keywords = PSKeywordTable.dict
+    add = tokens.append
+    add_end = ends.append
+    n = len(s)
+    while True:
+        i = _SKIP.match(s, i).end()  # type: ignore[union-attr]
+        if i >= n or limit <= i:
+            return (i, False)
+        start = i
+        c = s[i]
+        cls = classes[c]
+        if cls == _CLS_KEYWORD:
+            m = END_KEYWORD.search(s, i + 1)
+            if m is None:
+                if not final:
+                    return (start, True)
+                j = n
+            else:
+                j = m.start()
+            name = s[start:j]
+            if name == b"true":
+                token: PSBaseParserToken = True
+            elif name == b"false":
+                token = False
+            else:
+                kwd = keywords.get(name)
+                token = KWD(name) if kwd is None else kwd
+            add((base + start, token))
+            add_end(j)
+            i = j
+
+        elif cls == _CLS_NUMBER or cls == _CLS_FLOAT:
+            is_float = cls == _CLS_FLOAT
+            m = END_NUMBER.search(s, i + 1)
+            if m is None:
+                if not final:
+                    return (start, True)
+                j = n
+            else:
+                j = m.start()
+                if not is_float and s[j] == 46:  # b"."
+                    is_float = True
+                    m = END_NUMBER.search(s, j + 1)
+                    if m is None:
+                        if not final:
+                            return (start, True)
+                        j = n
+                    else:
+                        j = m.start()
+            try:
+                if is_float:
+                    add((base + start, float(s[start:j])))
+                else:
+                    add((base + start, int(s[start:j])))
+                add_end(j)
+            except ValueError:
+                pass
+            i = j
+
+        elif cls == _CLS_LITERAL:
+            parts = []
+            p = i + 1
+            while True:
+                m = END_LITERAL.search(s, p)
+                if m is None:
+                    if not final:
+                        return (start, True)
+                    j = n
+                    break
+                j = m.start()
+                if s[j] != 35:  # b"#"
+                    break
+                parts.append(s[p:j])
+                k = j + 1
+                while k < n and k < j + 3 and s[k] in _HEX_DIGITS:
+                    k += 1
+                if k >= n:
+                    if not final:
+                        return (start, True)
+                    # the default tokenizer drops a literal that ends
+                    # within a hex escape.
+                    return (n, False)
+                if j + 1 < k:
+                    parts.append(bytes((int(s[j + 1 : k], 16),)))
+                p = k
+            parts.append(s[p:j])
+            raw = b"".join(parts)
+            try:
+                lit: Union[str, bytes] = str(raw, "utf-8")
+            except Exception:
+                lit = raw
+            add((base + start, LIT(lit)))
+            add_end(j)
+            i = j
+
+        elif cls == _CLS_STRING:
+            parts = []
+            depth = 1
+            p = i + 1
+            while True:
+                m = END_STRING.search(s, p)
+                if m is None:
+                    if not final:
+                        return (start, True)
+                    return (n, False)
+                j = m.start()
+                parts.append(s[p:j])
+                c = s[j]
+                if c == 92:  # b"\\"
+                    k = j + 1
+                    if n <= k + 1:
+                        # the escape may need the next byte as well
+                        if not final:
+                            return (start, True)
+                        return (n, False)
+                    c = s[k]
+                    if c in _OCT_DIGITS:
+                        e = k + 1
+                        while e < n and e < k + 3 and s[e] in _OCT_DIGITS:
+                            e += 1
+                        chrcode = int(s[k:e], 8)
+                        if 256 <= chrcode:
+                            if tokens:
+                                # raise when this token is actually reached
+                                return (start, False)
+                            raise AssertionError(
+                                "Invalid octal %s (%d)" % (repr(s[k:e]), chrcode)
+                            )
+                        parts.append(bytes((chrcode,)))
+                        p = e
+                    elif c in _ESC_BYTES:
+                        parts.append(_ESC_BYTES[c])
+                        p = k + 1
+                    elif c == 13 and s[k + 1] == 10:  # b"\r\n"
+                        p = k + 2
+                    else:
+                        p = k + 1
+                elif c == 40:  # b"("
+                    depth += 1
+                    parts.append(b"(")
+                    p = j + 1
+                else:  # b")"
+                    depth -= 1
+                    if depth:
+                        parts.append(b")")
+                        p = j + 1
+                    else:
+                        add((base + start, b"".join(parts)))
+                        add_end(j + 1)
+                        i = j + 1
+                        break
+
+        elif cls == _CLS_WOPEN:
+            if n <= i + 1:
+                if not final:
+                    return (start, True)
+                return (n, False)
+            if s[i + 1] == 60:  # b"<"
+                add((base + start, KEYWORD_DICT_BEGIN))
+                add_end(i + 2)
+                i += 2
+                continue
+            m = END_HEX_STRING.search(s, i + 1)
+            if m is None:
+                if not final:
+                    return (start, True)
+                return (n, False)
+            j = m.start()
+            digits = s[i + 1 : j].translate(None, _WHITESPACE)
+            if len(digits) % 2:
+                data = bytes.fromhex(str(digits[:-1], "ascii"))
+                data += bytes((int(digits[-1:], 16),))
+            else:
+                data = bytes.fromhex(str(digits, "ascii"))
+            add((base + start, data))
+            add_end(j)
+            i = j
+
+        elif cls == _CLS_WCLOSE:
+            if n <= i + 1:
+                if not final:
+                    return (start, True)
+                return (n, False)
+            if s[i + 1] == 62:  # b">"
+                add((base + start, KEYWORD_DICT_END))
+                add_end(i + 2)
+                i += 2
+            else:
+                i += 1
+
+        elif cls == _CLS_COMMENT:
+            m = EOL.search(s, i + 1)
+            if m is None:
+                if not final:
+                    return (start, True)
+                return (n, False)
+            i = m.start()
+
+        else:
+            add((base + start, KWD(s[i : i + 1])))
+            add_end(i + 1)
+            i += 1
+
 
 class PSBaseParser:
-    """Most basic PostScript parser that performs only tokenization."""
+    """Most basic PostScript parser that performs only tokenization.
+
+    By default the input is read through `fp` in chunks of BUFSIZ bytes.
+    With `use_mmap=True` the whole file is memory-mapped (or read once if
+    it cannot be mapped) and the parser runs directly over that buffer, so
+    that seeking only moves an offset and no buffer refills are needed.
+
+    With `fast_tokenizer=True` a table-driven tokenizer produces the
+    tokens of a whole buffer in one pass instead of running the state
+    machine of _parse_* methods one step at a time. The tokens are the
+    same for both tokenizers.
+    """
 
     BUFSIZ = 4096
 
-    def __init__(self, fp: BinaryIO) -> None:
+    def __init__(
+        self,
+        fp: BinaryIO,
+        use_mmap: bool = False,
+        fast_tokenizer: bool = False,
+    ) -> None:
         self.fp = fp
         self.eof = False
+        self.fast_tokenizer = fast_tokenizer
+        self._map: Optional[bytes] = None
+        if use_mmap:
+            self._map = self._map_file(fp)
         self.seek(0)
 
+    @staticmethod
+    def _map_file(fp: BinaryIO) -> bytes:
+        """Returns a read-only buffer holding the whole content of fp."""
+        try:
+            fileno = fp.fileno()
+        except (AttributeError, OSError):
+            fileno = -1
+        if fileno >= 0:
+            try:
+                m = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+                # mmap objects support the slicing and searching used here.
+                return cast(bytes, m)
+            except (OSError, ValueError):
+                # Empty files, pipes and the like cannot be mapped.
+                pass
+        fp.seek(0)
+        return fp.read()
+
     def __repr__(self) -> str:
         return "<%s: %r, bufpos=%d>" % (self.__class__.__name__, self.fp, self.bufpos)
 
@@ -180,6 +502,9 @@ class PSBaseParser:
 
     def close(self) -> None:
         self.flush()
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._map = None
 
     def tell(self) -> int:
         return self.bufpos + self.charpos
@@ -195,21 +520,37 @@ class PSBaseParser:
     def seek(self, pos: int) -> None:
         """Seeks the parser to the given position."""
         log.debug("seek: %r", pos)
-        self.fp.seek(pos)
         # reset the status for nextline()
-        self.bufpos = pos
-        self.buf = b""
-        self.charpos = 0
+        if self._map is not None:
+            self.bufpos = 0
+            self.buf = self._map
+            self.charpos = pos
+        else:
+            self.fp.seek(pos)
+            self.bufpos = pos
+            self.buf = b""
+            self.charpos = 0
         # reset the status for nexttoken()
         self._parse1 = self._parse_main
         self._curtoken = b""
         self._curtokenpos = 0
         self._tokens: List[Tuple[int, PSBaseParserToken]] = []
+        self._reset_batch()
         self.eof = False
 
+    def _reset_batch(self) -> None:
+        # state of the fast tokenizer: a batch of tokens, the buffer
+        # positions where each of them ends and a cursor.
+        self._batch: List[Tuple[int, PSBaseParserToken]] = []
+        self._batchends: List[int] = []
+        self._batchidx = 0
+
     def fillbuf(self) -> None:
         if self.charpos < len(self.buf):
             return
+        if self._map is not None:
+            # the whole file is already in the buffer.
+            raise PSEOF("Unexpected EOF")
         # fetch next chunk.
         self.bufpos = self.fp.tell()
         self.buf = self.fp.read(self.BUFSIZ)
@@ -219,6 +560,9 @@ class PSBaseParser:
 
     def nextline(self) -> Tuple[int, bytes]:
         """Fetches a next line that ends either with \\r or \\n."""
+        if self._batch:
+            # tokens read ahead are not valid anymore after this line.
+            self._reset_batch()
         linebuf = b""
         linepos = self.bufpos + self.charpos
         eol = False
@@ -246,19 +590,31 @@ class PSBaseParser:
 
         return (linepos, linebuf)
 
+    def read_at(self, pos: int, n: int) -> bytes:
+        """Returns at most n bytes from the given absolute position.
+
+        The tokenizer state is not changed, call seek() afterwards to
+        continue parsing from a new position.
+        """
+        if self._map is not None:
+            return self._map[pos : pos + n]
+        self.fp.seek(pos)
+        return self.fp.read(n)
+
     def revreadlines(self) -> Iterator[bytes]:
         """Fetches a next line backword.
 
         This is used to locate the trailers at the end of a file.
         """
-        self.fp.seek(0, io.SEEK_END)
-        pos = self.fp.tell()
+        if self._map is not None:
+            pos = len(self._map)
+        else:
+            pos = self.fp.seek(0, io.SEEK_END)
         buf = b""
         while pos > 0:
             prevpos = pos
             pos = max(0, pos - self.BUFSIZ)
-            self.fp.seek(pos)
-            s = self.fp.read(prevpos - pos)
+            s = self.read_at(pos, prevpos - pos)
             if not s:
                 break
             while 1:
@@ -500,7 +856,76 @@ class PSBaseParser:
         self._parse1 = self._parse_main
         return j
 
+    def _nexttoken_fast(self) -> Tuple[int, PSBaseParserToken]:
+        while len(self._batch) <= self._batchidx:
+            if self.eof:
+                raise PSEOF("Unexpected EOF")
+            self._fill_batch()
+        i = self._batchidx
+        self._batchidx = i + 1
+        self.charpos = self._batchends[i]
+        return self._batch[i]
+
+    def _fill_batch(self) -> None:
+        """Tokenizes the next part of the input with _tokenize_batch()."""
+        self._reset_batch()
+        while not self._batch:
+            self.fillbuf()
+            (pos, incomplete) = _tokenize_batch(
+                self.buf,
+                self.charpos,
+                self.bufpos,
+                self.charpos + self.BUFSIZ,
+                False,
+                self._batch,
+                self._batchends,
+            )
+            if self._batch:
+                break
+            if not incomplete:
+                self.charpos = pos
+                continue
+            # A token runs into the end of the buffer: retry with the
+            # next chunk appended, or complete it as is at EOF.
+            (tail, tailpos) = (self.buf[pos:], self.bufpos + pos)
+            self.charpos = len(self.buf)
+            # the token being read, see in_token().
+            self._curtoken = tail
+            try:
+                self.fillbuf()
+            except PSEOF:
+                self._curtoken = b""
+                (self.buf, self.bufpos, self.charpos) = (tail, tailpos, 0)
+                _tokenize_batch(
+                    tail,
+                    0,
+                    tailpos,
+                    len(tail),
+                    True,
+                    self._batch,
+                    self._batchends,
+                )
+                self.charpos = len(tail)
+                self.eof = True
+                if not self._batch:
+                    raise
+                break
+            self._curtoken = b""
+            self.buf = tail + self.buf
+            self.bufpos -= len(tail)
+            self.charpos = 0
+
+    def in_token(self) -> bool:
+        """Whether the input read so far ends within a token, so that the
+        rest of the token is still to be read.
+        """
+        if self.fast_tokenizer:
+            return bool(self._curtoken)
+        return self._parse1 != self._parse_main
+
     def nexttoken(self) -> Tuple[int, PSBaseParserToken]:
+        if self.fast_tokenizer:
+            return self._nexttoken_fast()
         if self.eof:
             # It's not really unexpected, come on now...
             raise PSEOF("Unexpected EOF")
@@ -534,8 +959,18 @@ PSStackEntry = Tuple[int, PSStackType[ExtraT]]
 
 
 class PSStackParser(PSBaseParser, Generic[ExtraT]):
-    def __init__(self, fp: BinaryIO) -> None:
-        PSBaseParser.__init__(self, fp)
+    def __init__(
+        self,
+        fp: BinaryIO,
+        use_mmap: bool = False,
+        fast_tokenizer: bool = False,
+    ) -> None:
+        PSBaseParser.__init__(
+            self,
+            fp,
+            use_mmap=use_mmap,
+            fast_tokenizer=fast_tokenizer,
+        )
         self.reset()
 
     def reset(self) -> None:
@@ -5,7 +5,49 @@
 #  * public domain *
 #
 
-from typing import List
+
+class RunLengthDecoder:
+    """Incremental RunLength decoder.
+
+    Each run is copied as one slice, or one byte repeated, into the output.
+    A run that is not complete at the end of a chunk is kept for the next
+    call of decode(). With final=True, an incomplete run is copied as far
+    as it goes.
+    """
+
+    def __init__(self) -> None:
+        self.pending = b""
+        self.done = False
+
+    def decode(self, data: bytes, final: bool = False) -> bytes:
+        if self.done:
+            return b""
+        buf = self.pending + data if self.pending else data
+        out = bytearray()
+        i = 0
+        n = len(buf)
+        while i < n:
+            length = buf[i]
+            if length < 128:
+                j = i + length + 2
+                if n < j and not final:
+                    break
+                out += buf[i + 1 : j]
+            elif length > 128:
+                j = i + 2
+                if n < j:
+                    if final:
+                        i = n
+                    break
+                out += buf[i + 1 : j] * (257 - length)
+            else:
+                self.done = True
+                break
+            i = j
+        if final:
+            self.done = True
+        self.pending = b"" if self.done else buf[i:]
+        return bytes(out)
 
 
 def rldecode(data: bytes) -> bytes:
@@ -21,18 +63,4 @@ def rldecode(data: bytes) -> bytes:
         (2 to 128) times during decompression. A length value of 128
         denotes EOD.
     """
-    decoded_array: List[int] = []
-    data_iter = iter(data)
-
-    while True:
-        length = next(data_iter, 128)
-        if length == 128:
-            break
-
-        if 0 <= length < 128:
-            decoded_array.extend((next(data_iter) for _ in range(length + 1)))
-
-        if length > 128:
-            run = [next(data_iter)] * (257 - length)
-            decoded_array.extend(run)
-    return bytes(decoded_array)
+    return RunLengthDecoder().decode(data, final=True)
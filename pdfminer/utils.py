@@ -1,9 +1,11 @@
 """Miscellaneous Routines."""
 
 import io
+import math
 import pathlib
 import string
 from html import escape
+from itertools import accumulate
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -30,10 +32,21 @@ if TYPE_CHECKING:
 
 import charset_normalizer  # For str encoding detection
 
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore[assignment]
+
 # from sys import maxint as INF doesn't work anymore under Python3, but PDF
 # still uses 32 bits ints
 INF = (1 << 31) - 1
 
+# PNGPredictor decodes the scanlines with NumPy, if installed, from this many
+# bytes on.
+NUMPY_MIN_PREDICTED_BYTES = 4096
+# ... and the runs of lines with the same filter type from this many bytes on.
+NUMPY_MIN_PREDICTED_RUN = 256
+
 
 FileOrName = Union[pathlib.PurePath, str, io.IOBase]
 AnyIO = Union[TextIO, BinaryIO]
@@ -137,94 +150,212 @@ def apply_png_predictor(
 
     Documentation: http://www.libpng.org/pub/png/spec/1.2/PNG-Filters.html
     """
-    if bitspercomponent not in [8, 1]:
-        msg = "Unsupported `bitspercomponent': %d" % bitspercomponent
-        raise PDFValueError(msg)
-
-    nbytes = colors * columns * bitspercomponent // 8
-    bpp = colors * bitspercomponent // 8  # number of bytes per complete pixel
-    buf = []
-    line_above = list(b"\x00" * columns)
-    for scanline_i in range(0, len(data), nbytes + 1):
-        filter_type = data[scanline_i]
-        line_encoded = data[scanline_i + 1 : scanline_i + 1 + nbytes]
-        raw = []
+    return PNGPredictor(colors, columns, bitspercomponent).decode(data, final=True)
+
+
+class PNGPredictor:
+    """Incremental decoder reversing the effect of the PNG predictor.
+
+    The scanlines are decoded as soon as they are complete, the rest is kept
+    for the next call of decode(). With final=True, the last scanline is
+    decoded even if it is shorter.
+
+    Whole scanlines are decoded at once: None, Sub and Up with byte
+    arithmetic, and with NumPy, if installed, runs of consecutive lines with
+    the same filter type from NUMPY_MIN_PREDICTED_BYTES bytes on. Average
+    and Paeth depend on the byte decoded just before and go byte by byte.
+
+    Documentation: http://www.libpng.org/pub/png/spec/1.2/PNG-Filters.html
+    """
 
+    def __init__(self, colors: int, columns: int, bitspercomponent: int) -> None:
+        if bitspercomponent not in [8, 1]:
+            msg = "Unsupported `bitspercomponent': %d" % bitspercomponent
+            raise PDFValueError(msg)
+        self.nbytes = (colors * columns * bitspercomponent + 7) // 8
+        # number of bytes per complete pixel, at least one.
+        self.bpp = max(1, colors * bitspercomponent // 8)
+        self.line_above = bytes(self.nbytes)
+        self.pending = b""
+        # per-byte masks of the whole scanline, for decode_up().
+        self.low_bits = int.from_bytes(b"\x7f" * self.nbytes, "big")
+        self.high_bits = int.from_bytes(b"\x80" * self.nbytes, "big")
+
+    def decode(self, data: bytes, final: bool = False) -> bytes:
+        if self.pending:
+            data = self.pending + data
+        rowsize = self.nbytes + 1
+        end = len(data) - len(data) % rowsize
+        if final:
+            self.pending = b""
+        else:
+            self.pending = data[end:]
+        if numpy is not None and NUMPY_MIN_PREDICTED_BYTES <= end:
+            buf = self.decode_lines_numpy(data, end // rowsize)
+        else:
+            buf = bytearray()
+            for scanline_i in range(0, end, rowsize):
+                raw = self.decode_line(
+                    data[scanline_i],
+                    data[scanline_i + 1 : scanline_i + rowsize],
+                )
+                buf += raw
+                self.line_above = raw
+        if final and end < len(data):
+            # the last scanline is incomplete.
+            raw = self.decode_line(data[end], data[end + 1 :])
+            buf += raw
+            self.line_above = raw
+        return bytes(buf)
+
+    def decode_line(self, filter_type: int, line_encoded: bytes) -> bytes:
         if filter_type == 0:
             # Filter type 0: None
-            raw = list(line_encoded)
-
+            return bytes(line_encoded)
         elif filter_type == 1:
-            # Filter type 1: Sub
-            # To reverse the effect of the Sub() filter after decompression,
-            # output the following value:
-            #   Raw(x) = Sub(x) + Raw(x - bpp)
-            # (computed mod 256), where Raw() refers to the bytes already
-            #  decoded.
-            for j, sub_x in enumerate(line_encoded):
-                if j - bpp < 0:
-                    raw_x_bpp = 0
-                else:
-                    raw_x_bpp = int(raw[j - bpp])
-                raw_x = (sub_x + raw_x_bpp) & 255
-                raw.append(raw_x)
-
+            return self.decode_sub(line_encoded)
         elif filter_type == 2:
-            # Filter type 2: Up
-            # To reverse the effect of the Up() filter after decompression,
-            # output the following value:
-            #   Raw(x) = Up(x) + Prior(x)
-            # (computed mod 256), where Prior() refers to the decoded bytes of
-            # the prior scanline.
-            for up_x, prior_x in zip(line_encoded, line_above):
-                raw_x = (up_x + prior_x) & 255
-                raw.append(raw_x)
-
+            return self.decode_up(line_encoded)
         elif filter_type == 3:
-            # Filter type 3: Average
-            # To reverse the effect of the Average() filter after
-            # decompression, output the following value:
-            #    Raw(x) = Average(x) + floor((Raw(x-bpp)+Prior(x))/2)
-            # where the result is computed mod 256, but the prediction is
-            # calculated in the same way as for encoding. Raw() refers to the
-            # bytes already decoded, and Prior() refers to the decoded bytes of
-            # the prior scanline.
-            for j, average_x in enumerate(line_encoded):
-                if j - bpp < 0:
-                    raw_x_bpp = 0
-                else:
-                    raw_x_bpp = int(raw[j - bpp])
-                prior_x = int(line_above[j])
-                raw_x = (average_x + (raw_x_bpp + prior_x) // 2) & 255
-                raw.append(raw_x)
-
+            return self.decode_average(line_encoded)
         elif filter_type == 4:
-            # Filter type 4: Paeth
-            # To reverse the effect of the Paeth() filter after decompression,
-            # output the following value:
-            #    Raw(x) = Paeth(x)
-            #             + PaethPredictor(Raw(x-bpp), Prior(x), Prior(x-bpp))
-            # (computed mod 256), where Raw() and Prior() refer to bytes
-            # already decoded. Exactly the same PaethPredictor() function is
-            # used by both encoder and decoder.
-            for j, paeth_x in enumerate(line_encoded):
-                if j - bpp < 0:
-                    raw_x_bpp = 0
-                    prior_x_bpp = 0
-                else:
-                    raw_x_bpp = int(raw[j - bpp])
-                    prior_x_bpp = int(line_above[j - bpp])
-                prior_x = int(line_above[j])
-                paeth = paeth_predictor(raw_x_bpp, prior_x, prior_x_bpp)
-                raw_x = (paeth_x + paeth) & 255
-                raw.append(raw_x)
-
+            return self.decode_paeth(line_encoded)
         else:
             raise PDFValueError("Unsupported predictor value: %d" % filter_type)
 
-        buf.extend(raw)
-        line_above = raw
-    return bytes(buf)
+    def decode_sub(self, line_encoded: bytes) -> bytes:
+        # Filter type 1: Sub
+        # To reverse the effect of the Sub() filter after decompression,
+        # output the following value:
+        #   Raw(x) = Sub(x) + Raw(x - bpp)
+        # (computed mod 256), where Raw() refers to the bytes already
+        #  decoded.
+        # That is a running sum of each of the bpp bytes of the pixels.
+        bpp = self.bpp
+        raw = bytearray(line_encoded)
+        for i in range(min(bpp, len(raw))):
+            sums: Iterable[int] = accumulate(line_encoded[i::bpp], _add_byte)
+            raw[i::bpp] = bytes(sums)
+        return bytes(raw)
+
+    def decode_up(self, line_encoded: bytes) -> bytes:
+        # Filter type 2: Up
+        # To reverse the effect of the Up() filter after decompression,
+        # output the following value:
+        #   Raw(x) = Up(x) + Prior(x)
+        # (computed mod 256), where Prior() refers to the decoded bytes of
+        # the prior scanline.
+        # All the bytes are added at once as one integer: the low 7 bits
+        # of each byte cannot carry into the next byte, the high bit is
+        # added without carry.
+        n = len(line_encoded)
+        if n < self.nbytes:
+            low_bits = self.low_bits >> (8 * (self.nbytes - n))
+            high_bits = self.high_bits >> (8 * (self.nbytes - n))
+        else:
+            (low_bits, high_bits) = (self.low_bits, self.high_bits)
+        up = int.from_bytes(line_encoded, "big")
+        prior = int.from_bytes(self.line_above[:n], "big")
+        raw = ((up & low_bits) + (prior & low_bits)) ^ ((up ^ prior) & high_bits)
+        return raw.to_bytes(n, "big")
+
+    def decode_average(self, line_encoded: bytes) -> bytes:
+        # Filter type 3: Average
+        # To reverse the effect of the Average() filter after
+        # decompression, output the following value:
+        #    Raw(x) = Average(x) + floor((Raw(x-bpp)+Prior(x))/2)
+        # where the result is computed mod 256, but the prediction is
+        # calculated in the same way as for encoding. Raw() refers to the
+        # bytes already decoded, and Prior() refers to the decoded bytes of
+        # the prior scanline.
+        bpp = self.bpp
+        line_above = self.line_above
+        raw = bytearray(line_encoded)
+        for j in range(min(bpp, len(raw))):
+            raw[j] = (raw[j] + (line_above[j] >> 1)) & 255
+        for j in range(bpp, len(raw)):
+            raw[j] = (raw[j] + ((raw[j - bpp] + line_above[j]) >> 1)) & 255
+        return bytes(raw)
+
+    def decode_paeth(self, line_encoded: bytes) -> bytes:
+        # Filter type 4: Paeth
+        # To reverse the effect of the Paeth() filter after decompression,
+        # output the following value:
+        #    Raw(x) = Paeth(x)
+        #             + PaethPredictor(Raw(x-bpp), Prior(x), Prior(x-bpp))
+        # (computed mod 256), where Raw() and Prior() refer to bytes
+        # already decoded. Exactly the same PaethPredictor() function is
+        # used by both encoder and decoder.
+        # paeth_predictor() is inlined: with p = a + b - c, the distances
+        # p - a, p - b and p - c are b - c, a - c and a + b - 2c. In the
+        # first pixel, a and c are 0 and the prediction is b.
+        bpp = self.bpp
+        line_above = self.line_above
+        raw = bytearray(line_encoded)
+        for j in range(min(bpp, len(raw))):
+            raw[j] = (raw[j] + line_above[j]) & 255
+        for j in range(bpp, len(raw)):
+            a = raw[j - bpp]
+            b = line_above[j]
+            c = line_above[j - bpp]
+            pa = abs(b - c)
+            pb = abs(a - c)
+            pc = abs(a + b - c - c)
+            if pa <= pb and pa <= pc:
+                raw[j] = (raw[j] + a) & 255
+            elif pb <= pc:
+                raw[j] = (raw[j] + b) & 255
+            else:
+                raw[j] = (raw[j] + c) & 255
+        return bytes(raw)
+
+    def decode_lines_numpy(self, data: bytes, nlines: int) -> bytearray:
+        """Decodes the first nlines complete scanlines of data with NumPy.
+
+        Runs of consecutive lines with the same filter type are decoded
+        together: Sub is a running sum along the lines and Up along the
+        columns. Short runs and the other filter types go line by line.
+        """
+        nbytes = self.nbytes
+        rowsize = nbytes + 1
+        bpp = self.bpp
+        lines = numpy.frombuffer(data, numpy.uint8, nlines * rowsize)
+        lines = lines.reshape(nlines, rowsize)
+        filter_types = lines[:, 0]
+        changes = numpy.flatnonzero(numpy.diff(filter_types)) + 1
+        starts = [0, *changes.tolist(), nlines]
+        buf = bytearray()
+        for start, stop in zip(starts, starts[1:]):
+            filter_type = int(filter_types[start])
+            encoded = lines[start:stop, 1:]
+            if (stop - start) * nbytes < NUMPY_MIN_PREDICTED_RUN:
+                # too short to gain from NumPy.
+                raw = None
+            elif filter_type == 0:
+                raw = encoded
+            elif filter_type == 1 and nbytes % bpp == 0:
+                pixels = encoded.reshape(stop - start, -1, bpp)
+                raw = numpy.cumsum(pixels, axis=1, dtype=numpy.uint8)
+            elif filter_type == 2:
+                raw = numpy.cumsum(encoded, axis=0, dtype=numpy.uint8)
+                raw += numpy.frombuffer(self.line_above, numpy.uint8)
+            else:
+                raw = None
+            if raw is None:
+                for scanline_i in range(start * rowsize, stop * rowsize, rowsize):
+                    self.line_above = self.decode_line(
+                        data[scanline_i],
+                        data[scanline_i + 1 : scanline_i + rowsize],
+                    )
+                    buf += self.line_above
+            else:
+                buf += raw.tobytes()
+                self.line_above = bytes(buf[-nbytes:]) if nbytes else b""
+        return buf
+
+
+def _add_byte(x: int, y: int) -> int:
+    return (x + y) & 255
 
 
 Point = Tuple[float, float]
@@ -683,37 +814,48 @@ def vecBetweenBoxes(obj1: "LTComponent", obj2: "LTComponent") -> Point:
 LTComponentT = TypeVar("LTComponentT", bound="LTComponent")
 
 
-class Plane(Generic[LTComponentT]):
-    """A set-like data structure for objects placed on a plane.
+class SpatialIndex(Generic[LTComponentT]):
+    """Interface of the indexes that Plane uses to find objects by area.
 
-    Can efficiently find objects in a certain rectangular area.
-    It maintains two parallel lists of objects, each of
-    which is sorted by its x or y coordinate.
+    An index only holds objects that overlap its bounding box. find()
+    yields the objects that overlap a given area in the order in which
+    they were placed.
     """
 
-    def __init__(self, bbox: Rect, gridsize: int = 50) -> None:
-        self._seq: List[LTComponentT] = []  # preserve the object order.
-        self._objs: Set[LTComponentT] = set()
-        self._grid: Dict[Point, List[LTComponentT]] = {}
-        self.gridsize = gridsize
+    def __init__(self, bbox: Rect) -> None:
         (self.x0, self.y0, self.x1, self.y1) = bbox
 
-    def __repr__(self) -> str:
-        return "<Plane objs=%r>" % list(self)
+    def _outside(self, bbox: Rect) -> bool:
+        (x0, y0, x1, y1) = bbox
+        return x1 <= self.x0 or self.x1 <= x0 or y1 <= self.y0 or self.y1 <= y0
 
-    def __iter__(self) -> Iterator[LTComponentT]:
-        return (obj for obj in self._seq if obj in self._objs)
+    def extend(self, objs: Iterable[LTComponentT]) -> None:
+        for obj in objs:
+            self.add(obj)
 
-    def __len__(self) -> int:
-        return len(self._objs)
+    def add(self, obj: LTComponentT) -> None:
+        raise NotImplementedError
 
-    def __contains__(self, obj: object) -> bool:
-        return obj in self._objs
+    def remove(self, obj: LTComponentT) -> None:
+        raise NotImplementedError
+
+    def find(self, bbox: Rect) -> Iterator[LTComponentT]:
+        raise NotImplementedError
+
+
+class GridIndex(SpatialIndex[LTComponentT]):
+    """Index that places objects on the cells of a fixed-size grid."""
+
+    def __init__(self, bbox: Rect, gridsize: int = 50) -> None:
+        super().__init__(bbox)
+        # Dicts are used as ordered sets, so that removal is cheap.
+        self._grid: Dict[Point, Dict[LTComponentT, None]] = {}
+        self.gridsize = gridsize
 
     def _getrange(self, bbox: Rect) -> Iterator[Point]:
-        (x0, y0, x1, y1) = bbox
-        if x1 <= self.x0 or self.x1 <= x0 or y1 <= self.y0 or self.y1 <= y0:
+        if self._outside(bbox):
             return
+        (x0, y0, x1, y1) = bbox
         x0 = max(self.x0, x0)
         y0 = max(self.y0, y0)
         x1 = min(self.x1, x1)
@@ -722,33 +864,23 @@ class Plane(Generic[LTComponentT]):
             for grid_x in drange(x0, x1, self.gridsize):
                 yield (grid_x, grid_y)
 
-    def extend(self, objs: Iterable[LTComponentT]) -> None:
-        for obj in objs:
-            self.add(obj)
-
     def add(self, obj: LTComponentT) -> None:
-        """Place an object."""
         for k in self._getrange((obj.x0, obj.y0, obj.x1, obj.y1)):
             if k not in self._grid:
-                r: List[LTComponentT] = []
+                r: Dict[LTComponentT, None] = {}
                 self._grid[k] = r
             else:
                 r = self._grid[k]
-            r.append(obj)
-        self._seq.append(obj)
-        self._objs.add(obj)
+            r[obj] = None
 
     def remove(self, obj: LTComponentT) -> None:
-        """Displace an object."""
         for k in self._getrange((obj.x0, obj.y0, obj.x1, obj.y1)):
             try:
-                self._grid[k].remove(obj)
-            except (KeyError, ValueError):
+                del self._grid[k][obj]
+            except KeyError:
                 pass
-        self._objs.remove(obj)
 
     def find(self, bbox: Rect) -> Iterator[LTComponentT]:
-        """Finds objects that are in a certain area."""
         (x0, y0, x1, y1) = bbox
         done = set()
         for k in self._getrange(bbox):
@@ -763,6 +895,248 @@ class Plane(Generic[LTComponentT]):
                 yield obj
 
 
+# An object in an R-tree: its bounding box, its sequence number and itself.
+_RTreeEntry = Tuple[float, float, float, float, int, Any]
+# An R-tree node: its bounding box, its children and whether it is a leaf.
+_RTreeNode = Tuple[float, float, float, float, List[Any], bool]
+
+
+class RTreeIndex(SpatialIndex[LTComponentT]):
+    """Index that keeps objects in R-trees packed with Sort-Tile-Recursive.
+
+    A packed R-tree answers range queries in logarithmic time regardless
+    of how the objects are distributed, but it cannot be updated in place.
+    Therefore objects are kept in a series of trees whose sizes are powers
+    of two (the "logarithmic method"): add() packs the new object together
+    with the smaller trees, and extend() packs all objects at once.
+    Removed objects are only forgotten, and dropped from the trees when
+    they are packed again.
+
+    find() yields the objects in the same order as a GridIndex with the
+    given gridsize does, so that both indexes lead to the same layout.
+    """
+
+    NODE_CAPACITY = 16
+
+    def __init__(self, bbox: Rect, gridsize: int = 50) -> None:
+        super().__init__(bbox)
+        self.gridsize = gridsize
+        self._trees: List[Optional[_RTreeNode]] = []
+        self._live: Dict[LTComponentT, int] = {}
+        self._nextseq = 0
+        self._dead = 0
+
+    def extend(self, objs: Iterable[LTComponentT]) -> None:
+        entries = self._pop_entries(len(self._trees))
+        entries.extend(self._new_entry(obj) for obj in objs if self._accept(obj))
+        self._trees = []
+        self._place(entries)
+
+    def add(self, obj: LTComponentT) -> None:
+        if not self._accept(obj):
+            return
+        entries = [self._new_entry(obj)]
+        level = 0
+        while level < len(self._trees) and self._trees[level] is not None:
+            level += 1
+        entries.extend(self._pop_entries(level))
+        self._place(entries)
+
+    def remove(self, obj: LTComponentT) -> None:
+        if self._live.pop(obj, None) is None:
+            return
+        self._dead += 1
+        if len(self._live) < self._dead:
+            self.extend([])
+
+    def find(self, bbox: Rect) -> Iterator[LTComponentT]:
+        if self._outside(bbox):
+            return iter(())
+        (x0, y0, x1, y1) = bbox
+        found = list(self._search(bbox))
+        # Sort by the first grid cell (row by row) that an object shares
+        # with the area, and by placement within the cell.
+        d = self.gridsize
+        qx = int(max(self.x0, x0)) // d
+        qy = int(max(self.y0, y0)) // d
+        px0 = self.x0
+        py0 = self.y0
+        found.sort(
+            key=lambda e: (
+                max(int(max(py0, e[1])) // d, qy),
+                max(int(max(px0, e[0])) // d, qx),
+                e[4],
+            ),
+        )
+        return (entry[5] for entry in found)
+
+    def search(self, bbox: Rect) -> Iterator[LTComponentT]:
+        """Like find(), but yields the objects in no particular order."""
+        if self._outside(bbox):
+            return iter(())
+        return (entry[5] for entry in self._search(bbox))
+
+    def _search(self, bbox: Rect) -> Iterator[_RTreeEntry]:
+        (x0, y0, x1, y1) = bbox
+        live = self._live
+        stack = [tree for tree in self._trees if tree is not None]
+        while stack:
+            (nx0, ny0, nx1, ny1, entries, leaf) = stack.pop()
+            if nx1 <= x0 or x1 <= nx0 or ny1 <= y0 or y1 <= ny0:
+                continue
+            if not leaf:
+                stack.extend(entries)
+                continue
+            for entry in entries:
+                (ex0, ey0, ex1, ey1, seqno, obj) = entry
+                if ex1 <= x0 or x1 <= ex0 or ey1 <= y0 or y1 <= ey0:
+                    continue
+                if live.get(obj) == seqno:
+                    yield entry
+
+    def _accept(self, obj: LTComponentT) -> bool:
+        return not self._outside((obj.x0, obj.y0, obj.x1, obj.y1))
+
+    def _new_entry(self, obj: LTComponentT) -> _RTreeEntry:
+        seqno = self._nextseq
+        self._nextseq += 1
+        if obj in self._live:
+            # the entry that was placed before is replaced.
+            self._dead += 1
+        self._live[obj] = seqno
+        return (obj.x0, obj.y0, obj.x1, obj.y1, seqno, obj)
+
+    def _pop_entries(self, levels: int) -> List[_RTreeEntry]:
+        """Removes the trees below the given level and returns the live
+        entries that were in them.
+        """
+        live = self._live
+        entries: List[_RTreeEntry] = []
+        for level in range(min(levels, len(self._trees))):
+            tree = self._trees[level]
+            self._trees[level] = None
+            stack = [] if tree is None else [tree]
+            while stack:
+                (_, _, _, _, children, leaf) = stack.pop()
+                if not leaf:
+                    stack.extend(children)
+                    continue
+                for entry in children:
+                    if live.get(entry[5]) == entry[4]:
+                        entries.append(entry)
+                    else:
+                        self._dead -= 1
+        return entries
+
+    def _place(self, entries: List[_RTreeEntry]) -> None:
+        if not entries:
+            return
+        level = max(0, (len(entries) - 1).bit_length())
+        while len(self._trees) <= level:
+            self._trees.append(None)
+        if self._trees[level] is not None:
+            entries.extend(self._pop_entries(level + 1))
+            self._place(entries)
+            return
+        self._trees[level] = self._pack(entries)
+
+    @classmethod
+    def _pack(cls, objs: List[_RTreeEntry]) -> _RTreeNode:
+        """Builds an R-tree bottom-up with the Sort-Tile-Recursive algorithm."""
+        capacity = cls.NODE_CAPACITY
+        entries: List[Union[_RTreeEntry, _RTreeNode]] = list(objs)
+        leaf = True
+        while True:
+            nnodes = -(-len(entries) // capacity)
+            slice_size = capacity * math.ceil(math.sqrt(nnodes))
+            entries.sort(key=lambda e: e[0] + e[2])
+            nodes: List[_RTreeNode] = []
+            for i in range(0, len(entries), slice_size):
+                tile = sorted(entries[i : i + slice_size], key=lambda e: e[1] + e[3])
+                for j in range(0, len(tile), capacity):
+                    children = tile[j : j + capacity]
+                    nodes.append(
+                        (
+                            min(e[0] for e in children),
+                            min(e[1] for e in children),
+                            max(e[2] for e in children),
+                            max(e[3] for e in children),
+                            children,
+                            leaf,
+                        ),
+                    )
+            if len(nodes) == 1:
+                return nodes[0]
+            entries = list(nodes)
+            leaf = False
+
+
+SPATIAL_INDEXES: Dict[str, Callable[[Rect, int], SpatialIndex[Any]]] = {
+    "grid": GridIndex,
+    "rtree": RTreeIndex,
+}
+
+
+class Plane(Generic[LTComponentT]):
+    """A set-like data structure for objects placed on a plane.
+
+    Can efficiently find objects in a certain rectangular area.
+    The objects are kept in a spatial index, which is either a fixed-size
+    grid ("grid") or packed R-trees ("rtree"). The grid is fast for pages
+    with a moderate number of evenly sized objects, the R-trees do not
+    degrade on dense pages with many thousands of objects.
+    """
+
+    def __init__(self, bbox: Rect, gridsize: int = 50, index: str = "grid") -> None:
+        if index not in SPATIAL_INDEXES:
+            raise PDFValueError(f"Unknown spatial index: {index!r}")
+        self._seq: List[LTComponentT] = []  # preserve the object order.
+        self._objs: Set[LTComponentT] = set()
+        self._index: SpatialIndex[LTComponentT] = SPATIAL_INDEXES[index](
+            bbox,
+            gridsize,
+        )
+        self.gridsize = gridsize
+        (self.x0, self.y0, self.x1, self.y1) = bbox
+
+    def __repr__(self) -> str:
+        return "<Plane objs=%r>" % list(self)
+
+    def __iter__(self) -> Iterator[LTComponentT]:
+        if len(self._objs) * 2 < len(self._seq):
+            # drop the removed objects once they are the majority.
+            self._seq = [obj for obj in self._seq if obj in self._objs]
+        return (obj for obj in self._seq if obj in self._objs)
+
+    def __len__(self) -> int:
+        return len(self._objs)
+
+    def __contains__(self, obj: object) -> bool:
+        return obj in self._objs
+
+    def extend(self, objs: Iterable[LTComponentT]) -> None:
+        """Place several objects at once."""
+        objs = list(objs)
+        self._index.extend(objs)
+        self._seq.extend(objs)
+        self._objs.update(objs)
+
+    def add(self, obj: LTComponentT) -> None:
+        """Place an object."""
+        self._index.add(obj)
+        self._seq.append(obj)
+        self._objs.add(obj)
+
+    def remove(self, obj: LTComponentT) -> None:
+        """Displace an object."""
+        self._index.remove(obj)
+        self._objs.remove(obj)
+
+    def find(self, bbox: Rect) -> Iterator[LTComponentT]:
+        """Finds objects that are in a certain area."""
+        return self._index.find(bbox)
+
+
 ROMAN_ONES = ["i", "x", "c", "m"]
 ROMAN_FIVES = ["v", "l", "d"]
 
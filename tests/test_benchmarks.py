@@ -0,0 +1,37 @@
+from benchmarks import filters
+from benchmarks.corpus import CJK_CHARS, WORDS, generate_corpus
+from benchmarks.run import STAGES, compare, measure
+from pdfminer.high_level import extract_text
+
+
+class TestBenchmarks:
+    def test_corpus(self, tmp_path):
+        paths = generate_corpus(str(tmp_path), scale=0.05)
+        for name in ["text-heavy", "encrypted"]:
+            words = extract_text(paths[name]).split()
+            assert words
+            assert set(words) <= set(WORDS)
+        chars = set("".join(extract_text(paths["cjk"]).split()))
+        # a few ideographs map to their radicals.
+        assert len(chars & set(CJK_CHARS)) > 0.9 * len(chars)
+        assert extract_text(paths["many-small-objects"]).strip()
+        assert extract_text(paths["vector-heavy"]).strip()
+
+    def test_measure(self, tmp_path):
+        paths = generate_corpus(str(tmp_path), scale=0.05)
+        result = measure(paths["text-heavy"], repeat=1)
+        assert set(result["seconds"]) == set(STAGES)
+        assert set(result["peak_kib"]) == set(STAGES)
+
+    def test_compare(self):
+        baseline = {"documents": {"a": {"seconds": {"open": 1.0, "analyze": 1.0}}}}
+        results = {"documents": {"a": {"seconds": {"open": 1.05, "analyze": 1.5}}}}
+        regressions = compare(results, baseline, threshold=0.1)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("a analyze")
+
+    def test_filters(self):
+        result = filters.measure(6000, repeat=1)
+        assert set(result) == set(filters.FILTERS)
+        for name in result:
+            assert result[name]["nbytes"] == 6000
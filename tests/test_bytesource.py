@@ -0,0 +1,101 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pytest
+
+from benchmarks.corpus import text_heavy
+from pdfminer.bytesource import ByteSourceFile, FileByteSource, HTTPByteSource
+from pdfminer.high_level import extract_text
+from pdfminer.pdfexceptions import PDFIOError
+
+DATA = text_heavy(scale=5)
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves DATA at /range with range requests and at /full without."""
+
+    def do_GET(self):
+        if self.path == "/full":
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(DATA)))
+            self.end_headers()
+            self.wfile.write(DATA)
+            return
+        (start, end) = self.headers["Range"][len("bytes=") :].split("-")
+        data = DATA[int(start) : int(end) + 1]
+        self.server.requests.append((int(start), len(data)))
+        self.send_response(206)
+        self.send_header(
+            "Content-Range",
+            "bytes %s-%d/%d" % (start, int(start) + len(data) - 1, len(DATA)),
+        )
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestByteSourceFile:
+    def test_reads(self):
+        data = bytes(range(256)) * 100
+        fp = ByteSourceFile(FileByteSource(BytesIO(data)), block_size=1000, tail_size=0)
+        assert fp.requests == 0
+        fp.seek(1500)
+        assert fp.read(3000) == data[1500:4500]
+        # blocks 1 to 4, read at once.
+        assert (fp.requests, fp.nbytes) == (1, 4000)
+        fp.seek(3900)
+        assert fp.read(200) == data[3900:4100]
+        assert fp.requests == 1
+        fp.seek(-10, 2)
+        assert fp.read() == data[-10:]
+        assert fp.read(10) == b""
+        assert fp.requests == 2
+
+    def test_coalesces_missing_blocks(self):
+        data = bytes(10000)
+        fp = ByteSourceFile(
+            FileByteSource(BytesIO(data)),
+            block_size=1000,
+            max_blocks=3,
+            readahead=1,
+            tail_size=0,
+        )
+        fp.seek(2000)
+        fp.read(10)
+        # block 2 and the readahead block 3.
+        assert (fp.requests, fp.nbytes) == (1, 2000)
+        fp.seek(0)
+        assert fp.read(5000) == data[:5000]
+        # blocks 0-1 and 4-5, the cached blocks in between are reused.
+        assert (fp.requests, fp.nbytes) == (3, 6000)
+        assert len(fp._blocks) == 3
+
+
+class TestHTTPByteSource:
+    def test_extract_one_page(self, server):
+        url = "http://127.0.0.1:%d/range" % server.server_address[1]
+        with ByteSourceFile(HTTPByteSource(url), block_size=16 * 1024) as fp:
+            text = extract_text(fp, page_numbers=[2])
+            assert fp.nbytes < len(DATA) / 4
+        assert text == extract_text(BytesIO(DATA), page_numbers=[2])
+        assert sum(length for (_, length) in server.requests) < len(DATA) / 4
+
+    def test_no_range_support(self, server):
+        url = "http://127.0.0.1:%d/full" % server.server_address[1]
+        with pytest.raises(PDFIOError):
+            ByteSourceFile(HTTPByteSource(url))
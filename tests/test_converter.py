@@ -1,10 +1,32 @@
 import io
 from tempfile import TemporaryFile
 
-from pdfminer.converter import PDFConverter, PDFLayoutAnalyzer
+import pytest
+
+from pdfminer.converter import (
+    PDFConverter,
+    PDFLayoutAnalyzer,
+    PDFPageAggregator,
+    TextConverter,
+    XMLConverter,
+)
 from pdfminer.high_level import extract_pages
-from pdfminer.layout import LTChar, LTContainer, LTCurve, LTLine, LTRect
-from pdfminer.pdfinterp import PDFGraphicState
+from pdfminer.layout import (
+    GlyphBuffer,
+    LAParams,
+    LTChar,
+    LTCharStyle,
+    LTContainer,
+    LTCurve,
+    LTGlyphLine,
+    LTImage,
+    LTLine,
+    LTRect,
+)
+from pdfminer.pdfcolor import PREDEFINED_COLORSPACE
+from pdfminer.pdfexceptions import PDFValueError
+from pdfminer.pdfinterp import PDFGraphicState, PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
 from tests.helpers import absolute_sample_path
 
 
@@ -290,6 +312,132 @@ class TestColorSpace:
                     assert len(color) == 4
 
 
+def process_pages(path, device_class, glyph_buffer=False, **kwargs):
+    rsrcmgr = PDFResourceManager()
+    if device_class is PDFPageAggregator:
+        device = device_class(rsrcmgr, **kwargs)
+    else:
+        outfp = io.BytesIO()
+        device = device_class(rsrcmgr, outfp, **kwargs)
+    device.glyph_buffer = glyph_buffer
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    pages = []
+    with open(absolute_sample_path(path), "rb") as fp:
+        for page in PDFPage.get_pages(fp):
+            interpreter.process_page(page)
+            if device_class is PDFPageAggregator:
+                pages.append(device.get_result())
+    return pages if device_class is PDFPageAggregator else outfp.getvalue()
+
+
+class TestGlyphBuffer:
+    @pytest.mark.parametrize(
+        "laparams",
+        [
+            None,
+            LAParams(),
+            LAParams(detect_vertical=True, all_texts=True),
+            LAParams(boxes_flow=None, word_margin=0),
+        ],
+    )
+    @pytest.mark.parametrize("path", ["simple1.pdf", "simple3.pdf", "nonfree/dmca.pdf"])
+    def test_same_output(self, path, laparams):
+        for device_class in (TextConverter, XMLConverter):
+            expected = process_pages(path, device_class, laparams=laparams)
+            output = process_pages(
+                path,
+                device_class,
+                glyph_buffer=True,
+                laparams=laparams,
+            )
+            assert output == expected
+
+    def test_lines_create_chars_on_demand(self):
+        path = "simple3.pdf"
+        laparams = LAParams(detect_vertical=True)
+        expected = process_pages(path, PDFPageAggregator, laparams=laparams)
+        pages = process_pages(
+            path,
+            PDFPageAggregator,
+            laparams=laparams,
+            glyph_buffer=True,
+        )
+        lines = [line for box in pages[0] for line in box]
+        assert all(isinstance(line, LTGlyphLine) for line in lines)
+        assert all(line.glyphs is not None for line in lines)
+        assert [line.get_text() for line in lines] == [
+            line.get_text() for box in expected[0] for line in box
+        ]
+        assert all(line.glyphs is not None for line in lines)
+
+        chars = list(get_chars(pages[0]))
+        expected_chars = list(get_chars(expected[0]))
+        assert all(line.glyphs is None for line in lines)
+        assert [
+            (c.get_text(), c.bbox, c.matrix, c.fontname, c.size, c.adv, c.upright)
+            for c in chars
+        ] == [
+            (c.get_text(), c.bbox, c.matrix, c.fontname, c.size, c.adv, c.upright)
+            for c in expected_chars
+        ]
+
+    def test_columns(self):
+        style = LTCharStyle.get(
+            "Font",
+            PREDEFINED_COLORSPACE["DeviceGray"],
+            PDFGraphicState(),
+        )
+        glyphs = GlyphBuffer()
+        matrix = (10, 0, 0, 10, 1, 2)
+        glyphs.add(matrix, style, "A", 65, 7.0, True, (1, 2, 8, 12), 10)
+        glyphs.add(matrix, style, "fi", 2, 5.5, False, (8, 2, 13.5, 12), 10)
+        assert len(glyphs) == 2
+        assert list(glyphs.column("x1")) == [8, 13.5]
+        assert list(glyphs.column("adv", 1)) == [5.5]
+        assert list(glyphs.column("cid")) == [65, 2]
+        assert list(glyphs.column("upright")) == [1, 0]
+        assert glyphs.styles == [style]
+        char = glyphs.get_char(1)
+        assert isinstance(char, LTChar)
+        assert char.get_text() == "fi"
+        assert char.bbox == (8, 2, 13.5, 12)
+        assert (char.width, char.height, char.size) == (5.5, 10, 10)
+        assert char.fontname == "Font"
+        assert char.matrix is matrix
+        assert char.upright is False
+
+
+class TestLazyImages:
+    def get_images(self, **kwargs):
+        pages = process_pages("nonfree/dmca.pdf", PDFPageAggregator, **kwargs)
+
+        def walk(item):
+            if isinstance(item, LTImage):
+                yield item
+            elif isinstance(item, LTContainer):
+                for child in item:
+                    yield from walk(child)
+
+        return list(walk(pages[0]))
+
+    def test_decoded_on_demand(self):
+        (image,) = self.get_images()
+        assert (image.objid, image.filters) == (88, ["LZWDecode"])
+        assert image.stream.data is None
+        (width, height) = image.srcsize
+        assert len(image.get_data()) == (width * image.bits + 7) // 8 * height
+        assert b"".join(image.iter_data()) == image.get_data()
+        # the decoded data is not kept.
+        assert image.stream.data is None
+
+    def test_drop_streams(self):
+        (image,) = self.get_images(keep_image_streams=False)
+        assert image.stream is None
+        assert image.filters == ["LZWDecode"]
+        with pytest.raises(PDFValueError):
+            image.get_data()
+
+
 class TestBinaryDetector:
     def test_stringio(self):
         assert not PDFConverter._is_binary_stream(io.StringIO())
@@ -1,7 +1,12 @@
+import asyncio
+import tempfile
 import unittest
+from io import BytesIO
 
-from pdfminer.high_level import extract_pages, extract_text
-from pdfminer.layout import LAParams, LTTextContainer
+from benchmarks.corpus import PDFWriter
+from pdfminer.high_level import aextract_pages, extract_pages, extract_text, iter_text
+from pdfminer.image import ImageWriter
+from pdfminer.layout import LAParams, LTContainer, LTImage, LTTextContainer
 from tests.helpers import absolute_sample_path
 
 
@@ -153,6 +158,20 @@ class TestExtractText(unittest.TestCase):
         s = run_with_file(test_file)
         self.assertEqual(s.strip(), test_strings[test_file])
 
+    def test_iter_text(self):
+        path = absolute_sample_path("nonfree/dmca.pdf")
+        pages = list(iter_text(path))
+        self.assertEqual(len(pages), 18)
+        self.assertTrue(all(page.endswith("\f") for page in pages))
+        self.assertEqual("".join(pages), extract_text(path))
+
+    def test_workers(self):
+        path = absolute_sample_path("nonfree/dmca.pdf")
+        self.assertEqual(extract_text(path, workers=2), extract_text(path))
+        with open(path, "rb") as in_file:
+            s = extract_text(in_file, page_numbers=[1], workers=2)
+        self.assertEqual(s, extract_text(path, page_numbers=[1]))
+
 
 class TestExtractPages(unittest.TestCase):
     def _get_test_file_path(self):
@@ -191,6 +210,135 @@ class TestExtractPages(unittest.TestCase):
         self.assertEqual(len(elements), 1)
         self.assertEqual(elements[0].get_text(), "Text1\nText2\nText3\n")
 
+    def test_workers(self):
+        path = absolute_sample_path("nonfree/dmca.pdf")
+
+        def texts(pages):
+            return [
+                (
+                    page.pageid,
+                    [e.get_text() for e in page if isinstance(e, LTTextContainer)],
+                )
+                for page in pages
+            ]
+
+        expected = texts(extract_pages(path))
+        self.assertEqual(texts(extract_pages(path, workers=3)), expected)
+
+    def test_workers_bad_count(self):
+        writer = PDFWriter()
+        root = writer.reserve()
+        tree = writer.reserve()
+        font = writer.add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        kids = []
+        for i in range(4):
+            contents = writer.add_stream(b"BT /F1 12 Tf 72 720 Td (Page %d) Tj ET" % i)
+            kids.append(
+                writer.add(
+                    b"<< /Type /Page /Parent %d 0 R /Contents %d 0 R >>"
+                    % (tree, contents)
+                )
+            )
+        # more pages than there are kids.
+        writer.set(
+            tree,
+            b"<< /Type /Pages /Count 6 /MediaBox [0 0 612 792]"
+            b" /Resources << /Font << /F1 %d 0 R >> >> /Kids [%s] >>"
+            % (font, b" ".join(b"%d 0 R" % kid for kid in kids)),
+        )
+        writer.set(root, b"<< /Type /Catalog /Pages %d 0 R >>" % tree)
+        data = writer.write(root)
+        expected = extract_text(BytesIO(data))
+        self.assertEqual(expected.count("Page"), 4)
+        self.assertEqual(extract_text(BytesIO(data), workers=2), expected)
+
+    def test_workers_images(self):
+        def images(item):
+            if isinstance(item, LTImage):
+                yield item
+            elif isinstance(item, LTContainer):
+                for child in item:
+                    yield from images(child)
+
+        for sample in (
+            "contrib/issue-1008-inline-ascii85.pdf",
+            "contrib/pdf-with-jbig2.pdf",
+        ):
+            path = absolute_sample_path(sample)
+            expected = [
+                (image.filters, image.srcsize, image.get_data())
+                for page in extract_pages(path)
+                for image in images(page)
+            ]
+            with tempfile.TemporaryDirectory() as outdir:
+                writer = ImageWriter(outdir)
+                result = []
+                for page in extract_pages(path, workers=2):
+                    for image in images(page):
+                        result.append(
+                            (image.filters, image.srcsize, image.get_data())
+                        )
+                        # the filter parameters do not need the document.
+                        writer.export_image(image)
+            self.assertEqual(result, expected)
+
+    def test_aextract_pages(self):
+        path = absolute_sample_path("nonfree/dmca.pdf")
+        with open(path, "rb") as fp:
+            data = fp.read()
+
+        async def read_range(offset, length):
+            await asyncio.sleep(0)
+            return data[offset : offset + length]
+
+        async def collect(**kwargs):
+            return [
+                (
+                    page.pageid,
+                    [e.get_text() for e in page if isinstance(e, LTTextContainer)],
+                )
+                async for page in aextract_pages(read_range, len(data), **kwargs)
+            ]
+
+        expected = [
+            (
+                page.pageid,
+                [e.get_text() for e in page if isinstance(e, LTTextContainer)],
+            )
+            for page in extract_pages(path)
+        ]
+        self.assertEqual(asyncio.run(collect()), expected)
+        self.assertEqual(
+            asyncio.run(collect(page_numbers=[5], maxpages=10)),
+            [(1, expected[5][1])],
+        )
+
+    def test_aextract_pages_cancel(self):
+        path = absolute_sample_path("nonfree/dmca.pdf")
+        with open(path, "rb") as fp:
+            data = fp.read()
+
+        async def read_range(offset, length):
+            return data[offset : offset + length]
+
+        async def main():
+            pages = []
+
+            async def consume():
+                async for page in aextract_pages(read_range, len(data)):
+                    pages.append(page)
+                    await asyncio.sleep(10)
+
+            task = asyncio.ensure_future(consume())
+            while not pages:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return pages
+
+        self.assertEqual(len(asyncio.run(main())), 1)
+
     def test_no_boxes_flow(self):
         pages = list(
             extract_pages(
@@ -1,14 +1,27 @@
+import copy
+import pickle
+import random
 import unittest
+import weakref
+from importlib.util import find_spec
+from unittest import mock
 
+from pdfminer import layout
 from pdfminer.high_level import extract_pages
 from pdfminer.layout import (
     LAParams,
+    LTChar,
+    LTCharStyle,
+    LTComponent,
     LTLayoutContainer,
     LTTextBoxHorizontal,
     LTTextBoxVertical,
+    LTTextGroup,
     LTTextLineHorizontal,
     LTTextLineVertical,
 )
+from pdfminer.pdfcolor import PREDEFINED_COLORSPACE
+from pdfminer.pdfinterp import PDFGraphicState
 from pdfminer.utils import Plane
 from tests.helpers import absolute_sample_path
 
@@ -32,6 +45,179 @@ class TestGroupTextLines(unittest.TestCase):
         self.assertEqual(len(textboxes), 2)
 
 
+def pairwise_group_objects(laparams, objs):
+    """group_objects() as it compared the characters pair by pair."""
+    line = None
+    for obj0, obj1 in zip(objs, objs[1:]):
+        halign = (
+            obj0.is_voverlap(obj1)
+            and min(obj0.height, obj1.height) * laparams.line_overlap
+            < obj0.voverlap(obj1)
+            and obj0.hdistance(obj1)
+            < max(obj0.width, obj1.width) * laparams.char_margin
+        )
+        valign = (
+            laparams.detect_vertical
+            and obj0.is_hoverlap(obj1)
+            and min(obj0.width, obj1.width) * laparams.line_overlap
+            < obj0.hoverlap(obj1)
+            and obj0.vdistance(obj1)
+            < max(obj0.height, obj1.height) * laparams.char_margin
+        )
+        if (halign and line and line[0] is LTTextLineHorizontal) or (
+            valign and line and line[0] is LTTextLineVertical
+        ):
+            line[1].append(obj1)
+        elif line is not None:
+            yield line
+            line = None
+        elif valign and not halign:
+            line = (LTTextLineVertical, [obj0, obj1])
+        elif halign and not valign:
+            line = (LTTextLineHorizontal, [obj0, obj1])
+        else:
+            yield (LTTextLineHorizontal, [obj0])
+    yield line or (LTTextLineHorizontal, [objs[-1]])
+
+
+class TestGroupObjects(unittest.TestCase):
+    def get_objs(self, n):
+        rng = random.Random(n)
+        objs = []
+        (x, y) = (0.0, 0.0)
+        for _ in range(n):
+            # Mostly runs of horizontal or vertical text, with jumps.
+            step = rng.choice([(1, 0), (1, 0), (0, -1), (5, 3)])
+            x += step[0] * rng.uniform(3, 9)
+            y += step[1] * rng.uniform(3, 9)
+            (w, h) = (rng.choice([0, 4, 6, 10]), rng.choice([0, 5, 10, 12]))
+            objs.append(LTComponent((x, y, x + w, y + h)))
+        return objs
+
+    def check(self, objs):
+        container = LTLayoutContainer((0, 0, 100, 100))
+        for laparams in (
+            LAParams(),
+            LAParams(detect_vertical=True),
+            LAParams(detect_vertical=True, line_overlap=0, char_margin=10),
+        ):
+            lines = list(container.group_objects(laparams, objs))
+            expected = list(pairwise_group_objects(laparams, objs))
+            self.assertEqual(
+                [(type(line), list(line)) for line in lines],
+                expected,
+            )
+
+    def test_same_lines(self):
+        for n in (1, 2, 3, 50, 500):
+            self.check(self.get_objs(n))
+
+    def test_same_lines_without_numpy(self):
+        with mock.patch.object(layout, "numpy", None):
+            self.test_same_lines()
+
+    @unittest.skipIf(find_spec("numpy") is None, "NumPy is not installed")
+    def test_same_lines_with_numpy(self):
+        saved = layout.NUMPY_MIN_CHARS
+        layout.NUMPY_MIN_CHARS = 1
+        try:
+            self.test_same_lines()
+        finally:
+            layout.NUMPY_MIN_CHARS = saved
+
+
+class TestGroupTextBoxes(unittest.TestCase):
+    def test_nearest_engine_matches_all_pairs(self):
+        """Above the threshold, group_textboxes() should build exactly the
+        same hierarchy as with the heap of all pairs, including the boxes
+        outside of the container and the ties between equal distances.
+        """
+        rng = random.Random(0)
+        boxes = []
+        for i in range(120):
+            box = LTTextBoxVertical() if i % 10 == 0 else LTTextBoxHorizontal()
+            x0 = rng.randrange(-2, 12) * 10
+            y0 = rng.uniform(-20, 100)
+            box.set_bbox((x0, y0, x0 + rng.choice([5, 10, 30]), y0 + 5))
+            boxes.append(box)
+        layout = LTLayoutContainer((0, 0, 100, 100))
+
+        def shape(obj):
+            if isinstance(obj, LTTextGroup):
+                return (type(obj), [shape(child) for child in obj])
+            return boxes.index(obj)
+
+        self.assertLess(LTLayoutContainer.GROUP_TEXTBOXES_THRESHOLD, len(boxes))
+        nearest = layout.group_textboxes(LAParams(), boxes)
+        saved = LTLayoutContainer.GROUP_TEXTBOXES_THRESHOLD
+        LTLayoutContainer.GROUP_TEXTBOXES_THRESHOLD = len(boxes)
+        try:
+            pairs = layout.group_textboxes(LAParams(), boxes)
+        finally:
+            LTLayoutContainer.GROUP_TEXTBOXES_THRESHOLD = saved
+        self.assertEqual(len(nearest), 1)
+        self.assertEqual(
+            [shape(group) for group in nearest],
+            [shape(group) for group in pairs],
+        )
+
+
+def get_chars(item):
+    if isinstance(item, LTChar):
+        yield item
+    elif hasattr(item, "__iter__"):
+        for child in item:
+            yield from get_chars(child)
+
+
+class TestLTChar(unittest.TestCase):
+    def test_shared_style(self):
+        page = next(extract_pages(absolute_sample_path("simple1.pdf")))
+        chars = list(get_chars(page))
+        self.assertTrue(chars)
+        styles = {id(char.style) for char in chars}
+        self.assertLess(len(styles), len(chars))
+        for char in chars:
+            self.assertEqual(char.fontname, char.style.fontname)
+            self.assertIs(char.graphicstate, char.style.graphicstate)
+
+    def test_own_attributes(self):
+        page = next(extract_pages(absolute_sample_path("simple1.pdf")))
+        char = next(get_chars(page))
+        self.assertNotIn("matrix", vars(char))
+        char.tag = "header"
+        self.assertEqual(vars(char), {"tag": "header"})
+        self.assertIs(weakref.ref(char)(), char)
+        copied = pickle.loads(pickle.dumps(char))
+        self.assertEqual(copied.tag, "header")
+        self.assertEqual(copied.matrix, char.matrix)
+
+    def test_style_get(self):
+        ncs = PREDEFINED_COLORSPACE["DeviceGray"]
+        state = PDFGraphicState()
+        style = LTCharStyle.get("Font", ncs, state)
+        self.assertIs(LTCharStyle.get("Font", ncs, copy.copy(state)), style)
+        state2 = copy.copy(state)
+        state2.dash = ([3, 1], 0)
+        self.assertIsNot(LTCharStyle.get("Font", ncs, state2), style)
+        self.assertIs(LTCharStyle.get("Font", ncs, copy.copy(state2)).ncs, ncs)
+        self.assertIsNot(LTCharStyle.get("Other", ncs, state), style)
+
+    def test_setters_and_pickle(self):
+        page = next(extract_pages(absolute_sample_path("simple1.pdf")))
+        char = next(get_chars(page))
+        style = char.style
+        char.fontname = "Renamed"
+        self.assertEqual(char.fontname, "Renamed")
+        self.assertNotEqual(style.fontname, "Renamed")
+        self.assertIsNot(char.style, style)
+        copied = pickle.loads(pickle.dumps(char))
+        self.assertEqual(copied.get_text(), char.get_text())
+        self.assertEqual(copied.fontname, "Renamed")
+        self.assertEqual(copied.bbox, char.bbox)
+        self.assertEqual(copied.size, char.size)
+
+
 class TestFindNeigbors(unittest.TestCase):
     def test_find_neighbors_horizontal(self):
         laparams = LAParams()
@@ -1,8 +1,15 @@
 import itertools
+import pickle
 
 import pytest
 
-from pdfminer.pdfdocument import PDFDocument, PDFNoPageLabels
+from pdfminer.pdfdocument import (
+    PDFDocument,
+    PDFNoPageLabels,
+    PDFObjectCache,
+    PDFXRefCache,
+    PDFXRefFallback,
+)
 from pdfminer.pdfexceptions import PDFObjectNotFound
 from pdfminer.pdfpage import PDFPage
 from pdfminer.pdfparser import PDFParser
@@ -18,6 +25,103 @@ class TestPdfDocument:
             with pytest.raises(PDFObjectNotFound):
                 doc.getobj(0)
 
+    def test_mmap_parser(self):
+        path = absolute_sample_path("simple1.pdf")
+        with open(path, "rb") as fp:
+            doc = PDFDocument(PDFParser(fp))
+            expected = [doc.getobj(objid) for objid in (1, 2, 3)]
+        with open(path, "rb") as fp:
+            doc = PDFDocument(PDFParser(fp, use_mmap=True))
+            objs = [doc.getobj(objid) for objid in (1, 2, 3)]
+        assert repr(objs) == repr(expected)
+
+    def test_xref_cache(self, tmp_path, monkeypatch):
+        path = absolute_sample_path("simple1.pdf")  # needs the fallback scan
+        cache = PDFXRefCache(str(tmp_path))
+        with open(path, "rb") as fp:
+            doc = PDFDocument(PDFParser(fp), xref_cache=cache)
+            expected = [doc.getobj(objid) for objid in (1, 2, 3)]
+        assert len(list(tmp_path.iterdir())) == 1
+
+        def load(self, parser):
+            raise AssertionError("the xref cache was not used")
+
+        monkeypatch.setattr(PDFXRefFallback, "load", load)
+        with open(path, "rb") as fp:
+            doc = PDFDocument(PDFParser(fp), xref_cache=cache)
+            objs = [doc.getobj(objid) for objid in (1, 2, 3)]
+            assert doc.catalog["Type"].name == "Catalog"
+        assert repr(objs) == repr(expected)
+
+    def test_xref_cache_not_writable(self, tmp_path, monkeypatch):
+        path = absolute_sample_path("simple1.pdf")
+        # a file where the directory should be.
+        (tmp_path / "file").write_bytes(b"")
+        cache = PDFXRefCache(str(tmp_path / "file"))
+        with open(path, "rb") as fp:
+            doc = PDFDocument(PDFParser(fp), xref_cache=cache)
+            assert doc.catalog["Type"].name == "Catalog"
+
+        def dump(obj, fp, protocol):
+            raise pickle.PicklingError("unpicklable")
+
+        monkeypatch.setattr(pickle, "dump", dump)
+        cache = PDFXRefCache(str(tmp_path / "cache"))
+        with open(path, "rb") as fp:
+            doc = PDFDocument(PDFParser(fp), xref_cache=cache)
+            assert doc.catalog["Type"].name == "Catalog"
+        assert list((tmp_path / "cache").iterdir()) == []
+
+    def test_object_cache_lru(self):
+        cache = PDFObjectCache(max_entries=2)
+        cache.put(1, ("a", 0))
+        cache.put(2, ("b", 0))
+        assert cache.get(1) == ("a", 0)
+        cache.put(3, ("c", 0))
+        assert 2 not in cache
+        assert cache.get(2) is None
+        assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 1)
+
+        cache = PDFObjectCache(max_bytes=1000)
+        cache.put(1, (b"x" * 600, 0))
+        cache.put(2, (b"y" * 600, 0))
+        assert 1 not in cache
+        assert 2 in cache
+        assert cache.nbytes <= 1000
+
+    def test_object_cache_sizes_on_put(self, monkeypatch):
+        sizes = []
+        estimate_size = PDFObjectCache.estimate_size.__func__
+
+        def counting(cls, obj):
+            sizes.append(obj)
+            return estimate_size(cls, obj)
+
+        monkeypatch.setattr(PDFObjectCache, "estimate_size", classmethod(counting))
+        PDFObjectCache().put(1, (b"x" * 600, 0))
+        assert sizes == []
+
+        cache = PDFObjectCache(max_bytes=1000)
+        cache.put(1, (b"x" * 600, 0), owned=b"y" * 10)
+        assert cache.nbytes < 600
+        del sizes[:]
+        assert cache.get(1) == (b"x" * 600, 0)
+        assert sizes == []
+
+    def test_bounded_object_cache(self):
+        path = absolute_sample_path("nonfree/dmca.pdf")
+        with open(path, "rb") as fp:
+            doc = PDFDocument(PDFParser(fp))
+            expected = [repr(page.attrs) for page in PDFPage.create_pages(doc)]
+        cache = PDFObjectCache(max_entries=4)
+        with open(path, "rb") as fp:
+            doc = PDFDocument(PDFParser(fp), cache=cache)
+            pages = [repr(page.attrs) for page in PDFPage.create_pages(doc)]
+        assert pages == expected
+        assert len(cache) <= 4
+        assert cache.evictions > 0
+        assert cache.hits + cache.misses > 0
+
     def test_encrypted_no_id(self):
         # Some documents may be encrypted but not have an /ID key in
         # their trailer. Tests
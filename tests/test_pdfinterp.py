@@ -0,0 +1,250 @@
+import types
+
+import pytest
+
+from pdfminer.pdfdevice import PDFDevice
+from pdfminer.pdfdocument import PDFObjectCache
+from pdfminer.pdfinterp import (
+    PDFContentParser,
+    PDFPageInterpreter,
+    PDFResourceManager,
+)
+from pdfminer.pdftypes import PDFStream
+from pdfminer.psparser import KWD, LIT
+
+
+class TestOperatorDispatch:
+    def test_subclass_override(self):
+        calls = []
+
+        class MyInterpreter(PDFPageInterpreter):
+            def do_Tw(self, wordspace):
+                calls.append(wordspace)
+
+        interpreter = MyInterpreter(PDFResourceManager(), PDFDevice(None))
+        interpreter.init_resources({})
+        interpreter.init_state((1, 0, 0, 1, 0, 0))
+        interpreter.execute([PDFStream({}, b"BT 3 Tw 2 Tc ET")])
+        assert calls == [3]
+        assert interpreter.textstate.charspace == 2
+
+        handler = MyInterpreter.get_operators()[KWD(b"Tw")]
+        assert handler == (MyInterpreter.do_Tw, 1)
+        handler = MyInterpreter.get_operators()[KWD(b"Tc")]
+        assert handler == (PDFPageInterpreter.do_Tc, 1)
+        handler = PDFPageInterpreter.lookup_operator(KWD(b"Tw"))
+        assert handler == (PDFPageInterpreter.do_Tw, 1)
+
+    def test_unknown_operator(self):
+        interpreter = PDFPageInterpreter(PDFResourceManager(), PDFDevice(None))
+        interpreter.init_resources({})
+        interpreter.init_state((1, 0, 0, 1, 0, 0))
+        interpreter.execute([PDFStream({}, b"1 2 foo")])
+        assert KWD(b"foo") not in PDFPageInterpreter.get_operators()
+
+    def test_instance_override(self):
+        calls = []
+
+        def do_Tw(self, wordspace):
+            calls.append((self, wordspace))
+
+        interpreter = PDFPageInterpreter(PDFResourceManager(), PDFDevice(None))
+        interpreter.init_resources({})
+        interpreter.init_state((1, 0, 0, 1, 0, 0))
+        interpreter.execute([PDFStream({}, b"BT 3 Tw ET")])
+        interpreter.do_Tw = types.MethodType(do_Tw, interpreter)
+        interpreter.execute([PDFStream({}, b"BT 4 Tw 2 Tc ET")])
+        assert calls == [(interpreter, 4)]
+        assert interpreter.textstate.wordspace == 3
+        assert interpreter.textstate.charspace == 2
+        # other instances are not affected.
+        other = PDFPageInterpreter(PDFResourceManager(), PDFDevice(None))
+        other.init_resources({})
+        other.init_state((1, 0, 0, 1, 0, 0))
+        other.execute([PDFStream({}, b"BT 5 Tw ET")])
+        assert other.textstate.wordspace == 5
+        assert len(calls) == 1
+
+
+class TestFormCache:
+    def get_form(self, content, objid=1):
+        attrs = {
+            "Subtype": LIT("Form"),
+            "BBox": [0, 0, 10, 10],
+            "Resources": {"ProcSet": [LIT("PDF")]},
+        }
+        form = PDFStream(attrs, content)
+        form.objid = objid
+        return form
+
+    def get_interpreter(self, rsrcmgr, calls):
+        class MyInterpreter(PDFPageInterpreter):
+            def execute(self, streams, record=None):
+                calls.append("parse")
+                super().execute(streams, record=record)
+
+            def do_Tw(self, wordspace):
+                calls.append(wordspace)
+
+        interpreter = MyInterpreter(rsrcmgr, PDFDevice(None))
+        interpreter.init_resources({})
+        interpreter.init_state((1, 0, 0, 1, 0, 0))
+        return interpreter
+
+    def test_replay(self):
+        rsrcmgr = PDFResourceManager()
+        calls = []
+        interpreter = self.get_interpreter(rsrcmgr, calls)
+        interpreter.xobjmap = {"F": self.get_form(b"BT 3 Tw ET")}
+        for _ in range(3):
+            interpreter.do_Do(LIT("F"))
+        assert calls == ["parse", 3, 3, 3]
+        assert rsrcmgr.form_cache.hits == 2
+
+    def test_hit_does_not_size_record(self, monkeypatch):
+        sized = []
+        estimate_size = PDFObjectCache.estimate_size.__func__
+
+        def counting(cls, obj):
+            sized.append(obj)
+            return estimate_size(cls, obj)
+
+        monkeypatch.setattr(PDFObjectCache, "estimate_size", classmethod(counting))
+        rsrcmgr = PDFResourceManager()
+        calls = []
+        interpreter = self.get_interpreter(rsrcmgr, calls)
+        form = self.get_form(b"BT 3 Tw ET")
+        interpreter.xobjmap = {"F": form}
+        interpreter.do_Do(LIT("F"))
+        # only the record is sized, not the stream.
+        assert sized[0] == [KWD(b"BT"), 3, KWD(b"Tw"), KWD(b"ET")]
+        assert all(obj is not form for obj in sized)
+        del sized[:]
+        interpreter.do_Do(LIT("F"))
+        interpreter.do_Do(LIT("F"))
+        assert sized == []
+        assert calls == ["parse", 3, 3, 3]
+
+    def test_same_objid_other_stream(self):
+        rsrcmgr = PDFResourceManager()
+        calls = []
+        interpreter = self.get_interpreter(rsrcmgr, calls)
+        interpreter.xobjmap = {
+            "F": self.get_form(b"BT 3 Tw ET"),
+            "G": self.get_form(b"BT 4 Tw ET"),
+        }
+        for name in ("F", "G", "F"):
+            interpreter.do_Do(LIT(name))
+        assert calls == ["parse", 3, "parse", 4, "parse", 3]
+
+    def test_without_caching(self):
+        rsrcmgr = PDFResourceManager(caching=False)
+        assert rsrcmgr.form_cache is None
+        calls = []
+        interpreter = self.get_interpreter(rsrcmgr, calls)
+        interpreter.xobjmap = {"F": self.get_form(b"BT 3 Tw ET")}
+        interpreter.do_Do(LIT("F"))
+        interpreter.do_Do(LIT("F"))
+        assert calls == ["parse", 3, "parse", 3]
+
+
+class TestContentCache:
+    @staticmethod
+    def get_stream(objid, data):
+        strm = PDFStream({}, data)
+        strm.set_objid(objid, 0)
+        return strm
+
+    @staticmethod
+    def get_interpreter(rsrcmgr, parsed, calls, fast_tokenizer=False):
+        class MyInterpreter(PDFPageInterpreter):
+            def _next_objects(self, parser):
+                parsed.append(parser)
+                return super()._next_objects(parser)
+
+            def do_Tw(self, wordspace):
+                calls.append(wordspace)
+
+        interpreter = MyInterpreter(rsrcmgr, PDFDevice(None))
+        interpreter.fast_tokenizer = fast_tokenizer
+        return interpreter
+
+    def test_shared_stream(self):
+        parsed = []
+        calls = []
+        rsrcmgr = PDFResourceManager()
+        interpreter = self.get_interpreter(rsrcmgr, parsed, calls)
+        header = self.get_stream(1, b"BT 3 Tw ET\n")
+        for i in range(4):
+            body = self.get_stream(10 + i, b"BT %d Tw ET\n" % (10 + i))
+            interpreter.render_contents({}, [header, body])
+        # the header is seen, then parsed and kept, then replayed.
+        assert len(parsed) == 2 + 4
+        assert calls == [3, 10, 3, 11, 3, 12, 3, 13]
+        assert rsrcmgr.content_cache.hits == 2 + 1
+
+    @pytest.mark.parametrize("fast_tokenizer", [False, True])
+    def test_tokenized_once(self, fast_tokenizer, monkeypatch):
+        tokens = []
+        nexttoken = PDFContentParser.nexttoken
+
+        def counting(parser):
+            tokens.append(parser)
+            return nexttoken(parser)
+
+        monkeypatch.setattr(PDFContentParser, "nexttoken", counting)
+        # no whitespace at the end of the streams.
+        header = self.get_stream(1, b"BT 3 Tw ET")
+        body = self.get_stream(2, b"BT 4 Tw ET")
+        interpreter = self.get_interpreter(
+            PDFResourceManager(caching=False), [], [], fast_tokenizer
+        )
+        interpreter.render_contents({}, [header, body])
+        expected = len(tokens)
+        calls = []
+        interpreter = self.get_interpreter(
+            PDFResourceManager(), [], calls, fast_tokenizer
+        )
+        for _ in range(3):
+            del tokens[:]
+            interpreter.render_contents({}, [header, body])
+            assert len(tokens) == expected
+        assert calls == [3, 4] * 3
+
+    def test_same_objid_other_stream(self):
+        parsed = []
+        calls = []
+        interpreter = self.get_interpreter(PDFResourceManager(), parsed, calls)
+        for data in (b"BT 3 Tw ET\n", b"BT 4 Tw ET\n", b"BT 5 Tw ET\n"):
+            interpreter.render_contents({}, [self.get_stream(1, data)])
+        assert calls == [3, 4, 5]
+
+    @pytest.mark.parametrize("fast_tokenizer", [False, True])
+    @pytest.mark.parametrize(
+        "parts",
+        [
+            (b"BT 1", b"2 Tw ET\n"),
+            (b"BT (a\n", b") 12 Tw ET\n"),
+            (b"BT [1\n", b"2] 0 d 12 Tw ET\n"),
+        ],
+    )
+    def test_split_between_streams(self, parts, fast_tokenizer):
+        streams = [self.get_stream(1, parts[0]), self.get_stream(2, parts[1])]
+        expected = []
+        interpreter = self.get_interpreter(
+            PDFResourceManager(caching=False), [], expected, fast_tokenizer
+        )
+        interpreter.render_contents({}, streams)
+        calls = []
+        interpreter = self.get_interpreter(
+            PDFResourceManager(), [], calls, fast_tokenizer
+        )
+        for _ in range(3):
+            interpreter.render_contents({}, streams)
+        # parsed as one content, as without caching.
+        assert expected == [12]
+        assert calls == expected * 3
+
+    def test_without_caching(self):
+        rsrcmgr = PDFResourceManager(caching=False)
+        assert rsrcmgr.content_cache is None
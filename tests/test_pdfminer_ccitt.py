@@ -1,4 +1,101 @@
-from pdfminer.ccitt import CCITTFaxDecoder, CCITTG4Parser
+import random
+
+from pdfminer.ccitt import (
+    CCITTDecoder,
+    CCITTFaxDecoder,
+    CCITTG4Parser,
+    _get_codes,
+    ccittfaxdecode,
+)
+
+WHITE_CODES = dict(_get_codes(CCITTG4Parser.WHITE))
+BLACK_CODES = dict(_get_codes(CCITTG4Parser.BLACK))
+MODE_CODES = dict(_get_codes(CCITTG4Parser.MODE))
+EOL = "000000000001"
+
+
+def get_changes(row):
+    changes = [x for x in range(1, len(row)) if row[x] != row[x - 1]]
+    return [0] + changes if row[0] else changes
+
+
+def encode_run(run, color):
+    codes = BLACK_CODES if color else WHITE_CODES
+    bits = ""
+    while 2560 < run:
+        bits += codes[2560]
+        run -= 2560
+    if 64 <= run:
+        bits += codes[run // 64 * 64]
+    return bits + codes[run % 64]
+
+
+def encode_2d(changes, refline, width):
+    (changes, refline) = (changes + [width] * 2, refline + [width] * 3)
+    bits = ""
+    (a0, color) = (-1, 0)
+    while a0 < width:
+        j = 0
+        while refline[j] <= a0 or j % 2 != color:
+            j += 1
+        k = 0
+        while changes[k] <= a0:
+            k += 1
+        (b1, b2, a1, a2) = (refline[j], refline[j + 1], changes[k], changes[k + 1])
+        if b2 < a1:
+            bits += MODE_CODES["p"]
+            a0 = b2
+        elif abs(a1 - b1) <= 3:
+            bits += MODE_CODES[a1 - b1]
+            (a0, color) = (a1, 1 - color)
+        else:
+            bits += MODE_CODES["h"] + encode_run(a1 - max(a0, 0), color)
+            bits += encode_run(a2 - a1, 1 - color)
+            a0 = a2
+    return bits
+
+
+def ccittencode(rows, k=-1, eol=False, bytealign=False):
+    """CCITT fax data of rows of 0 (white) and 1 (black) pixels, ending with
+    an end of block.
+    """
+    width = len(rows[0])
+    bits = ""
+    refline = []
+    for y, row in enumerate(rows + [None]):
+        if bytealign:
+            # the fill bits go before the end of line.
+            bits += "0" * ((-len(bits) - (12 if eol else 0)) % 8)
+        if row is None:
+            break
+        if eol:
+            bits += EOL
+        two_dimensional = k < 0 or (0 < k and y % k != 0)
+        if 0 < k:
+            bits += "0" if two_dimensional else "1"
+        changes = get_changes(row)
+        if two_dimensional:
+            bits += encode_2d(changes, refline, width)
+        else:
+            runs = [0] + changes + [width]
+            for i in range(len(runs) - 1):
+                bits += encode_run(runs[i + 1] - runs[i], i % 2)
+        refline = changes
+    if k < 0:
+        bits += EOL * 2
+    else:
+        bits += (EOL + ("1" if 0 < k else "")) * 6
+    bits += "0" * (-len(bits) % 8)
+    return int(bits, 2).to_bytes(len(bits) // 8, "big")
+
+
+def pack(rows):
+    """The decoded data, with 1 bits for white."""
+    data = b""
+    for row in rows:
+        bits = "".join(str(1 - b) for b in row) + "0" * (-len(row) % 8)
+        data += int(bits, 2).to_bytes(len(bits) // 8, "big")
+    return data
 
 
 class TestCCITTG4Parser:
@@ -142,3 +239,75 @@ class TestCCITTFaxDecoder:
         decoder = CCITTFaxDecoder(5)
         decoder.output_line(0, b"0")
         assert decoder.close() == b"\x80"
+
+
+class TestCCITTDecoder:
+    def get_rows(self, seed, width, height):
+        rng = random.Random(seed)
+        rows = [[0] * width]
+        for _ in range(height):
+            row = list(rows[-1])
+            for _ in range(rng.randrange(6)):
+                x = rng.randrange(width)
+                n = rng.choice([1, 3, 40, width])
+                row[x : x + n] = [rng.randrange(2)] * len(row[x : x + n])
+            rows.append(row)
+        return rows[1:]
+
+    def decode(self, data, params, chunk_size):
+        decoder = CCITTDecoder(params)
+        chunks = [
+            decoder.decode(data[i : i + chunk_size])
+            for i in range(0, len(data), chunk_size)
+        ]
+        return b"".join(chunks) + decoder.decode(b"", final=True)
+
+    def test_modes(self):
+        for seed, width in enumerate((1, 7, 8, 30, 200, 3000)):
+            rows = self.get_rows(seed, width, 20)
+            for k, eol, bytealign in (
+                (-1, False, False),
+                (-1, False, True),
+                (0, False, False),
+                (0, True, True),
+                (3, True, False),
+                (3, False, True),
+            ):
+                data = ccittencode(rows, k, eol, bytealign)
+                params = {
+                    "K": k,
+                    "Columns": width,
+                    "EndOfLine": eol,
+                    "EncodedByteAlign": bytealign,
+                }
+                for chunk_size in (1, 5, len(data)):
+                    assert self.decode(data, params, chunk_size) == pack(rows)
+
+    def test_group4_parser(self):
+        rows = self.get_rows(10, 50, 30)
+        data = ccittencode(rows, bytealign=True)
+        parser = CCITTFaxDecoder(50, bytealign=True, reversed=True)
+        parser.feedbytes(data)
+        params = {"K": -1, "Columns": 50, "EncodedByteAlign": True, "BlackIs1": True}
+        assert ccittfaxdecode(data, params) == parser.close()
+
+    def test_rows(self):
+        rows = self.get_rows(11, 20, 5)
+        data = ccittencode(rows, 0)
+        params = {"K": 0, "Columns": 20, "Rows": 3, "EndOfBlock": False}
+        assert ccittfaxdecode(data, params) == pack(rows[:3])
+        # an incomplete line is dropped.
+        for n in range(len(data)):
+            decoded = ccittfaxdecode(data[:n], {"K": 0, "Columns": 20})
+            assert len(decoded) % 3 == 0
+            assert pack(rows).startswith(decoded)
+
+    def test_uncompressed(self):
+        # pixels 01, 00000 and 1, then pixels 001 and 0 before a black run.
+        for bits, width, row in (
+            ("0000001111" "01" "000001" "1", 8, [0, 1, 0, 0, 0, 0, 0, 1]),
+            ("0000001111" "001" "000000011" "1", 6, [0, 0, 1, 0, 1, 1]),
+        ):
+            bits += "0" * (-len(bits) % 8)
+            data = int(bits, 2).to_bytes(len(bits) // 8, "big")
+            assert ccittfaxdecode(data, {"K": -1, "Columns": width}) == pack([row])
@@ -1,11 +1,13 @@
 """Test of various compression/encoding modules (previously in doctests)"""
 
 import binascii
+import random
 
+from benchmarks.filters import lzwencode
 from pdfminer.arcfour import Arcfour
-from pdfminer.ascii85 import ascii85decode, asciihexdecode
-from pdfminer.lzw import lzwdecode
-from pdfminer.runlength import rldecode
+from pdfminer.ascii85 import ASCIIHexDecoder, ascii85decode, asciihexdecode
+from pdfminer.lzw import LZWDecoder, lzwdecode
+from pdfminer.runlength import RunLengthDecoder, rldecode
 
 
 def hex(b):
@@ -31,6 +33,16 @@ class TestAscii85:
         assert asciihexdecode(b"61 62 2e6364   657>") == b"ab.cdep"
         assert asciihexdecode(b"7>") == b"p"
 
+    def test_asciihexdecoder(self):
+        data = b"61 62 2e6364\n  657>ff"
+        for chunk_size in (1, 2, 3, 7):
+            decoder = ASCIIHexDecoder()
+            chunks = [
+                decoder.decode(data[i : i + chunk_size])
+                for i in range(0, len(data), chunk_size)
+            ]
+            assert b"".join(chunks) + decoder.decode(b"", final=True) == b"ab.cdep"
+
 
 class TestArcfour:
     def test(self):
@@ -49,7 +61,55 @@ class TestLzw:
             == b"\x2d\x2d\x2d\x2d\x2d\x41\x2d\x2d\x2d\x42"
         )
 
+    def get_data(self, seed, size):
+        rng = random.Random(seed)
+        words = [
+            bytes(rng.choices(b"abcdefgh", k=rng.randint(1, 6))) for _ in range(50)
+        ]
+        return b" ".join(rng.choices(words, k=size))
+
+    def test_long_codes(self):
+        data = self.get_data(0, 5000)
+        for early_change in (1, 0):
+            for table_size in (4096, 700):
+                encoded = lzwencode(data, early_change, table_size)
+                assert lzwdecode(encoded, early_change) == data
+
+    def test_chunks(self):
+        data = self.get_data(1, 3000)
+        encoded = lzwencode(data)
+        for chunk_size in (1, 2, 5, 1000):
+            decoder = LZWDecoder()
+            chunks = [
+                decoder.decode(encoded[i : i + chunk_size])
+                for i in range(0, len(encoded), chunk_size)
+            ]
+            assert b"".join(chunks) + decoder.decode(b"", final=True) == data
+
+    def test_end_of_data(self):
+        encoded = lzwencode(b"-----A---B")
+        assert lzwdecode(encoded + b"\xff\xff\xff") == b"-----A---B"
+        # a code that is not in the table stops decoding.
+        assert lzwdecode(b"\x80\x0b\x7f\xf0") == b"-"
+
 
 class TestRunlength:
     def test_rldecode(self):
         assert rldecode(b"\x05123456\xfa7\x04abcde\x80junk") == b"1234567777777abcde"
+
+    def test_chunks(self):
+        data = b"\x05123456\xfa7\x04abcde\x80junk"
+        for chunk_size in (1, 2, 5):
+            decoder = RunLengthDecoder()
+            chunks = [
+                decoder.decode(data[i : i + chunk_size])
+                for i in range(0, len(data), chunk_size)
+            ]
+            chunks.append(decoder.decode(b"", final=True))
+            assert b"".join(chunks) == b"1234567777777abcde"
+
+    def test_truncated(self):
+        # the last literal run is copied as far as it goes.
+        assert rldecode(b"\xfa7\x04ab") == b"7777777ab"
+        # a repeat run without its byte is dropped.
+        assert rldecode(b"\x01ab\xfa") == b"ab"
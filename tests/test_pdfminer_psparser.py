@@ -107,14 +107,14 @@ func/a/b{(c)do*}def
         (258, {"foo": b"bar"}),
     ]
 
-    def get_tokens(self, s):
+    def get_tokens(self, s, fast_tokenizer=False):
         from io import BytesIO
 
         class MyParser(PSBaseParser):
             def flush(self):
                 self.add_results(*self.popall())
 
-        parser = MyParser(BytesIO(s))
+        parser = MyParser(BytesIO(s), fast_tokenizer=fast_tokenizer)
         r = []
         try:
             while True:
@@ -123,14 +123,14 @@ func/a/b{(c)do*}def
             pass
         return r
 
-    def get_objects(self, s):
+    def get_objects(self, s, fast_tokenizer=False):
         from io import BytesIO
 
         class MyParser(PSStackParser):
             def flush(self):
                 self.add_results(*self.popall())
 
-        parser = MyParser(BytesIO(s))
+        parser = MyParser(BytesIO(s), fast_tokenizer=fast_tokenizer)
         r = []
         try:
             while True:
@@ -149,6 +149,35 @@ func/a/b{(c)do*}def
         logger.info(objs)
         assert objs == self.OBJS
 
+    def test_1_fast_tokenizer(self):
+        tokens = self.get_tokens(self.TESTDATA, fast_tokenizer=True)
+        assert tokens == self.TOKENS
+
+    def test_2_fast_tokenizer(self):
+        objs = self.get_objects(self.TESTDATA, fast_tokenizer=True)
+        assert objs == self.OBJS
+
+    def test_fast_tokenizer_small_buffer(self):
+        """Tokens that cross buffer boundaries are read completely."""
+        parser = PSBaseParser(BytesIO(self.TESTDATA), fast_tokenizer=True)
+        parser.BUFSIZ = 3
+        parser.seek(0)
+        tokens = []
+        try:
+            while True:
+                tokens.append(parser.nexttoken())
+        except PSEOF:
+            pass
+        assert tokens == self.TOKENS
+
+    def test_fast_tokenizer_nextline(self):
+        """Tokens read ahead are discarded by nextline()."""
+        parser = PSBaseParser(BytesIO(b"xref\n0 1\n/a"), fast_tokenizer=True)
+        assert parser.nexttoken() == (0, KWD(b"xref"))
+        assert parser.nextline() == (4, b"\n")
+        assert parser.nextline() == (5, b"0 1\n")
+        assert parser.nexttoken() == (9, LIT("a"))
+
     def test_3(self):
         """Regression test for streams that end with a keyword.
 
@@ -460,3 +489,30 @@ def test_issue_1025():
     # we should get both "end" at the end
     assert tokens[-1] == end
     assert tokens[-2] == tokens[-1]
+
+
+def test_mmap_mode_tokens(tmp_path):
+    """Tokens are the same when the parser runs over a memory-mapped file."""
+    path = tmp_path / "bigdata.ps"
+    path.write_bytes(BIGDATA)
+    with open(path, "rb") as fp:
+        expected = []
+        parser = PSBaseParser(fp)
+        try:
+            while True:
+                expected.append(parser.nexttoken())
+        except PSEOF:
+            pass
+
+        tokens = []
+        parser = PSBaseParser(fp, use_mmap=True)
+        try:
+            while True:
+                tokens.append(parser.nexttoken())
+        except PSEOF:
+            pass
+        parser.seek(4093)
+        pos, token = parser.nexttoken()
+        parser.close()
+    assert tokens == expected
+    assert (pos, token) == (4093, KWD(b"beginbfchar"))
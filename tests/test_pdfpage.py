@@ -1,3 +1,8 @@
+from io import BytesIO
+
+import pytest
+
+from benchmarks.corpus import PDFWriter
 from pdfminer.pdfdocument import PDFDocument
 from pdfminer.pdfpage import PDFPage
 from pdfminer.pdfparser import PDFParser
@@ -14,3 +19,115 @@ class TestPdfPage:
             doc = PDFDocument(parser)
             for i, page in enumerate(PDFPage.create_pages(doc)):
                 assert page.label == expected_labels[i]
+
+    def test_page_index(self):
+        path = absolute_sample_path("contrib/pagelabels.pdf")
+        with open(path, "rb") as fp:
+            doc = PDFDocument(PDFParser(fp))
+            pages = list(PDFPage.create_pages(doc))
+            assert len(doc.pages) == 5
+            assert doc.page(3).pageid == pages[3].pageid
+            assert doc.page(-1).pageid == pages[-1].pageid
+            assert [page.label for page in doc.page(slice(1, 4))] == ["iv", "1", "2"]
+            with pytest.raises(IndexError):
+                doc.page(5)
+
+    def test_page_labels_generated_once(self, monkeypatch):
+        path = absolute_sample_path("contrib/pagelabels.pdf")
+        with open(path, "rb") as fp:
+            doc = PDFDocument(PDFParser(fp))
+            calls = []
+            get_page_labels = doc.get_page_labels
+
+            def counting():
+                calls.append(None)
+                return get_page_labels()
+
+            monkeypatch.setattr(doc, "get_page_labels", counting)
+            labels = [page.label for page in doc.pages]
+            assert labels == ["iii", "iv", "1", "2", "1"]
+            assert doc.page(2).label == "1"
+            assert len(calls) == 1
+
+    def test_page_index_skips_subtrees(self):
+        writer = PDFWriter()
+        root = writer.reserve()
+        tree = writer.reserve()
+        nodes = []
+        for i in range(20):
+            node = writer.reserve()
+            kids = [
+                writer.add(b"<< /Type /Page /Parent %d 0 R >>" % node)
+                for _ in range(100)
+            ]
+            writer.set(
+                node,
+                b"<< /Type /Pages /Parent %d 0 R /Count 100 /Kids [%s] >>"
+                % (tree, b" ".join(b"%d 0 R" % kid for kid in kids)),
+            )
+            nodes.append(node)
+        writer.set(
+            tree,
+            b"<< /Type /Pages /Count 2000 /MediaBox [0 0 612 792] /Kids [%s] >>"
+            % b" ".join(b"%d 0 R" % node for node in nodes),
+        )
+        writer.set(root, b"<< /Type /Catalog /Pages %d 0 R >>" % tree)
+        doc = PDFDocument(PDFParser(BytesIO(writer.write(root))))
+
+        page = doc.page(1899)
+        assert doc.cache.misses < 200
+        assert page.mediabox == (0, 0, 612, 792)
+        assert page.pageid == list(PDFPage.create_pages(doc))[1899].pageid
+        assert len(doc.pages) == 2000
+
+    @staticmethod
+    def make_flat_tree(npages, count):
+        writer = PDFWriter()
+        root = writer.reserve()
+        tree = writer.reserve()
+        kids = [
+            writer.add(b"<< /Type /Page /Parent %d 0 R >>" % tree)
+            for _ in range(npages)
+        ]
+        writer.set(
+            tree,
+            b"<< /Type /Pages /Count %d /MediaBox [0 0 612 792] /Kids [%s] >>"
+            % (count, b" ".join(b"%d 0 R" % kid for kid in kids)),
+        )
+        writer.set(root, b"<< /Type /Catalog /Pages %d 0 R >>" % tree)
+        return writer.write(root)
+
+    def test_page_index_keeps_kids(self, monkeypatch):
+        data = self.make_flat_tree(300, 300)
+        doc = PDFDocument(PDFParser(BytesIO(data)), caching=False)
+        getobj = doc.getobj
+        calls = []
+
+        def counted_getobj(objid):
+            calls.append(objid)
+            return getobj(objid)
+
+        monkeypatch.setattr(doc, "getobj", counted_getobj)
+        doc.page(0)
+        ncalls = len(calls)
+        for i in range(1, 300):
+            doc.page(i)
+        # Each lookup reads only the tree node and its page.
+        assert len(calls) - ncalls < 3 * 300
+
+    def test_page_index_wrong_count(self):
+        data = self.make_flat_tree(5, 4)
+        doc = PDFDocument(PDFParser(BytesIO(data)))
+        pages = list(PDFPage.create_pages(doc))
+        assert len(doc.pages) == 5
+        assert doc.page(4).pageid == pages[4].pageid
+
+    def test_get_pages_with_pagenos(self):
+        path = absolute_sample_path("nonfree/dmca.pdf")
+        with open(path, "rb") as fp:
+            pages = list(PDFPage.get_pages(fp))
+            selected = list(PDFPage.get_pages(fp, pagenos={15, 2, 40}))
+        assert [page.pageid for page in selected] == [
+            pages[2].pageid,
+            pages[15].pageid,
+        ]
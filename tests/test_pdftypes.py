@@ -0,0 +1,151 @@
+import random
+import zlib
+
+from pdfminer import utils
+from pdfminer.pdftypes import PDFStream, decompress_corrupted
+from pdfminer.psparser import LIT
+from pdfminer.utils import PNGPredictor, apply_png_predictor
+
+
+def png_encode(rows, bpp, filter_types=None):
+    """PNG predicted data, cycling through the filter types by default."""
+    data = b""
+    above = bytes(len(rows[0]))
+    for i, row in enumerate(rows):
+        filter_type = i % 5 if filter_types is None else filter_types[i]
+        encoded = []
+        for j, x in enumerate(row):
+            left = row[j - bpp] if bpp <= j else 0
+            upper_left = above[j - bpp] if bpp <= j else 0
+            if filter_type == 1:
+                x -= left
+            elif filter_type == 2:
+                x -= above[j]
+            elif filter_type == 3:
+                x -= (left + above[j]) // 2
+            elif filter_type == 4:
+                p = left + above[j] - upper_left
+                (pa, pb, pc) = (abs(p - left), abs(p - above[j]), abs(p - upper_left))
+                if pa <= pb and pa <= pc:
+                    x -= left
+                elif pb <= pc:
+                    x -= above[j]
+                else:
+                    x -= upper_left
+            encoded.append(x & 255)
+        data += bytes([filter_type] + encoded)
+        above = row
+    return data
+
+
+class TestStreamDecoding:
+    def get_stream(self, rawdata, **attrs):
+        return PDFStream(dict(attrs), rawdata)
+
+    def test_iter_data(self):
+        data = bytes(range(256)) * 300
+        rawdata = zlib.compress(data)
+        for chunk_size in (1, 7, 4096, len(rawdata)):
+            stream = self.get_stream(rawdata, Filter=LIT("FlateDecode"))
+            chunks = list(stream.iter_data(chunk_size))
+            assert b"".join(chunks) == data
+            assert stream.data is None
+            if chunk_size < len(rawdata):
+                assert 1 < len(chunks)
+        stream = self.get_stream(rawdata, Filter=LIT("FlateDecode"))
+        assert stream.get_data() == data
+        assert list(stream.iter_data()) == [data]
+
+    def test_predictor(self):
+        rows = [bytes((i * j * 7 + j) & 255 for j in range(12)) for i in range(20)]
+        encoded = png_encode(rows, 3)
+        assert apply_png_predictor(12, 3, 4, 8, encoded) == b"".join(rows)
+        params = {"Predictor": 12, "Colors": 3, "Columns": 4}
+        for chunk_size in (1, 5, 13, 1000):
+            stream = self.get_stream(
+                zlib.compress(encoded),
+                Filter=LIT("FlateDecode"),
+                DecodeParms=params,
+            )
+            assert b"".join(stream.iter_data(chunk_size)) == b"".join(rows)
+
+    def test_corrupted_flate(self):
+        data = b" ".join(str(i * i).encode() for i in range(3000))
+        rawdata = bytearray(zlib.compress(data))
+        rawdata[3000:3040] = bytes(40)
+        expected = decompress_corrupted(bytes(rawdata))
+        assert 0 < len(expected) < len(data)
+        for chunk_size in (1, 16, 2990, len(rawdata)):
+            stream = self.get_stream(bytes(rawdata), Filter=LIT("FlateDecode"))
+            assert b"".join(stream.iter_data(chunk_size)) == expected
+        stream = self.get_stream(bytes(rawdata), Filter=LIT("FlateDecode"))
+        assert stream.get_data() == expected
+
+    def test_truncated_flate(self):
+        data = bytes(range(256)) * 50
+        rawdata = zlib.compress(data)[:-10]
+        for chunk_size in (3, len(rawdata)):
+            stream = self.get_stream(rawdata, Filter=LIT("FlateDecode"))
+            decoded = b"".join(stream.iter_data(chunk_size))
+            assert data.startswith(decoded)
+            assert decoded == decompress_corrupted(rawdata)
+
+    def test_buffered_filters(self):
+        stream = self.get_stream(
+            b"87cURDZ~>",
+            Filter=[LIT("ASCII85Decode"), LIT("DCTDecode")],
+        )
+        assert list(stream.iter_data(2)) == [b"Hello"]
+
+    def test_incremental_filters(self):
+        stream = self.get_stream(
+            b"01 4865 ff6c 006f 80>",
+            Filter=[LIT("ASCIIHexDecode"), LIT("RunLengthDecode")],
+        )
+        assert list(stream.iter_data(5)) == [b"He", b"ll", b"o"]
+
+
+class TestPNGPredictor:
+    def get_data(self, seed, colors, columns, nrows):
+        rng = random.Random(seed)
+        rows = []
+        filter_types = []
+        for i in range(nrows):
+            rows.append(bytes(rng.randrange(256) for _ in range(colors * columns)))
+            # runs of lines with the same filter type.
+            if i % 7 == 0 or not filter_types:
+                filter_types.append(rng.randrange(5))
+            else:
+                filter_types.append(filter_types[-1])
+        return (rows, png_encode(rows, colors, filter_types))
+
+    def decode(self, colors, columns, data, chunk_size):
+        predictor = PNGPredictor(colors, columns, 8)
+        chunks = [
+            predictor.decode(data[i : i + chunk_size])
+            for i in range(0, len(data), chunk_size)
+        ]
+        return b"".join(chunks) + predictor.decode(b"", final=True)
+
+    def test_engines(self, monkeypatch):
+        for colors, columns, nrows in ((1, 5, 300), (3, 40, 60), (4, 3, 100)):
+            (rows, data) = self.get_data(colors, colors, columns, nrows)
+            expected = b"".join(rows)
+            for min_bytes in (10**9, 1):
+                monkeypatch.setattr(utils, "NUMPY_MIN_PREDICTED_BYTES", min_bytes)
+                monkeypatch.setattr(utils, "NUMPY_MIN_PREDICTED_RUN", min_bytes)
+                for chunk_size in (len(data), 1, 33):
+                    assert self.decode(colors, columns, data, chunk_size) == expected
+                # an incomplete last line
+                assert self.decode(colors, columns, data[:-2], 50) == expected[:-2]
+
+    def test_first_line_up(self):
+        rows = [bytes(range(1, 13))]
+        data = png_encode(rows, 3, [2])
+        assert apply_png_predictor(12, 3, 4, 8, data) == rows[0]
+
+    def test_one_bit(self):
+        # 10 pixels take 2 bytes, Sub works on whole bytes.
+        rows = [b"\x81\x40", b"\x7f\xc0"]
+        data = png_encode(rows, 1, [1, 4])
+        assert apply_png_predictor(12, 1, 10, 1, data) == b"".join(rows)
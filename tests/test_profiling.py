@@ -0,0 +1,95 @@
+import asyncio
+import threading
+
+from pdfminer import profiling
+from pdfminer.high_level import aextract_pages, extract_text
+from pdfminer.profiling import PageReport, Profiler
+from tests.helpers import absolute_sample_path
+
+
+class TestProfiler:
+    def test_reports_per_page(self):
+        path = absolute_sample_path("nonfree/dmca.pdf")
+        with Profiler() as profiler:
+            extract_text(path, maxpages=3)
+        assert profiling.active() is None
+        assert [report.pageno for report in profiler.reports] == [1, 2, 3]
+        stages = profiler.reports[0].stages
+        assert stages["decode.FlateDecode"].nbytes > 0
+        assert stages["interpret.Tj"].calls > 0
+        assert "font.TrueType" in stages
+        assert stages["layout.analyze"].calls == 1
+        assert stages["layout.group_textboxes"].calls == 1
+        assert stages["convert.TextConverter"].calls == 1
+        for report in profiler.reports:
+            assert report.seconds >= sum(
+                stats.seconds
+                for stage, stats in report.stages.items()
+                if not stage.startswith(("interpret.", "layout.group_"))
+            )
+
+    def test_callback(self):
+        reports = []
+        path = absolute_sample_path("simple1.pdf")
+        with Profiler(callback=reports.append, keep_reports=False) as profiler:
+            extract_text(path)
+        assert profiler.reports == []
+        assert len(reports) == 1
+        report = reports[0].as_dict()
+        assert report["pageno"] == 1
+        assert report["stages"]["font.Type1"]["calls"] == 1
+
+    def test_inactive(self):
+        with Profiler() as profiler:
+            pass
+        extract_text(absolute_sample_path("simple1.pdf"))
+        assert profiler.reports == []
+        assert profiler.document.stages == {}
+
+    def test_other_thread(self):
+        path = absolute_sample_path("simple1.pdf")
+        seen = []
+
+        def run():
+            seen.append(profiling.active())
+            extract_text(path)
+
+        with Profiler() as profiler:
+            thread = threading.Thread(target=run)
+            thread.start()
+            thread.join()
+        assert seen == [None]
+        assert profiler.reports == []
+
+    def test_async_tasks(self):
+        path = absolute_sample_path("simple1.pdf")
+        with open(path, "rb") as fp:
+            data = fp.read()
+
+        async def read_range(offset, length):
+            await asyncio.sleep(0)
+            return data[offset : offset + length]
+
+        async def extract(profile):
+            if not profile:
+                return [page async for page in aextract_pages(read_range, len(data))]
+            with Profiler() as profiler:
+                [page async for page in aextract_pages(read_range, len(data))]
+            return profiler
+
+        async def main():
+            return await asyncio.gather(extract(True), extract(False), extract(True))
+
+        (first, _, second) = asyncio.run(main())
+        assert profiling.active() is None
+        assert [report.pageno for report in first.reports] == [1]
+        assert [report.pageno for report in second.reports] == [1]
+
+    def test_slowest(self):
+        report = PageReport(1)
+        report.add("a", 1.0)
+        report.add("b", 3.0)
+        report.add("a", 1.5, 10)
+        assert [stage for (stage, _) in report.slowest(2)] == ["b", "a"]
+        assert report.stages["a"].calls == 2
+        assert report.stages["a"].nbytes == 10
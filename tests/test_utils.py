@@ -62,6 +62,26 @@ class TestPlane:
         result = list(plane.find((0, 0, 100, 100)))
         assert result == [obj]
 
+    def test_rtree_index_finds_like_grid(self):
+        bbox = (0, 0, 100, 100)
+        objs = [
+            LTComponent((x, y, x + w, y + w))
+            for (x, y, w) in [(5, 5, 50), (60, 0, 10), (0, 60, 30), (40, 40, 5)]
+        ]
+        grid = Plane(bbox, gridsize=20)
+        rtree = Plane(bbox, gridsize=20, index="rtree")
+        for plane in (grid, rtree):
+            plane.extend(objs)
+            plane.remove(objs[0])
+            plane.add(objs[0])
+        for area in [(0, 0, 100, 100), (0, 0, 45, 45), (50, 50, 100, 100)]:
+            assert list(rtree.find(area)) == list(grid.find(area))
+        assert list(rtree) == list(grid)
+
+    def test_unknown_index(self):
+        with pytest.raises(ValueError):
+            Plane((0, 0, 100, 100), index="quadtree")
+
     @staticmethod
     def given_plane_with_one_object(object_size=50, gridsize=50):
         bounding_box = (0, 0, 100, 100)